@@ -20,6 +20,7 @@
 from abc import abstractmethod
 import hashlib
 from enum import IntEnum
+from typing import Optional
 
 from .exception import InvalidParamsException
 from ..utils import is_lowercase_hex_string, int_to_bytes
@@ -110,6 +111,8 @@ class Address(object):
 
         self.__prefix = address_prefix
         self.__body = address_body
+        # Cache of to_bytes(). Address is immutable
+        self.__bytes: Optional[bytes] = None
 
     @property
     def prefix(self) -> AddressPrefix:
@@ -212,12 +215,15 @@ class Address(object):
 
         :return: data including information of Address object
         """
-        body_bytes = self.body
-        if self.prefix != AddressPrefix.EOA:
-            prefix_byte = self.prefix.value.to_bytes(1, DATA_BYTE_ORDER)
-            address_bytes = prefix_byte + body_bytes
-        else:
-            address_bytes = body_bytes
+        address_bytes = self.__bytes
+        if address_bytes is None:
+            body_bytes = self.body
+            if self.prefix != AddressPrefix.EOA:
+                prefix_byte = self.prefix.value.to_bytes(1, DATA_BYTE_ORDER)
+                address_bytes = prefix_byte + body_bytes
+            else:
+                address_bytes = body_bytes
+            self.__bytes = address_bytes
         return address_bytes
 
     @staticmethod
@@ -181,14 +181,17 @@ type_convert_templates[ParamType.ICX_CALL] = {
     ConstantKeys.FROM: ValueType.ADDRESS,
     ConstantKeys.TO: ValueType.ADDRESS,
     ConstantKeys.DATA_TYPE: ValueType.STRING,
-    ConstantKeys.DATA: ValueType.LATER
+    ConstantKeys.DATA: ValueType.LATER,
+    ConstantKeys.BLOCK_HEIGHT: ValueType.INT
 }
 type_convert_templates[ParamType.ICX_GET_BALANCE] = {
     ConstantKeys.VERSION: ValueType.INT,
-    ConstantKeys.ADDRESS: ValueType.ADDRESS_OR_MALFORMED_ADDRESS
+    ConstantKeys.ADDRESS: ValueType.ADDRESS_OR_MALFORMED_ADDRESS,
+    ConstantKeys.BLOCK_HEIGHT: ValueType.INT
 }
 type_convert_templates[ParamType.ICX_GET_TOTAL_SUPPLY] = {
-    ConstantKeys.VERSION: ValueType.INT
+    ConstantKeys.VERSION: ValueType.INT,
+    ConstantKeys.BLOCK_HEIGHT: ValueType.INT
 }
 type_convert_templates[ParamType.ICX_GET_SCORE_API] = type_convert_templates[ParamType.ICX_GET_BALANCE]
 
@@ -94,6 +94,58 @@ class StepCosts:
             yield (step_type, self._step_costs[step_type])
 
 
+class AddressList:
+    """
+    DB for address lists such as auditors, deployers and SCORE blacklist.
+    It is combined ArrayDB and DictDB which indexes the addresses in ArrayDB
+    in order to check if an address is in the list without iterating it.
+    """
+
+    def __init__(self, var_key: str, db: IconScoreDatabase):
+        self._addresses = ArrayDB(var_key, db, value_type=Address)
+        # index in ArrayDB + 1 by address
+        self._indexes = DictDB(f'{var_key}_index', db, value_type=int)
+
+    def put(self, address: Address):
+        if address not in self:
+            self._addresses.put(address)
+            self._indexes[address] = len(self._addresses)
+
+    def remove(self, address: Address):
+        # get the topmost value
+        top = self._addresses.pop()
+        if top is None:
+            return
+
+        index = self._indexes[address] - 1
+        if top == address:
+            del self._indexes[address]
+        elif index < 0:
+            # the topmost address is removed even if the address is not in the list
+            # as it has been before the index is added
+            del self._indexes[top]
+        else:
+            # moves the topmost address to the place of the removed one
+            self._addresses[index] = top
+            self._indexes[top] = index + 1
+            del self._indexes[address]
+
+    def migrate(self):
+        """Indexes the addresses put before the index is added
+        """
+        for i, address in enumerate(self._addresses):
+            self._indexes[address] = i + 1
+
+    def __contains__(self, address: Address):
+        return address in self._indexes
+
+    def __iter__(self):
+        return self._addresses.__iter__()
+
+    def __len__(self):
+        return self._addresses.__len__()
+
+
 class Governance(IconScoreBase):
 
     _SCORE_STATUS = 'score_status'
@@ -122,9 +174,9 @@ class Governance(IconScoreBase):
     def __init__(self, db: IconScoreDatabase) -> None:
         super().__init__(db)
         self._score_status = DictDB(self._SCORE_STATUS, db, value_type=bytes, depth=3)
-        self._auditor_list = ArrayDB(self._AUDITOR_LIST, db, value_type=Address)
-        self._deployer_list = ArrayDB(self._DEPLOYER_LIST, db, value_type=Address)
-        self._score_black_list = ArrayDB(self._SCORE_BLACK_LIST, db, value_type=Address)
+        self._auditor_list = AddressList(self._AUDITOR_LIST, db)
+        self._deployer_list = AddressList(self._DEPLOYER_LIST, db)
+        self._score_black_list = AddressList(self._SCORE_BLACK_LIST, db)
         self._step_price = VarDB(self._STEP_PRICE, db, value_type=int)
         self._step_costs = StepCosts(db)
         self._max_step_limits = DictDB(self._MAX_STEP_LIMITS, db, value_type=int)
@@ -156,6 +208,11 @@ class Governance(IconScoreBase):
                 if step_type in self._step_costs:
                     self._step_costs._step_types.put(step_type)
 
+        # indexes the address lists put before they are indexed
+        self._auditor_list.migrate()
+        self._deployer_list.migrate()
+        self._score_black_list.migrate()
+
     def _get_current_status(self, score_address: Address):
         return self._score_status[score_address][CURRENT]
 
@@ -311,8 +368,7 @@ class Governance(IconScoreBase):
         # check message sender, only owner can add new auditor
         if self.msg.sender != self.owner:
             self.revert('Invalid sender: not owner')
-        if address not in self._auditor_list:
-            self._auditor_list.put(address)
+        self._auditor_list.put(address)
         if DEBUG is True:
             self._print_auditor_list('addAuditor')
 
@@ -324,12 +380,7 @@ class Governance(IconScoreBase):
         if self.msg.sender != self.owner:
             if self.msg.sender != address:
                 self.revert('Invalid sender: not yourself')
-        # get the topmost value
-        top = self._auditor_list.pop()
-        if top != address:
-            for i in range(len(self._auditor_list)):
-                if self._auditor_list[i] == address:
-                    self._auditor_list[i] = top
+        self._auditor_list.remove(address)
         if DEBUG is True:
             self._print_auditor_list('removeAuditor')
 
@@ -343,8 +394,7 @@ class Governance(IconScoreBase):
         # check message sender, only owner can add new deployer
         if self.msg.sender != self.owner:
             self.revert('Invalid sender: not owner')
-        if address not in self._deployer_list:
-            self._deployer_list.put(address)
+        self._deployer_list.put(address)
         if DEBUG is True:
             self._print_deployer_list('addDeployer')
 
@@ -356,18 +406,14 @@ class Governance(IconScoreBase):
         if self.msg.sender != self.owner:
             if self.msg.sender != address:
                 self.revert('Invalid sender: not yourself')
-        # get the topmost value
-        top = self._deployer_list.pop()
-        if top != address:
-            for i in range(len(self._deployer_list)):
-                if self._deployer_list[i] == address:
-                    self._deployer_list[i] = top
+        self._deployer_list.remove(address)
         if DEBUG is True:
             self._print_deployer_list('removeDeployer')
 
     @external(readonly=True)
     def isDeployer(self, address: Address) -> bool:
-        Logger.debug(f'isDeployer address: {address}', TAG)
+        if DEBUG is True:
+            Logger.debug(f'isDeployer address: {address}', TAG)
         return address in self._deployer_list
 
     def _print_deployer_list(self, header: str):
@@ -383,8 +429,7 @@ class Governance(IconScoreBase):
         # check message sender, only owner can add new blacklist
         if self.msg.sender != self.owner:
             self.revert('Invalid sender: not owner')
-        if address not in self._score_black_list:
-            self._score_black_list.put(address)
+        self._score_black_list.put(address)
         if DEBUG is True:
             self._print_black_list('addScoreToBlackList')
 
@@ -396,18 +441,14 @@ class Governance(IconScoreBase):
         # check message sender, only owner can remove from blacklist
         if self.msg.sender != self.owner:
             self.revert('Invalid sender: not owner')
-        # get the topmost value
-        top = self._score_black_list.pop()
-        if top != address:
-            for i in range(len(self._score_black_list)):
-                if self._score_black_list[i] == address:
-                    self._score_black_list[i] = top
+        self._score_black_list.remove(address)
         if DEBUG is True:
             self._print_black_list('removeScoreFromBlackList')
 
     @external(readonly=True)
     def isInScoreBlackList(self, address: Address) -> bool:
-        Logger.debug(f'isInBlackList address: {address}', TAG)
+        if DEBUG is True:
+            Logger.debug(f'isInBlackList address: {address}', TAG)
         return address in self._score_black_list
 
     def _print_black_list(self, header: str):
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left, insort
+from enum import Enum
+from threading import RLock
+from typing import Optional, Iterator, Tuple
+
+import plyvel
+
+from ..base.exception import DatabaseException
+
+
+class Backend(Enum):
+    """Storage engines which KeyValueDatabase can run on
+    """
+    LEVELDB = 'leveldb'
+    MEMORY = 'memory'
+
+
+class KeyValueStore(metaclass=ABCMeta):
+    """Interface of a storage engine used by KeyValueDatabase
+
+    It follows the api of plyvel.DB, so plyvel.DB is a KeyValueStore as it is.
+    """
+
+    @abstractmethod
+    def get(self, key: bytes) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def put(self, key: bytes, value: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def write_batch(self):
+        """Returns a write batch used as a context manager
+
+        The batch provides put(key, value) and delete(key)
+        and it is written at once on leaving the context.
+        """
+        pass
+
+    @abstractmethod
+    def prefixed_db(self, prefix: bytes) -> 'KeyValueStore':
+        pass
+
+    @abstractmethod
+    def iterator(self,
+                 start: Optional[bytes]=None,
+                 stop: Optional[bytes]=None,
+                 reverse: bool=False) -> Iterator[Tuple[bytes, bytes]]:
+        pass
+
+    @abstractmethod
+    def snapshot(self):
+        """Returns a read-only view of the current states
+
+        The view provides get(key) and iterator(start, stop, reverse)
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+
+KeyValueStore.register(plyvel.DB)
+
+
+def get_prefix_upper_bound(prefix: bytes) -> Optional[bytes]:
+    """Returns the smallest key which is greater than all keys starting with prefix
+
+    :param prefix: key prefix
+    :return: None if there is no upper bound
+    """
+    upper = prefix.rstrip(b'\xff')
+    if upper:
+        return upper[:-1] + bytes([upper[-1] + 1])
+
+    return None
+
+
+class _SortedMap(object):
+    """Keys are kept sorted to support ordered range iteration
+    """
+
+    def __init__(self) -> None:
+        self.lock = RLock()
+        self.items: dict = {}
+        self.keys: list = []
+        # True if items and keys are shared with snapshots
+        self._shared = False
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self.items.get(key)
+
+    def put(self, key: bytes, value: bytes) -> None:
+        with self.lock:
+            self._prepare_write()
+            if key not in self.items:
+                insort(self.keys, key)
+            self.items[key] = value
+
+    def delete(self, key: bytes) -> None:
+        with self.lock:
+            if key in self.items:
+                self._prepare_write()
+                del self.items[key]
+                del self.keys[bisect_left(self.keys, key)]
+
+    def copy(self) -> '_SortedMap':
+        """Returns a copy which shares data until this map is changed
+        """
+        with self.lock:
+            self._shared = True
+
+            sorted_map = _SortedMap()
+            sorted_map.items = self.items
+            sorted_map.keys = self.keys
+            return sorted_map
+
+    def _prepare_write(self) -> None:
+        # Copy on write not to change the data seen by snapshots
+        if self._shared:
+            self.items = dict(self.items)
+            self.keys = list(self.keys)
+            self._shared = False
+
+    def iterator(self,
+                 start: Optional[bytes],
+                 stop: Optional[bytes],
+                 reverse: bool) -> Iterator[Tuple[bytes, bytes]]:
+        with self.lock:
+            keys = self.keys
+            begin = 0 if start is None else bisect_left(keys, start)
+            end = len(keys) if stop is None else bisect_left(keys, stop)
+            # Copies keys in range not to be affected by writes during iteration
+            keys = keys[begin:end]
+
+        if reverse:
+            keys.reverse()
+
+        for key in keys:
+            value = self.items.get(key)
+            if value is not None:
+                yield key, value
+
+
+class _MemoryWriteBatch(object):
+    def __init__(self, db: 'MemoryDB') -> None:
+        self._db = db
+        self._states = {}
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._states[key] = value
+
+    def delete(self, key: bytes) -> None:
+        self._states[key] = None
+
+    def write(self) -> None:
+        self._db.write(self._states)
+        self._states = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.write()
+
+
+class MemorySnapshot(object):
+    """Read-only view of MemoryDB at a point in time
+    """
+
+    def __init__(self, sorted_map: '_SortedMap', prefix: bytes) -> None:
+        self._map = sorted_map
+        self._prefix = prefix
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._map.get(self._prefix + key)
+
+    def iterator(self,
+                 start: Optional[bytes]=None,
+                 stop: Optional[bytes]=None,
+                 reverse: bool=False) -> Iterator[Tuple[bytes, bytes]]:
+        return _iterate_with_prefix(self._map, self._prefix, start, stop, reverse)
+
+    def close(self) -> None:
+        self._map = None
+
+    def release(self) -> None:
+        self.close()
+
+
+class MemoryDB(KeyValueStore):
+    """In-memory storage engine based on a sorted map
+
+    Nothing is persisted. It is used for tests and benchmarks
+    to exclude disk I/O from measurements.
+    """
+
+    def __init__(self, sorted_map: Optional['_SortedMap']=None, prefix: bytes=b'') -> None:
+        self._map = _SortedMap() if sorted_map is None else sorted_map
+        self._prefix = prefix
+
+    def _check_open(self) -> None:
+        if self._map is None:
+            raise DatabaseException('MemoryDB is closed')
+
+    def get(self, key: bytes, default=None) -> Optional[bytes]:
+        self._check_open()
+        value = self._map.get(self._prefix + key)
+        return default if value is None else value
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._check_open()
+        if not isinstance(key, bytes) or not isinstance(value, bytes):
+            raise TypeError('key and value should be bytes type')
+        self._map.put(self._prefix + key, value)
+
+    def delete(self, key: bytes) -> None:
+        self._check_open()
+        self._map.delete(self._prefix + key)
+
+    def write(self, states: dict) -> None:
+        """Writes states at once
+
+        :param states: key:value pairs, None value means deletion
+        """
+        self._check_open()
+        sorted_map = self._map
+        with sorted_map.lock:
+            for key, value in states.items():
+                if value is None:
+                    sorted_map.delete(self._prefix + key)
+                else:
+                    sorted_map.put(self._prefix + key, value)
+
+    def write_batch(self) -> '_MemoryWriteBatch':
+        self._check_open()
+        return _MemoryWriteBatch(self)
+
+    def prefixed_db(self, prefix: bytes) -> 'MemoryDB':
+        self._check_open()
+        return MemoryDB(self._map, self._prefix + prefix)
+
+    def iterator(self,
+                 start: Optional[bytes]=None,
+                 stop: Optional[bytes]=None,
+                 reverse: bool=False) -> Iterator[Tuple[bytes, bytes]]:
+        self._check_open()
+        return _iterate_with_prefix(self._map, self._prefix, start, stop, reverse)
+
+    def snapshot(self) -> 'MemorySnapshot':
+        self._check_open()
+        return MemorySnapshot(self._map.copy(), self._prefix)
+
+    def close(self) -> None:
+        self._map = None
+
+
+def _iterate_with_prefix(sorted_map: '_SortedMap',
+                         prefix: bytes,
+                         start: Optional[bytes],
+                         stop: Optional[bytes],
+                         reverse: bool) -> Iterator[Tuple[bytes, bytes]]:
+    """Iterates the items of a prefixed db with the prefix stripped from keys
+    """
+    if not prefix:
+        return sorted_map.iterator(start, stop, reverse)
+
+    start = prefix if start is None else prefix + start
+    stop = get_prefix_upper_bound(prefix) if stop is None else prefix + stop
+
+    size = len(prefix)
+    return ((key[size:], value)
+            for key, value in sorted_map.iterator(start, stop, reverse))
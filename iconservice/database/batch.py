@@ -27,15 +27,24 @@ if TYPE_CHECKING:
 
 
 def digest(ordered_dict: OrderedDict):
-    # items in data MUST be byte-like objects
-    data = []
+    """Hashes b'key0|value0|key1|...' without building it in memory
+
+    items in data MUST be byte-like objects
+    """
+    sha3 = hashlib.sha3_256()
+    update = sha3.update
+    separator = b''
 
     for key, value in ordered_dict.items():
-        data.append(key)
+        update(separator)
+        update(key)
+        separator = b'|'
+
         if value is not None:
-            data.append(value)
+            update(separator)
+            update(value)
 
-    return hashlib.sha3_256(b'|'.join(data)).digest()
+    return sha3.digest()
 
 
 class Batch(OrderedDict):
@@ -65,7 +74,15 @@ class TransactionBatch(MutableMapping):
 
     key: Score Address
     value: IconScoreBatch
+
+    All states are kept in a single flat overlay regardless of call depth.
+    Each internal call has an undo journal which records the values
+    its writes replaced, so revert_call() restores them
+    and leave_call() just drops the journal.
     """
+    # Marks a key which did not exist in the overlay before being written
+    _ABSENT = object()
+
     def __init__(self, tx_hash: Optional[bytes]=None) -> None:
         """Constructor
 
@@ -73,68 +90,76 @@ class TransactionBatch(MutableMapping):
         """
         super().__init__()
         self.hash = tx_hash
-        self._call_batches = [OrderedDict()]
+        self._states = OrderedDict()
+        # Undo journals of internal calls. key: the previous value in the overlay
+        self._journals = []
 
     def __getitem__(self, item):
-        for call_batch in reversed(self._call_batches):
-            if item in call_batch:
-                return call_batch[item]
-
-        return None
+        return self._states.get(item)
 
     def __setitem__(self, key, value):
-        call_batch: OrderedDict = self._call_batches[-1]
-        call_batch[key] = value
+        states: OrderedDict = self._states
+
+        if self._journals:
+            journal: dict = self._journals[-1]
+            if key not in journal:
+                journal[key] = states.get(key, self._ABSENT)
+
+        states[key] = value
 
     def __delitem__(self, key):
         raise ServerErrorException('To delete item is not allowed')
 
     def __contains__(self, item):
-        for call_batch in self._call_batches:
-            if item in call_batch:
-                return True
-
-        return False
+        return item in self._states
 
     def __iter__(self):
-        for call_batch in self._call_batches:
-            for key in call_batch:
-                yield key
+        return iter(self._states)
 
     def __len__(self):
-        length = 0
-
-        for call_batch in self._call_batches:
-            length += len(call_batch)
-
-        return length
+        return len(self._states)
 
     def enter_call(self):
-        self._call_batches.append(OrderedDict())
+        self._journals.append({})
 
     def revert_call(self):
-        call_batch: OrderedDict = self._call_batches[-1]
-        call_batch.clear()
+        journal: dict = self._journals[-1]
+        states: OrderedDict = self._states
+
+        for key, value in journal.items():
+            if value is self._ABSENT:
+                # A key added by this call was appended to the end,
+                # so removing it restores the previous order as well
+                del states[key]
+            else:
+                states[key] = value
+
+        journal.clear()
 
     def leave_call(self):
-        call_batch: OrderedDict = self._call_batches.pop()
+        journal: dict = self._journals.pop()
 
-        if call_batch:
-            self._call_batches[-1].update(call_batch)
+        if self._journals:
+            # The caller reverts the writes of this call as its own
+            parent_journal: dict = self._journals[-1]
+            for key, value in journal.items():
+                if key not in parent_journal:
+                    parent_journal[key] = value
 
     def digest(self) -> bytes:
-        if len(self._call_batches) != 1:
-            raise ServerErrorException(f'Wrong call_batch count: {len(self._call_batches)}')
+        if self._journals:
+            raise ServerErrorException(f'Wrong call_batch count: {self.call_count}')
 
-        return digest(self._call_batches[0])
+        return digest(self._states)
 
     @property
     def call_count(self) -> int:
-        return len(self._call_batches)
+        return len(self._journals) + 1
 
     def clear(self):
         self.hash = None
-        self._call_batches = [OrderedDict()]
+        self._states = OrderedDict()
+        self._journals = []
 
 
 class BlockBatch(Batch):
@@ -142,15 +167,81 @@ class BlockBatch(Batch):
 
     key: Address
     value: IconScoreBatch
+
+    A block invoked on top of a block which is not committed yet
+    has the BlockBatch of the parent block as its parent.
+    ContextDatabase looks up the parents for the keys absent from BlockBatch,
+    but they are not part of the states or the digest of BlockBatch.
     """
-    def __init__(self, block: Optional['Block'] = None):
+    def __init__(self,
+                 block: Optional['Block'] = None,
+                 parent: Optional['BlockBatch'] = None):
         """Constructor
 
         :param block: block info
+        :param parent: BlockBatch of the uncommitted parent block
         """
         super().__init__()
         self.block = block
+        self.parent = parent
 
     def clear(self) -> None:
         self.block = None
+        self.parent = None
         super().clear()
+
+
+class SpeculativeBlockBatch(object):
+    """Read-only view of a BlockBatch for a transaction executed speculatively
+
+    ContextDatabase looks up BlockBatch for every key which isn't in TransactionBatch,
+    so the view records all keys which a transaction reads from the states before it.
+    The transaction is valid in block order if none of them has been written
+    by the transactions preceding it since the view was taken.
+    """
+
+    def __init__(self, block_batch: 'BlockBatch') -> None:
+        """Constructor
+
+        :param block_batch: BlockBatch which is not changed while the view is used
+        """
+        self.block = block_batch.block
+        self.parent = block_batch.parent
+        self._block_batch = block_batch
+        self._read_keys = set()
+        # [start, stop) of the keys iterated
+        self._read_ranges = []
+
+    def __getitem__(self, key):
+        self._read_keys.add(key)
+        return self._block_batch[key]
+
+    def __contains__(self, key):
+        self._read_keys.add(key)
+        return key in self._block_batch
+
+    def __iter__(self):
+        return iter(self._block_batch)
+
+    def __len__(self):
+        return len(self._block_batch)
+
+    def add_read_range(self, start: bytes, stop: Optional[bytes]) -> None:
+        """Records the key range which a transaction has iterated
+        """
+        self._read_ranges.append((start, stop))
+
+    def has_read(self, keys: set) -> bool:
+        """Checks if any of given keys has been read through this view
+
+        :param keys: the keys written after this view was taken
+        """
+        if not self._read_keys.isdisjoint(keys):
+            return True
+
+        for start, stop in self._read_ranges:
+            for key in keys:
+                if start <= key and (stop is None or key < stop):
+                    return True
+
+        return False
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+# Approximate memory used by an entry except for its key and value
+# (OrderedDict node, bytes object headers)
+ENTRY_OVERHEAD_SIZE = 128
+
+
+class LRUCache(object):
+    """Memory-bounded LRU cache for the committed states in StateDB
+
+    A value of None means that the key is absent in StateDB (negative lookup).
+    It is shared by invoke and query threads, so every access is locked.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        """Constructor
+
+        :param max_size: memory budget in bytes
+        """
+        self._lock = Lock()
+        self._items = OrderedDict()
+        self._max_size = max_size
+        self._size = 0
+        # Increased whenever committed states are changed.
+        # A value read from StateDB with an old generation can be stale.
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: bytes) -> Tuple[bool, Optional[bytes]]:
+        """Returns a cached value for a given key
+
+        :param key:
+        :return: (True, value) if the key is cached otherwise (False, None)
+        """
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return True, self._items[key]
+
+            self.misses += 1
+            return False, None
+
+    def put(self, key: bytes, value: Optional[bytes], generation: int) -> None:
+        """Caches a value which has been read from StateDB
+
+        :param key:
+        :param value: None if the key is absent
+        :param generation: the generation when the value was read
+        """
+        with self._lock:
+            if generation != self._generation:
+                # Committed states have been changed while reading StateDB
+                return
+
+            self._set(key, value)
+
+    def update(self, states: dict, insert: bool=False) -> None:
+        """Applies the states written to StateDB
+
+        By default, only the keys already cached are updated
+        not to evict hot keys with a large block
+
+        :param states: key:value pairs, None value means deletion
+        :param insert: whether to cache the keys not cached yet too
+        """
+        with self._lock:
+            self._generation += 1
+
+            for key, value in states.items():
+                if insert or key in self._items:
+                    self._set(key, value if value else None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._items.clear()
+            self._size = 0
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._items),
+                'size': self._size,
+                'maxSize': self._max_size
+            }
+
+    def _set(self, key: bytes, value: Optional[bytes]) -> None:
+        items = self._items
+
+        if key in items:
+            self._size -= self._get_entry_size(key, items[key])
+            items.move_to_end(key)
+
+        items[key] = value
+        self._size += self._get_entry_size(key, value)
+
+        while self._size > self._max_size and items:
+            old_key, old_value = items.popitem(last=False)
+            self._size -= self._get_entry_size(old_key, old_value)
+
+    @staticmethod
+    def _get_entry_size(key: bytes, value: Optional[bytes]) -> int:
+        size = ENTRY_OVERHEAD_SIZE + len(key)
+        if value is not None:
+            size += len(value)
+        return size
@@ -14,12 +14,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, List, Iterator, Iterable, Tuple
 
 import plyvel
 
 from iconcommons.logger import Logger
-from iconservice.base.exception import DatabaseException
+from iconservice.base.exception import DatabaseException, InvalidParamsException
+from iconservice.database.backend import KeyValueStore, get_prefix_upper_bound
+from iconservice.database.batch import SpeculativeBlockBatch
+from iconservice.database.cache import LRUCache
+from iconservice.database.history import StateHistory
+from iconservice.database.key_filter import KeyFilter
+from iconservice.database.metrics import StorageMetrics, ReadSource
 from iconservice.icon_constant import ICON_DB_LOG_TAG
 from iconservice.iconscore.icon_score_context import ContextGetter
 from iconservice.iconscore.icon_score_context import IconScoreContextType
@@ -28,6 +37,7 @@ from iconservice.iconscore.icon_score_context import IconScoreFuncType
 if TYPE_CHECKING:
     from iconservice.iconscore.icon_score_context import IconScoreContext
     from iconservice.base.address import Address
+    from iconservice.database.batch import BlockBatch
 
 
 def _get_context_type(context: 'IconScoreContext') -> 'IconScoreContextType':
@@ -54,23 +64,163 @@ def _is_db_writable_on_context(context: 'IconScoreContext'):
         func_type != IconScoreFuncType.READONLY
 
 
+def _get_key_range(prefix: bytes,
+                   start: Optional[bytes],
+                   stop: Optional[bytes]) -> Tuple[bytes, Optional[bytes]]:
+    """Returns the key range [start, stop) of the keys starting with prefix
+
+    :param prefix: key prefix
+    :param start: the first key to include
+    :param stop: the first key to exclude
+    :return: (start, stop) stop is None if there is no upper bound
+    """
+    lower = prefix
+    if start is not None and start > lower:
+        lower = start
+
+    upper = get_prefix_upper_bound(prefix)
+    if stop is not None and (upper is None or stop < upper):
+        upper = stop
+
+    return lower, upper
+
+
+def _find_parent_batch(block_batch: 'BlockBatch', key: bytes) -> Optional['BlockBatch']:
+    """Returns the nearest uncommitted parent BlockBatch which has key
+
+    :param block_batch: BlockBatch of the block being invoked
+    :param key:
+    :return: None if no parent has key
+    """
+    parent = block_batch.parent
+    while parent is not None:
+        if key in parent:
+            return parent
+        parent = parent.parent
+
+    return None
+
+
+def _get_batch_chain(block_batch: 'BlockBatch') -> list:
+    """Returns BlockBatch and its uncommitted parents, the oldest first
+    """
+    chain = [block_batch]
+    parent = block_batch.parent
+    while parent is not None:
+        chain.append(parent)
+        parent = parent.parent
+
+    chain.reverse()
+    return chain
+
+
+def _get_items_in_range(states_list: list,
+                        start: bytes,
+                        stop: Optional[bytes],
+                        reverse: bool) -> List[Tuple[bytes, Optional[bytes]]]:
+    """Returns the sorted items in [start, stop) of the states in a list
+
+    The states later in the list override the earlier ones
+
+    :param states_list: list of key:value mappings such as batches
+    :param start: the first key to include
+    :param stop: the first key to exclude
+    :param reverse: sort in descending order
+    """
+    items = {}
+    for states in states_list:
+        for key in states:
+            if start <= key and (stop is None or key < stop):
+                items[key] = states[key]
+
+    return sorted(items.items(), reverse=reverse)
+
+
+def _merge_items(db_items: Iterable[Tuple[bytes, bytes]],
+                 batch_items: Iterable[Tuple[bytes, Optional[bytes]]],
+                 reverse: bool) -> Iterator[Tuple[bytes, bytes]]:
+    """Merges the items sorted by key in db and batch
+
+    Batch items override db items with the same key
+    and a None value in batch means that the key has been deleted.
+
+    :param db_items: sorted items in db
+    :param batch_items: sorted items in batch
+    :param reverse: True if items are sorted in descending order
+    """
+    db_it = iter(db_items)
+    batch_it = iter(batch_items)
+    db_item = next(db_it, None)
+    batch_item = next(batch_it, None)
+
+    while db_item is not None or batch_item is not None:
+        if batch_item is None:
+            item_from_batch = False
+        elif db_item is None:
+            item_from_batch = True
+        elif db_item[0] == batch_item[0]:
+            # The value in batch overrides the one in db
+            db_item = next(db_it, None)
+            item_from_batch = True
+        else:
+            item_from_batch = (batch_item[0] < db_item[0]) != reverse
+
+        if item_from_batch:
+            key, value = batch_item
+            batch_item = next(batch_it, None)
+            if value is None:
+                continue
+        else:
+            key, value = db_item
+            db_item = next(db_it, None)
+
+        yield key, value
+
+
+# Value of a key existing in StateDB in the presence cache
+_PRESENT = b'\x01'
+
+# The number of keys from which get_many() looks up LevelDB on a thread pool
+_PARALLEL_GET_THRESHOLD = 32
+_PARALLEL_GET_WORKERS = 4
+
+_get_executor_lock = Lock()
+_get_executor: Optional['ThreadPoolExecutor'] = None
+
+
+def _get_thread_pool() -> 'ThreadPoolExecutor':
+    global _get_executor
+
+    with _get_executor_lock:
+        if _get_executor is None:
+            _get_executor = ThreadPoolExecutor(_PARALLEL_GET_WORKERS)
+
+    return _get_executor
+
+
 class KeyValueDatabase(object):
     @staticmethod
     def from_path(path: str,
-                  create_if_missing: bool=True) -> 'KeyValueDatabase':
+                  create_if_missing: bool=True,
+                  options: Optional[dict]=None) -> 'KeyValueDatabase':
         """
 
         :param path: db path
         :param create_if_missing:
+        :param options: keyword arguments for plyvel.DB such as lru_cache_size
+            See database.profile.get_leveldb_options()
         :return: KeyValueDatabase instance
         """
-        db = plyvel.DB(path, create_if_missing=create_if_missing)
+        if options is None:
+            options = {}
+
+        db = plyvel.DB(path, create_if_missing=create_if_missing, **options)
         return KeyValueDatabase(db)
 
-    def __init__(self, db: plyvel.DB) -> None:
+    def __init__(self, db: 'KeyValueStore') -> None:
         """Constructor
 
-        :param db: plyvel db instance
+        :param db: storage engine instance such as plyvel.DB or MemoryDB
         """
         self._db = db
 
@@ -82,6 +232,31 @@ class KeyValueDatabase(object):
         """
         return self._db.get(key)
 
+    def get_many(self, keys: List[bytes]) -> List[Optional[bytes]]:
+        """Get values from db using keys at once
+
+        plyvel releases the GIL while reading LevelDB,
+        so a long list of keys is split into chunks read on a thread pool.
+
+        :param keys: db keys
+        :return: values in the same order as keys, None for absent keys
+        """
+        get = self._db.get
+
+        if len(keys) < _PARALLEL_GET_THRESHOLD:
+            return [get(key) for key in keys]
+
+        chunk_size = -(-len(keys) // _PARALLEL_GET_WORKERS)
+        chunks = [keys[i:i + chunk_size]
+                  for i in range(0, len(keys), chunk_size)]
+
+        values = []
+        for chunk_values in _get_thread_pool().map(
+                lambda chunk: [get(key) for key in chunk], chunks):
+            values.extend(chunk_values)
+
+        return values
+
     def put(self, key: bytes, value: bytes) -> None:
         """Put value into db using key.
 
@@ -104,6 +279,14 @@ class KeyValueDatabase(object):
             self._db.close()
             self._db = None
 
+    def get_snapshot(self) -> 'KeyValueDatabase':
+        """Returns a read-only db which sees the states at this moment
+
+        Only get, get_many, iterator and close are available on the snapshot.
+        It should be closed after use.
+        """
+        return KeyValueDatabase(self._db.snapshot())
+
     def get_sub_db(self, key: bytes):
         """Get Prefixed db
 
@@ -111,8 +294,24 @@ class KeyValueDatabase(object):
         """
         return KeyValueDatabase(self._db.prefixed_db(key))
 
-    def iterator(self) -> iter:
-        return self._db.iterator()
+    def iterator(self,
+                 start: Optional[bytes]=None,
+                 stop: Optional[bytes]=None,
+                 reverse: bool=False) -> iter:
+        """Returns an iterator of (key, value) in key order
+
+        :param start: the first key to include
+        :param stop: the first key to exclude
+        :param reverse: iterate in descending order
+        """
+        return self._db.iterator(start=start, stop=stop, reverse=reverse)
+
+    def flush(self) -> None:
+        """Waits until written states are stored
+
+        Writes are synchronous, so there is nothing to wait for
+        """
+        pass
 
     def write_batch(self, states: dict) -> None:
         """bulk data modification
@@ -156,18 +355,18 @@ class DatabaseObserver(object):
     def on_put(self,
                context: 'IconScoreContext',
                key: bytes,
-               old_value: bytes,
+               old_value_exists: bool,
                new_value: bytes):
         """Invoked when `put` is called in `ContextDatabase`.
 
         :param context: SCORE context
         :param key: key
-        :param old_value: old value
+        :param old_value_exists: True if the key has a value which is not empty
         :param new_value: new value
         """
         if not self.__put_func:
             Logger.warning('__put_func is None', ICON_DB_LOG_TAG)
-        self.__put_func(context, key, old_value, new_value)
+        self.__put_func(context, key, old_value_exists, new_value)
 
     def on_delete(self,
                   context: 'IconScoreContext',
@@ -185,6 +384,44 @@ class DatabaseObserver(object):
         self.__delete_func(context, key, old_value)
 
 
+class ContextDatabaseSnapshot(object):
+    """The committed states of a ContextDatabase at a point in time
+
+    A query context which holds it reads all states from it,
+    so a block committed during the query is not visible to it.
+    With an overlay, it sees the states at a past block height.
+    """
+
+    def __init__(self,
+                 context_db: 'ContextDatabase',
+                 key_value_db: 'KeyValueDatabase',
+                 overlay: Optional[dict]=None) -> None:
+        """Constructor
+
+        :param context_db: the db which this snapshot is taken from
+        :param key_value_db: read-only snapshot db
+        :param overlay: key:value pairs overriding the ones in key_value_db
+            None value means absence. See StateHistory.get_overlay()
+        """
+        self.context_db = context_db
+        self.key_value_db = key_value_db
+        self.overlay = overlay
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Returns a value in this snapshot without cache, filter and metrics
+        """
+        overlay = self.overlay
+        if overlay is not None and key in overlay:
+            return overlay[key]
+
+        return self.key_value_db.get(key)
+
+    def release(self) -> None:
+        if self.key_value_db:
+            self.key_value_db.close()
+            self.key_value_db = None
+
+
 class ContextDatabase(object):
     """Database for an IconScore only used in the inside of iconservice.
 
@@ -192,14 +429,52 @@ class ContextDatabase(object):
     Cache + LevelDB
     """
 
-    def __init__(self, db: 'KeyValueDatabase', is_shared: bool=False) -> None:
+    def __init__(self,
+                 db: 'KeyValueDatabase',
+                 is_shared: bool=False,
+                 cache: Optional['LRUCache']=None,
+                 metrics: Optional['StorageMetrics']=None,
+                 key_filter: Optional['KeyFilter']=None,
+                 presence_cache: Optional['LRUCache']=None,
+                 history: Optional['StateHistory']=None) -> None:
         """Constructor
 
         :param db: KeyValueDatabase instance
+        :param is_shared: True if this db is shared with all SCOREs
+        :param cache: cache for the committed states in db
+        :param metrics: I/O counters of this db
+        :param key_filter: filter over the keys in db opened with db
+        :param presence_cache: cache for whether keys exist in db, used by exists()
+        :param history: reverse diffs of the blocks written to db
         """
         self.key_value_db = db
         # True: this db is shared with all SCOREs
         self._is_shared = is_shared
+        self._cache = cache
+        self._metrics = metrics
+        self._key_filter = key_filter
+        self._presence_cache = presence_cache
+        self._history = history
+
+    @property
+    def cache(self) -> Optional['LRUCache']:
+        return self._cache
+
+    @property
+    def metrics(self) -> Optional['StorageMetrics']:
+        return self._metrics
+
+    @property
+    def key_filter(self) -> Optional['KeyFilter']:
+        return self._key_filter
+
+    @property
+    def presence_cache(self) -> Optional['LRUCache']:
+        return self._presence_cache
+
+    @property
+    def history(self) -> Optional['StateHistory']:
+        return self._history
 
     def get(self, context: Optional['IconScoreContext'], key: bytes) -> bytes:
         """Returns value indicated by key from batch or StateDB
@@ -211,9 +486,20 @@ class ContextDatabase(object):
         context_type = _get_context_type(context)
 
         if context_type == IconScoreContextType.INVOKE:
-            return self.get_from_batch(context, key)
-        else:
-            return self.key_value_db.get(key)
+            profile = context.tx_profile
+            if profile is None:
+                return self.get_from_batch(context, key)
+
+            start_time = time.perf_counter()
+            value = self.get_from_batch(context, key)
+            profile.on_db_read(1, time.perf_counter() - start_time)
+            return value
+
+        snapshot = self._get_snapshot(context)
+        if snapshot is not None:
+            return self._get_from_snapshot(snapshot, context_type, key)
+
+        return self._get_from_state_db(key, context_type)
 
     def get_from_batch(self,
                        context: 'IconScoreContext',
@@ -232,17 +518,429 @@ class ContextDatabase(object):
         """
         block_batch = context.block_batch
         tx_batch = context.tx_batch
+        metrics = self._metrics
 
         # get value from tx_batch
         if key in tx_batch:
+            if metrics is not None:
+                metrics.on_read(context.type, ReadSource.TX_BATCH, key)
             return tx_batch[key]
 
         # get value from block_batch
         if key in block_batch:
+            if metrics is not None:
+                metrics.on_read(context.type, ReadSource.BLOCK_BATCH, key)
             return block_batch[key]
 
+        # get value from the block_batches of uncommitted parent blocks
+        if block_batch.parent is not None:
+            parent_batch = _find_parent_batch(block_batch, key)
+            if parent_batch is not None:
+                if metrics is not None:
+                    metrics.on_read(context.type, ReadSource.BLOCK_BATCH, key)
+                return parent_batch[key]
+
         # get value from state_db
-        return self.key_value_db.get(key)
+        return self._get_from_state_db(key, context.type)
+
+    def get_many(self,
+                 context: Optional['IconScoreContext'],
+                 keys: List[bytes]) -> List[Optional[bytes]]:
+        """Returns values indicated by keys from batch or StateDB at once
+
+        Every key is looked up in TransactionBatch and BlockBatch in one pass
+        and the remaining keys are read from StateDB together.
+
+        :param context:
+        :param keys:
+        :return: values in the same order as keys
+        """
+        context_type = _get_context_type(context)
+
+        if context_type != IconScoreContextType.INVOKE:
+            snapshot = self._get_snapshot(context)
+            if snapshot is not None:
+                return self._get_many_from_snapshot(snapshot, context_type, keys)
+
+            return self._get_many_from_state_db(keys, context_type)
+
+        profile = context.tx_profile
+        if profile is None:
+            return self._get_many_from_batch(context, keys)
+
+        start_time = time.perf_counter()
+        values = self._get_many_from_batch(context, keys)
+        profile.on_db_read(len(keys), time.perf_counter() - start_time)
+        return values
+
+    def _get_many_from_batch(self,
+                             context: 'IconScoreContext',
+                             keys: List[bytes]) -> List[Optional[bytes]]:
+        """Returns values indicated by keys from batch or StateDB for an invoke context
+        """
+        context_type = context.type
+        block_batch = context.block_batch
+        tx_batch = context.tx_batch
+        metrics = self._metrics
+
+        values = [None] * len(keys)
+        missing_indexes = []
+
+        for i, key in enumerate(keys):
+            if key in tx_batch:
+                values[i] = tx_batch[key]
+                if metrics is not None:
+                    metrics.on_read(context_type, ReadSource.TX_BATCH, key)
+            elif key in block_batch:
+                values[i] = block_batch[key]
+                if metrics is not None:
+                    metrics.on_read(context_type, ReadSource.BLOCK_BATCH, key)
+            else:
+                parent_batch = None
+                if block_batch.parent is not None:
+                    parent_batch = _find_parent_batch(block_batch, key)
+
+                if parent_batch is None:
+                    missing_indexes.append(i)
+                else:
+                    values[i] = parent_batch[key]
+                    if metrics is not None:
+                        metrics.on_read(context_type, ReadSource.BLOCK_BATCH, key)
+
+        if missing_indexes:
+            missing_values = self._get_many_from_state_db(
+                [keys[i] for i in missing_indexes], context_type)
+            for i, value in zip(missing_indexes, missing_values):
+                values[i] = value
+
+        return values
+
+    def exists(self, context: Optional['IconScoreContext'], key: bytes) -> bool:
+        """Returns whether a key has a value which is not empty
+
+        It is the same as bool(self.get(context, key)),
+        but a committed state is looked up in the presence cache first
+        not to read its value from StateDB.
+
+        :param context:
+        :param key:
+        """
+        context_type = _get_context_type(context)
+
+        if context_type == IconScoreContextType.INVOKE and context.tx_profile is not None:
+            start_time = time.perf_counter()
+            exists = self._exists(context, context_type, key)
+            context.tx_profile.on_db_read(1, time.perf_counter() - start_time)
+            return exists
+
+        return self._exists(context, context_type, key)
+
+    def _exists(self,
+                context: Optional['IconScoreContext'],
+                context_type: 'IconScoreContextType',
+                key: bytes) -> bool:
+        if context_type == IconScoreContextType.INVOKE:
+            tx_batch = context.tx_batch
+            if key in tx_batch:
+                return bool(tx_batch[key])
+
+            block_batch = context.block_batch
+            if key in block_batch:
+                return bool(block_batch[key])
+
+            if block_batch.parent is not None:
+                parent_batch = _find_parent_batch(block_batch, key)
+                if parent_batch is not None:
+                    return bool(parent_batch[key])
+        else:
+            snapshot = self._get_snapshot(context)
+            if snapshot is not None:
+                return bool(self._get_from_snapshot(snapshot, context_type, key))
+
+        presence_cache = self._presence_cache
+        if presence_cache is None:
+            return bool(self._get_from_state_db(key, context_type))
+
+        hit, value = presence_cache.get(key)
+        if hit:
+            return value is not None
+
+        generation = presence_cache.generation
+        exists = bool(self._get_from_state_db(key, context_type))
+        presence_cache.put(key, _PRESENT if exists else None, generation)
+
+        return exists
+
+    def get_snapshot(self) -> 'ContextDatabaseSnapshot':
+        """Returns the snapshot of the committed states in this db
+
+        The snapshot doesn't use the cache
+        which can contain the states committed after it is taken.
+        It should be released after use.
+        """
+        return ContextDatabaseSnapshot(self, self.key_value_db.get_snapshot())
+
+    def rewind_snapshot(self,
+                        snapshot: 'ContextDatabaseSnapshot',
+                        last_block_height: int,
+                        block_height: int) -> None:
+        """Makes a snapshot see the states at a past block height
+
+        :param snapshot: the snapshot taken from this db
+        :param last_block_height: the height of the last block in the snapshot
+        :param block_height: the block height to see
+        """
+        if block_height == last_block_height:
+            return
+        if self._history is None:
+            raise InvalidParamsException('State history is not enabled')
+
+        snapshot.overlay = self._history.get_overlay(last_block_height, block_height)
+
+    def _get_snapshot(self,
+                      context: Optional['IconScoreContext']) -> Optional['ContextDatabaseSnapshot']:
+        """Returns the snapshot of this db which a given context is pinned to
+
+        :param context:
+        :return: None if the context doesn't have a snapshot of this db
+        """
+        if context is None:
+            return None
+
+        snapshot = context.snapshot
+        if snapshot is None or snapshot.context_db is not self:
+            return None
+
+        return snapshot
+
+    def _get_from_snapshot(self,
+                           snapshot: 'ContextDatabaseSnapshot',
+                           context_type: 'IconScoreContextType',
+                           key: bytes) -> Optional[bytes]:
+        """Reads a value from a snapshot
+
+        The overlay is looked up before the key filter
+        because it has the keys deleted after the snapshot block height
+        """
+        overlay = snapshot.overlay
+        if overlay is not None and key in overlay:
+            if self._metrics is not None:
+                self._metrics.on_read(context_type, ReadSource.HISTORY, key)
+            return overlay[key]
+
+        return self._get_from_db(snapshot.key_value_db, context_type, key)
+
+    def _get_many_from_snapshot(self,
+                                snapshot: 'ContextDatabaseSnapshot',
+                                context_type: 'IconScoreContextType',
+                                keys: List[bytes]) -> List[Optional[bytes]]:
+        """Reads values from a snapshot at once
+        """
+        overlay = snapshot.overlay
+        if overlay is None:
+            return self._get_many_from_db(snapshot.key_value_db, context_type, keys)
+
+        metrics = self._metrics
+        values = [None] * len(keys)
+        missing_indexes = []
+
+        for i, key in enumerate(keys):
+            if key in overlay:
+                values[i] = overlay[key]
+                if metrics is not None:
+                    metrics.on_read(context_type, ReadSource.HISTORY, key)
+            else:
+                missing_indexes.append(i)
+
+        if missing_indexes:
+            missing_values = self._get_many_from_db(
+                snapshot.key_value_db, context_type, [keys[i] for i in missing_indexes])
+            for i, value in zip(missing_indexes, missing_values):
+                values[i] = value
+
+        return values
+
+    def _get_from_db(self,
+                     key_value_db: 'KeyValueDatabase',
+                     context_type: 'IconScoreContextType',
+                     key: bytes) -> Optional[bytes]:
+        """Reads a value from a given db measuring the time taken if metrics is on
+
+        Keys which are definitely absent are not read from db
+        """
+        metrics = self._metrics
+
+        key_filter = self._key_filter
+        if key_filter is not None and not key_filter.might_contain(key):
+            if metrics is not None:
+                metrics.on_read(context_type, ReadSource.FILTER, key)
+            return None
+
+        if metrics is None:
+            return key_value_db.get(key)
+
+        start_time = time.perf_counter()
+        value = key_value_db.get(key)
+        metrics.on_disk_read(context_type, key, time.perf_counter() - start_time)
+
+        return value
+
+    def _get_many_from_db(self,
+                          key_value_db: 'KeyValueDatabase',
+                          context_type: 'IconScoreContextType',
+                          keys: List[bytes]) -> List[Optional[bytes]]:
+        """Reads values from a given db at once
+
+        Keys which are definitely absent are not read from db
+        """
+        key_filter = self._key_filter
+        if key_filter is None or not key_filter.ready:
+            return self._read_many_from_db(key_value_db, context_type, keys)
+
+        metrics = self._metrics
+        values = [None] * len(keys)
+        present_indexes = []
+
+        for i, key in enumerate(keys):
+            if key_filter.might_contain(key):
+                present_indexes.append(i)
+            elif metrics is not None:
+                metrics.on_read(context_type, ReadSource.FILTER, key)
+
+        if present_indexes:
+            present_values = self._read_many_from_db(
+                key_value_db, context_type, [keys[i] for i in present_indexes])
+            for i, value in zip(present_indexes, present_values):
+                values[i] = value
+
+        return values
+
+    def _read_many_from_db(self,
+                           key_value_db: 'KeyValueDatabase',
+                           context_type: 'IconScoreContextType',
+                           keys: List[bytes]) -> List[Optional[bytes]]:
+        """Reads values from a given db at once measuring the time taken if metrics is on
+
+        The time taken is divided equally among keys
+        """
+        metrics = self._metrics
+        if metrics is None or len(keys) == 0:
+            return key_value_db.get_many(keys)
+
+        start_time = time.perf_counter()
+        values = key_value_db.get_many(keys)
+        elapsed = (time.perf_counter() - start_time) / len(keys)
+
+        for key in keys:
+            metrics.on_disk_read(context_type, key, elapsed)
+
+        return values
+
+    def _get_from_state_db(self,
+                           key: bytes,
+                           context_type: 'IconScoreContextType') -> Optional[bytes]:
+        """Returns a committed value from cache or StateDB
+
+        :param key:
+        :param context_type: the type of the context reading the value
+        :return: a value for a given key
+        """
+        cache = self._cache
+        if cache is None:
+            return self._get_from_db(self.key_value_db, context_type, key)
+
+        hit, value = cache.get(key)
+        if hit:
+            if self._metrics is not None:
+                self._metrics.on_read(context_type, ReadSource.CACHE, key)
+            return value
+
+        generation = cache.generation
+        value = self._get_from_db(self.key_value_db, context_type, key)
+        cache.put(key, value, generation)
+
+        return value
+
+    def _get_many_from_state_db(self,
+                                keys: List[bytes],
+                                context_type: 'IconScoreContextType') -> List[Optional[bytes]]:
+        """Returns committed values from cache or StateDB at once
+
+        :param keys:
+        :param context_type: the type of the context reading the values
+        :return: values in the same order as keys
+        """
+        cache = self._cache
+        if cache is None:
+            return self._get_many_from_db(self.key_value_db, context_type, keys)
+
+        metrics = self._metrics
+        values = [None] * len(keys)
+        missing_indexes = []
+
+        for i, key in enumerate(keys):
+            hit, value = cache.get(key)
+            if hit:
+                values[i] = value
+                if metrics is not None:
+                    metrics.on_read(context_type, ReadSource.CACHE, key)
+            else:
+                missing_indexes.append(i)
+
+        if missing_indexes:
+            generation = cache.generation
+            missing_keys = [keys[i] for i in missing_indexes]
+            missing_values = self._get_many_from_db(
+                self.key_value_db, context_type, missing_keys)
+
+            for i, key, value in zip(missing_indexes, missing_keys, missing_values):
+                values[i] = value
+                cache.put(key, value, generation)
+
+        return values
+
+    def iterate(self,
+                context: Optional['IconScoreContext'],
+                prefix: bytes,
+                start: Optional[bytes]=None,
+                stop: Optional[bytes]=None,
+                reverse: bool=False) -> Iterator[Tuple[bytes, bytes]]:
+        """Returns an iterator of (key, value) whose keys start with prefix
+
+        On INVOKE context, the states in TransactionBatch and BlockBatch with its parents
+        including deletions are merged with StateDB in key order.
+
+        :param context:
+        :param prefix: key prefix
+        :param start: the first key to include
+        :param stop: the first key to exclude
+        :param reverse: iterate in descending key order
+        :return: iterator of (key, value)
+        """
+        start, stop = _get_key_range(prefix, start, stop)
+
+        snapshot = self._get_snapshot(context)
+        if snapshot is None:
+            db_items = self.key_value_db.iterator(
+                start=start, stop=stop, reverse=reverse)
+        else:
+            db_items = snapshot.key_value_db.iterator(
+                start=start, stop=stop, reverse=reverse)
+            if snapshot.overlay:
+                overlay_items = _get_items_in_range([snapshot.overlay], start, stop, reverse)
+                db_items = _merge_items(db_items, overlay_items, reverse)
+
+        if _get_context_type(context) != IconScoreContextType.INVOKE:
+            return iter(db_items)
+
+        block_batch = context.block_batch
+        if isinstance(block_batch, SpeculativeBlockBatch):
+            block_batch.add_read_range(start, stop)
+
+        # The uncommitted parents of BlockBatch are merged under it
+        batch_items = _get_items_in_range(
+            _get_batch_chain(block_batch) + [context.tx_batch], start, stop, reverse)
+        return _merge_items(db_items, batch_items, reverse)
 
     def put(self,
             context: Optional['IconScoreContext'],
@@ -260,9 +958,14 @@ class ContextDatabase(object):
         context_type = _get_context_type(context)
 
         if context_type == IconScoreContextType.INVOKE:
-            context.tx_batch[key] = value
+            self._put_to_batch(context, key, value)
         else:
-            self.key_value_db.put(key, value)
+            if self._key_filter is not None:
+                with self._key_filter.update({key: value}):
+                    self.key_value_db.put(key, value)
+            else:
+                self.key_value_db.put(key, value)
+            self._on_write({key: value})
 
     def delete(self, context: Optional['IconScoreContext'], key: bytes):
         """Delete key from db
@@ -276,9 +979,21 @@ class ContextDatabase(object):
         context_type = _get_context_type(context)
 
         if context_type == IconScoreContextType.INVOKE:
-            context.tx_batch[key] = None
+            self._put_to_batch(context, key, None)
         else:
             self.key_value_db.delete(key)
+            self._on_write({key: None})
+
+    @staticmethod
+    def _put_to_batch(context: 'IconScoreContext', key: bytes, value: Optional[bytes]) -> None:
+        profile = context.tx_profile
+        if profile is None:
+            context.tx_batch[key] = value
+            return
+
+        start_time = time.perf_counter()
+        context.tx_batch[key] = value
+        profile.on_db_write(time.perf_counter() - start_time)
 
     def close(self, context: 'IconScoreContext') -> None:
         """close db
@@ -294,13 +1009,54 @@ class ContextDatabase(object):
 
     def write_batch(self,
                     context: 'IconScoreContext',
-                    states: dict):
+                    states: dict,
+                    block_height: Optional[int]=None):
+        """Writes states to db at once
+
+        :param context:
+        :param states: key:value pairs, None value means deletion
+        :param block_height: the height of the block whose states are written
+            The reverse diff of the block is stored if history is on
+        """
 
         if not _is_db_writable_on_context(context):
             raise DatabaseException(
                 'write_batch is not allowed on readonly context')
 
-        return self.key_value_db.write_batch(states)
+        if self._history is not None and block_height is not None:
+            keys = list(states)
+            old_values = self._get_many_from_state_db(keys, _get_context_type(context))
+            self._history.write(block_height, dict(zip(keys, old_values)))
+
+        if self._key_filter is not None:
+            with self._key_filter.update(states):
+                self.key_value_db.write_batch(states)
+        else:
+            self.key_value_db.write_batch(states)
+
+        self._on_write(states)
+
+    def _on_write(self, states: dict) -> None:
+        """Updates caches and metrics with the states written to db
+
+        Committed states should be written to db before updating caches
+
+        :param states: key:value pairs, None value means deletion
+        """
+        if self._cache is not None:
+            self._cache.update(states)
+        if self._presence_cache is not None:
+            # Entries of the presence cache are small enough to keep all committed keys
+            self._presence_cache.update(
+                {key: _PRESENT if value else None for key, value in states.items()},
+                insert=True)
+        if self._metrics is not None:
+            self._metrics.on_write(states)
+
+    def flush(self) -> None:
+        """Waits until the states written by write_batch are stored to db
+        """
+        self.key_value_db.flush()
 
     @staticmethod
     def from_path(path: str,
@@ -324,11 +1080,22 @@ class IconScoreDatabase(ContextGetter):
         :param context_db: ContextDatabase
         :param prefix:
         """
-        self.address = address
+        self._address = address
         self._prefix = prefix
         self._context_db = context_db
         self._observer: DatabaseObserver = None
 
+        # All keys of this db start with it. See _hash_key()
+        data = [address.to_bytes()]
+        if prefix is not None:
+            data.append(prefix)
+        data.append(b'')
+        self._key_prefix: bytes = b'|'.join(data)
+
+    @property
+    def address(self) -> 'Address':
+        return self._address
+
     def get(self, key: bytes) -> bytes:
         hashed_key = self._hash_key(key)
         value = self._context_db.get(self._context, hashed_key)
@@ -336,16 +1103,69 @@ class IconScoreDatabase(ContextGetter):
             self._observer.on_get(self._context, key, value)
         return value
 
+    def get_many(self, keys: List[bytes]) -> List[Optional[bytes]]:
+        """Returns values indicated by keys at once
+
+        Steps are charged for each key as get() does
+
+        :param keys:
+        :return: values in the same order as keys
+        """
+        hashed_keys = [self._hash_key(key) for key in keys]
+        values = self._context_db.get_many(self._context, hashed_keys)
+        if self._observer:
+            for key, value in zip(keys, values):
+                self._observer.on_get(self._context, key, value)
+        return values
+
+    def iterate(self,
+                prefix: bytes=b'',
+                start: Optional[bytes]=None,
+                stop: Optional[bytes]=None,
+                reverse: bool=False) -> Iterator[Tuple[bytes, bytes]]:
+        """Iterates the states of this db whose keys start with prefix
+
+        Pending states in a block are included
+        and a GET step is charged for every item.
+
+        :param prefix: key prefix
+        :param start: the first key to include
+        :param stop: the first key to exclude
+        :param reverse: iterate in descending key order
+        :return: iterator of (key, value), key is the one passed to put()
+        """
+        context = self._context
+        base_length = len(self._key_prefix)
+
+        items = self._context_db.iterate(
+            context,
+            self._hash_key(prefix),
+            None if start is None else self._hash_key(start),
+            None if stop is None else self._hash_key(stop),
+            reverse)
+
+        for hashed_key, value in items:
+            key = hashed_key[base_length:]
+            if self._observer:
+                self._observer.on_get(context, key, value)
+            yield key, value
+
     def put(self, key: bytes, value: bytes):
         hashed_key = self._hash_key(key)
-        if self._observer:
+        if not self._observer:
+            self._context_db.put(self._context, hashed_key, value)
+        elif value:
+            # Only whether the old value exists is needed to count steps
+            old_value_exists = self._context_db.exists(self._context, hashed_key)
+            self._observer.on_put(self._context, key, old_value_exists, value)
+            self._context_db.put(self._context, hashed_key, value)
+        else:
+            # If new value is None, then deletes the field
+            # The DELETE step needs the length of the old value
             old_value = self._context_db.get(self._context, hashed_key)
-            if value:
-                self._observer.on_put(self._context, key, old_value, value)
-            elif old_value:
-                # If new value is None, then deletes the field
+            if old_value:
                 self._observer.on_delete(self._context, key, old_value)
-        self._context_db.put(self._context, hashed_key, value)
+            self._context_db.put(self._context, hashed_key, value)
 
     def get_sub_db(self, prefix: bytes) -> 'IconScoreDatabase':
         if prefix is None:
@@ -357,7 +1177,7 @@ class IconScoreDatabase(ContextGetter):
             prefix = b'|'.join([self._prefix, prefix])
 
         icon_score_database = IconScoreDatabase(
-            self.address, self._context_db, prefix)
+            self._address, self._context_db, prefix)
 
         icon_score_database.set_observer(self._observer)
 
@@ -382,12 +1202,9 @@ class IconScoreDatabase(ContextGetter):
         """All key is hashed and stored
         to StateDB to avoid key conflicts among SCOREs
 
+        Key format: address|prefix|key
+
         :params key: key passed by SCORE
         :return: key bytes
         """
-        data = [self.address.to_bytes()]
-        if self._prefix is not None:
-            data.append(self._prefix)
-        data.append(key)
-
-        return b'|'.join(data)
+        return self._key_prefix + key
@@ -17,9 +17,19 @@
 
 import os
 from enum import IntEnum
+from typing import Optional
 
+from .backend import Backend, MemoryDB
+from .cache import LRUCache
 from .db import KeyValueDatabase, ContextDatabase
+from .history import StateHistory
+from .key_filter import KeyFilter, KEY_FILTER_NAME
+from .metrics import StorageMetrics
+from .profile import Keyspace, get_leveldb_options, get_keyspace_profile
+from .shard import ShardedKeyValueDatabase, ICX_SHARD_INDEX
+from .write_behind import WriteBehindKeyValueDatabase
 from ..base.address import Address
+from ..base.exception import DatabaseException
 
 
 class ContextDatabaseFactory(object):
@@ -27,45 +37,186 @@ class ContextDatabaseFactory(object):
     class Mode(IntEnum):
         SINGLE_DB = 0
         MULTIPLE_DB = 1
+        # One shared context db whose keyspace is spread over several dbs
+        SHARDED_DB = 2
 
     _state_db_root_path: str = None
     _mode: 'Mode' = Mode.SINGLE_DB
+    _backend: 'Backend' = Backend.LEVELDB
+    _cache_size: int = 0
+    _score_shard_count: int = 0
+    _write_behind: bool = False
+    _metrics: bool = False
+    _metrics_dump_path: str = ''
+    _profiles: dict = {}
+    _key_filter_capacity: int = 0
+    _presence_cache_size: int = 0
+    _history_retention: int = 0
     _shared_context_db: 'ContextDatabase' = None
+    # Context dbs opened by name in MULTIPLE_DB mode
+    _context_dbs: dict = {}
+    # In-memory dbs are kept by name until close() like the ones on disk
+    _memory_dbs: dict = {}
 
     @classmethod
-    def open(cls, state_db_root_path: str, mode: 'Mode'):
+    def open(cls,
+             state_db_root_path: str,
+             mode: 'Mode',
+             cache_size: int = 0,
+             backend: 'Backend' = Backend.LEVELDB,
+             score_shard_count: int = 0,
+             write_behind: bool = False,
+             metrics: bool = False,
+             metrics_dump_path: str = '',
+             profiles: Optional[dict] = None,
+             key_filter_capacity: int = 0,
+             presence_cache_size: int = 0,
+             history_retention: int = 0):
+        """
+
+        :param state_db_root_path:
+        :param mode: SINGLE_DB, MULTIPLE_DB or SHARDED_DB
+        :param cache_size: memory budget in bytes to cache the states of shared db
+            0 means no cache
+        :param backend: storage engine
+        :param score_shard_count: the number of shards for SCOREs in SHARDED_DB mode
+            ICX accounts are stored in another shard
+        :param write_behind: True if the shared db writes committed states
+            on a background thread
+        :param metrics: True if the I/O of shared db is counted
+        :param metrics_dump_path: the file where the metrics of each block are appended
+            empty string means no dump
+        :param profiles: LevelDB profiles by keyspace
+            See database.profile.Keyspace and PRESET_PROFILES
+        :param key_filter_capacity: the number of keys expected in shared db
+            to size the filter of absent keys. 0 means no filter
+        :param presence_cache_size: memory budget in bytes to cache
+            whether keys exist in shared db. 0 means no cache
+        :param history_retention: the number of past blocks whose states
+            can be read from shared db. 0 means no history
+        """
         cls.close()
 
+        if mode == cls.Mode.SHARDED_DB and score_shard_count < 1:
+            raise DatabaseException(f'Invalid score shard count: {score_shard_count}')
+
         cls._state_db_root_path = state_db_root_path
         cls._mode = mode
+        cls._cache_size = cache_size
+        cls._backend = backend
+        cls._score_shard_count = score_shard_count
+        cls._write_behind = write_behind
+        cls._metrics = metrics
+        cls._metrics_dump_path = metrics_dump_path
+        cls._key_filter_capacity = key_filter_capacity
+        cls._presence_cache_size = presence_cache_size
+        cls._history_retention = history_retention
+
+        # Checks profiles here not to fail on opening a db later
+        cls._profiles = {}
+        for keyspace in (Keyspace.DEFAULT, Keyspace.SCORE, Keyspace.HISTORY):
+            profile = get_keyspace_profile(profiles, keyspace)
+            cls._profiles[keyspace] = get_leveldb_options(profile)
+
+    @classmethod
+    def _create_key_value_db(cls,
+                             name: str,
+                             keyspace: str = Keyspace.DEFAULT) -> 'KeyValueDatabase':
+        if cls._backend == Backend.MEMORY:
+            memory_db = cls._memory_dbs.get(name)
+            if memory_db is None:
+                memory_db = MemoryDB()
+                cls._memory_dbs[name] = memory_db
+            # Closing the returned db doesn't discard the states of memory_db
+            return KeyValueDatabase(memory_db.prefixed_db(b''))
+
+        path = os.path.join(cls._state_db_root_path, name)
+        return KeyValueDatabase.from_path(path, options=cls._profiles.get(keyspace))
+
+    @classmethod
+    def _get_key_filter_path(cls) -> Optional[str]:
+        if cls._backend == Backend.MEMORY:
+            return None
+
+        return os.path.join(cls._state_db_root_path, KEY_FILTER_NAME)
 
     @classmethod
     def get_shared_db(cls) -> ContextDatabase:
         if cls._shared_context_db is None:
-            path = os.path.join(cls._state_db_root_path, 'icon_dex')
-            key_value_db = KeyValueDatabase.from_path(path)
+            if cls._mode == cls.Mode.SHARDED_DB:
+                key_value_db = ShardedKeyValueDatabase.open(
+                    [cls._create_key_value_db(
+                        f'icon_dex_shard{i}',
+                        Keyspace.DEFAULT if i == ICX_SHARD_INDEX else Keyspace.SCORE)
+                     for i in range(cls._score_shard_count + 1)])
+            else:
+                key_value_db = cls._create_key_value_db('icon_dex')
+
+            if cls._write_behind:
+                key_value_db = WriteBehindKeyValueDatabase(key_value_db)
+
+            cache = LRUCache(cls._cache_size) if cls._cache_size > 0 else None
+            presence_cache = \
+                LRUCache(cls._presence_cache_size) if cls._presence_cache_size > 0 else None
+            metrics = StorageMetrics(cls._metrics_dump_path or None) if cls._metrics else None
+
+            key_filter = None
+            if cls._key_filter_capacity > 0:
+                key_filter = KeyFilter(cls._key_filter_capacity, cls._get_key_filter_path())
+                key_filter.open(key_value_db)
+
+            history = None
+            if cls._history_retention > 0:
+                history = StateHistory(
+                    cls._create_key_value_db('icon_dex_history', Keyspace.HISTORY),
+                    cls._history_retention)
+
             cls._shared_context_db = ContextDatabase(
-                key_value_db, is_shared=True)
+                key_value_db, is_shared=True, cache=cache, metrics=metrics,
+                key_filter=key_filter, presence_cache=presence_cache, history=history)
 
         return cls._shared_context_db
 
     @classmethod
     def create_by_address(cls, address: 'Address') -> ContextDatabase:
-        if cls._mode == cls.Mode.SINGLE_DB:
-            return cls.get_shared_db()
+        if cls._mode == cls.Mode.MULTIPLE_DB:
+            return cls._get_context_db(address.body.hex(), Keyspace.SCORE)
         else:
-            return cls.create_by_name(address.body.hex())
+            return cls.get_shared_db()
 
     @classmethod
     def create_by_name(cls, name: str) -> ContextDatabase:
-        if cls._mode == cls.Mode.SINGLE_DB:
+        if cls._mode != cls.Mode.MULTIPLE_DB:
             return cls.get_shared_db()
-        else:
-            path = os.path.join(cls._state_db_root_path, name)
-            return ContextDatabase.from_path(path)
+
+        return cls._get_context_db(name, Keyspace.DEFAULT)
+
+    @classmethod
+    def _get_context_db(cls, name: str, keyspace: str) -> ContextDatabase:
+        context_db = cls._context_dbs.get(name)
+        if context_db is None:
+            # The factory owns cached dbs and closes them in close()
+            context_db = ContextDatabase(
+                cls._create_key_value_db(name, keyspace), is_shared=True)
+            cls._context_dbs[name] = context_db
+
+        return context_db
 
     @classmethod
     def close(cls):
         if cls._shared_context_db:
+            # Keys are added to the filter before written, so it can be saved first
+            if cls._shared_context_db.key_filter is not None:
+                cls._shared_context_db.key_filter.close()
             cls._shared_context_db.key_value_db.close()
+            if cls._shared_context_db.history is not None:
+                cls._shared_context_db.history.key_value_db.close()
             cls._shared_context_db = None
+
+        for context_db in cls._context_dbs.values():
+            context_db.key_value_db.close()
+        cls._context_dbs.clear()
+
+        for memory_db in cls._memory_dbs.values():
+            memory_db.close()
+        cls._memory_dbs.clear()
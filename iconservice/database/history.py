@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import struct
+from threading import Lock
+from typing import TYPE_CHECKING, Optional
+
+from ..base.exception import InvalidParamsException
+
+if TYPE_CHECKING:
+    from .db import KeyValueDatabase
+
+# Leads a diff not to store an empty value which write_batch regards as deletion
+_DIFF_VERSION = b'\x00'
+# key size, value size (-1 means that the key was absent)
+_entry_header = struct.Struct('>Ii')
+_height_struct = struct.Struct('>Q')
+
+
+def _encode_height(block_height: int) -> bytes:
+    return _height_struct.pack(block_height)
+
+
+def _decode_height(key: bytes) -> int:
+    return _height_struct.unpack(key)[0]
+
+
+def _encode_diff(diff: dict) -> bytes:
+    data = [_DIFF_VERSION]
+    for key, value in diff.items():
+        value_size = -1 if value is None else len(value)
+        data.append(_entry_header.pack(len(key), value_size))
+        data.append(key)
+        if value is not None:
+            data.append(value)
+
+    return b''.join(data)
+
+
+def _decode_diff(data: bytes) -> dict:
+    diff = {}
+
+    offset = len(_DIFF_VERSION)
+    while offset < len(data):
+        key_size, value_size = _entry_header.unpack_from(data, offset)
+        offset += _entry_header.size
+
+        key = data[offset:offset + key_size]
+        offset += key_size
+
+        if value_size < 0:
+            value = None
+        else:
+            value = data[offset:offset + value_size]
+            offset += value_size
+
+        diff[key] = value
+
+    return diff
+
+
+class StateHistory(object):
+    """Reverse diffs of the blocks committed to a state db
+
+    The reverse diff of a block has the values which the keys changed by the block
+    had before it. Applying the diffs of the last blocks in reverse order
+    over the current states gives the states at a past block height,
+    so a read at the height costs the size of the diffs instead of a replay.
+    Diffs are stored in their own db by block height
+    and the ones older than retention blocks are removed.
+    """
+
+    def __init__(self, key_value_db: 'KeyValueDatabase', retention: int) -> None:
+        """Constructor
+
+        :param key_value_db: the db where diffs are stored
+        :param retention: the number of past blocks whose states are kept
+        """
+        self._db = key_value_db
+        self._retention = retention
+        self._lock = Lock()
+
+        self._first_height: Optional[int] = None
+        self._last_height: Optional[int] = None
+        for key, _ in key_value_db.iterator():
+            self._first_height = _decode_height(key)
+            break
+        for key, _ in key_value_db.iterator(reverse=True):
+            self._last_height = _decode_height(key)
+            break
+
+    @property
+    def retention(self) -> int:
+        return self._retention
+
+    @property
+    def key_value_db(self) -> 'KeyValueDatabase':
+        return self._db
+
+    def write(self, block_height: int, diff: dict) -> None:
+        """Stores the reverse diff of a block and removes expired ones
+
+        It should be called before the states of the block are written,
+        so the diffs of the blocks in a state db are always available.
+
+        :param block_height: the height of the block being committed
+        :param diff: key:value pairs before the block, None value means absence
+        """
+        states = {_encode_height(block_height): _encode_diff(diff)}
+
+        with self._lock:
+            expired_height = block_height - self._retention
+            if self._first_height is not None and self._first_height <= expired_height:
+                stop = _encode_height(expired_height + 1)
+                for key, _ in self._db.iterator(stop=stop):
+                    states[key] = None
+                self._first_height = expired_height + 1
+
+            self._db.write_batch(states)
+
+            if self._first_height is None:
+                self._first_height = block_height
+            self._last_height = block_height
+
+    def get_overlay(self, last_block_height: int, block_height: int) -> dict:
+        """Returns the states to put over the ones at last_block_height
+        to see the ones at block_height
+
+        :param last_block_height: the height of the block which states are committed with
+        :param block_height: past block height
+        :return: key:value pairs at block_height, None value means absence
+        """
+        if block_height < 0 or block_height > last_block_height:
+            raise InvalidParamsException(f'Invalid block height: {block_height}')
+        if last_block_height - block_height > self._retention:
+            raise InvalidParamsException(f'State at block height {block_height} is not retained')
+
+        heights = range(last_block_height, block_height, -1)
+        diffs = self._db.get_many([_encode_height(height) for height in heights])
+
+        overlay = {}
+        # The diffs of older blocks override the ones of newer blocks
+        for data in diffs:
+            if data is None:
+                raise InvalidParamsException(
+                    f'State at block height {block_height} is not available')
+            overlay.update(_decode_diff(data))
+
+        return overlay
+
+    def get_status(self) -> dict:
+        first_height = self._first_height
+
+        return {
+            'retention': self._retention,
+            # The states before the block of the oldest diff can be read
+            'oldestBlockHeight': None if first_height is None else first_height - 1,
+            'lastBlockHeight': self._last_height
+        }
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import math
+import os
+import struct
+from contextlib import contextmanager
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Optional
+
+from iconcommons.logger import Logger
+
+from ..base.exception import DatabaseException
+from ..icon_constant import ICON_DB_LOG_TAG
+
+if TYPE_CHECKING:
+    from .db import KeyValueDatabase
+
+# The file of the filter saved in the state db root path
+KEY_FILTER_NAME = 'icon_dex.keyfilter'
+
+_FILE_MAGIC = b'ICONKF\x00\x01'
+# capacity, hash count, bit count, key count
+_file_header = struct.Struct('>QBQQ')
+
+_FALSE_POSITIVE_RATE = 0.01
+# The number of scanned keys added to a building filter at a time with the lock held
+_REBUILD_CHUNK_SIZE = 4096
+_MAX_HASH_COUNT = 16
+
+
+class BloomFilter(object):
+    """Bloom filter over bytes keys
+
+    The number of bits is a power of 2, so bit positions are taken
+    from a single blake2b digest by masking.
+    """
+
+    def __init__(self, capacity: int, bit_count: int=0, hash_count: int=0) -> None:
+        """Constructor
+
+        :param capacity: the number of keys expected to be added
+        :param bit_count: the size of the filter. 0 means the one for capacity
+        :param hash_count: the number of bit positions of a key. 0 means the best one for bit_count
+        """
+        capacity = max(capacity, 1)
+
+        if bit_count == 0:
+            bit_count = -capacity * math.log(_FALSE_POSITIVE_RATE) / (math.log(2) ** 2)
+            bit_count = 1 << max(int(math.ceil(math.log2(bit_count))), 3)
+        if hash_count == 0:
+            hash_count = round(bit_count / capacity * math.log(2))
+            hash_count = min(max(hash_count, 1), _MAX_HASH_COUNT)
+
+        self.capacity = capacity
+        self.count = 0
+        self._bit_count = bit_count
+        self._hash_count = hash_count
+        self._mask = bit_count - 1
+        self._positions = struct.Struct(f'>{hash_count}I')
+        self._bits = bytearray(bit_count // 8)
+
+    @property
+    def bit_count(self) -> int:
+        return self._bit_count
+
+    @property
+    def hash_count(self) -> int:
+        return self._hash_count
+
+    def _get_positions(self, key: bytes):
+        digest = hashlib.blake2b(key, digest_size=self._positions.size).digest()
+        mask = self._mask
+        return [position & mask for position in self._positions.unpack(digest)]
+
+    def add(self, key: bytes) -> None:
+        """Adds a key
+
+        count is increased only if any bit of the key is newly set,
+        so it approximates the number of distinct keys
+        """
+        bits = self._bits
+        added = False
+
+        for position in self._get_positions(key):
+            index = position >> 3
+            bit = 1 << (position & 7)
+            if not bits[index] & bit:
+                bits[index] |= bit
+                added = True
+
+        if added:
+            self.count += 1
+
+    def might_contain(self, key: bytes) -> bool:
+        """Returns False if a key has never been added
+
+        :param key:
+        :return: True if the key may have been added
+        """
+        bits = self._bits
+        for position in self._get_positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+
+        return True
+
+    def to_bytes(self) -> bytes:
+        header = _file_header.pack(self.capacity, self._hash_count, self._bit_count, self.count)
+        return b''.join([_FILE_MAGIC, header, bytes(self._bits)])
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'BloomFilter':
+        if not data.startswith(_FILE_MAGIC):
+            raise DatabaseException('Invalid key filter format')
+
+        offset = len(_FILE_MAGIC)
+        capacity, hash_count, bit_count, count = _file_header.unpack_from(data, offset)
+        offset += _file_header.size
+
+        if len(data) - offset != bit_count // 8:
+            raise DatabaseException('Invalid key filter size')
+
+        bloom_filter = BloomFilter(capacity, bit_count, hash_count)
+        bloom_filter.count = count
+        bloom_filter._bits[:] = data[offset:]
+        return bloom_filter
+
+
+class KeyFilter(object):
+    """Filter over the keys committed to a state db to skip reading absent keys
+
+    Keys are added to the filter before they are written to db
+    and never removed, so a key which the filter doesn't contain
+    is definitely absent in db and in every snapshot of it.
+
+    The filter is saved to a file on close and loaded on the next open.
+    The file is removed on loading, so it isn't used after a crash.
+    Without the file, the filter is rebuilt by scanning db in background
+    and every key is regarded as present until it is done.
+    It is also rebuilt with double capacity when it gets full.
+    """
+
+    def __init__(self, capacity: int, path: Optional[str]=None) -> None:
+        """Constructor
+
+        :param capacity: the number of keys expected in db
+        :param path: the file where the filter is saved on close. None means not to save it
+        """
+        self._capacity = capacity
+        self._path = path
+        self._lock = Lock()
+
+        self._filter: Optional['BloomFilter'] = None
+        # A filter being built by scanning db
+        self._building_filter: Optional['BloomFilter'] = None
+        self._thread: Optional['Thread'] = None
+        self._key_value_db: Optional['KeyValueDatabase'] = None
+        self._closed = False
+
+        self.negatives = 0
+        self.rebuilds = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def open(self, key_value_db: 'KeyValueDatabase') -> None:
+        """Loads the saved filter or starts to build it from db
+
+        :param key_value_db: the db whose keys are filtered
+        """
+        self._key_value_db = key_value_db
+
+        bloom_filter = self._load()
+        if bloom_filter is not None:
+            self._filter = bloom_filter
+        else:
+            self._start_rebuild(self._capacity)
+
+    def _load(self) -> Optional['BloomFilter']:
+        if self._path is None or not os.path.exists(self._path):
+            return None
+
+        try:
+            with open(self._path, 'rb') as f:
+                data = f.read()
+            os.remove(self._path)
+            return BloomFilter.from_bytes(data)
+        except (OSError, DatabaseException, struct.error) as e:
+            Logger.warning(f'Failed to load key filter: {e}', ICON_DB_LOG_TAG)
+            return None
+
+    def might_contain(self, key: bytes) -> bool:
+        """Returns False if a key is definitely absent in db
+
+        :param key:
+        """
+        bloom_filter = self._filter
+        if bloom_filter is None or bloom_filter.might_contain(key):
+            return True
+
+        self.negatives += 1
+        return False
+
+    @contextmanager
+    def update(self, states: dict):
+        """Adds keys to the filter before they are written to db in the context
+
+        Usage:
+            with key_filter.update(states):
+                key_value_db.write_batch(states)
+
+        :param states: key:value pairs to be written, None value means deletion
+        """
+        with self._lock:
+            for bloom_filter in (self._filter, self._building_filter):
+                if bloom_filter is not None:
+                    for key, value in states.items():
+                        # Deleted keys are left in the filter
+                        if value:
+                            bloom_filter.add(key)
+
+            yield
+
+        bloom_filter = self._filter
+        if bloom_filter is not None and bloom_filter.count > bloom_filter.capacity \
+                and self._thread is None:
+            self._start_rebuild(bloom_filter.capacity * 2)
+
+    def _start_rebuild(self, capacity: int) -> None:
+        self._building_filter = BloomFilter(capacity)
+        self._thread = Thread(target=self._rebuild, name='KeyFilterBuilder', daemon=True)
+        self._thread.start()
+
+    def _rebuild(self) -> None:
+        try:
+            # Keys written after the snapshot is taken are added by update()
+            with self._lock:
+                snapshot = self._key_value_db.get_snapshot()
+
+            bloom_filter = self._building_filter
+            try:
+                keys = []
+                for key, _ in snapshot.iterator():
+                    if self._closed:
+                        return
+                    keys.append(key)
+                    if len(keys) >= _REBUILD_CHUNK_SIZE:
+                        self._add_keys(bloom_filter, keys)
+                        keys = []
+                self._add_keys(bloom_filter, keys)
+            finally:
+                snapshot.close()
+
+            with self._lock:
+                self._filter = bloom_filter
+                self._building_filter = None
+                self.rebuilds += 1
+        except BaseException as e:
+            Logger.exception(f'Failed to build key filter: {e}', ICON_DB_LOG_TAG)
+            self._building_filter = None
+        finally:
+            self._thread = None
+
+    def _add_keys(self, bloom_filter: 'BloomFilter', keys: list) -> None:
+        # update() adds committed keys to the same filter at the same time,
+        # and setting a bit is not atomic
+        with self._lock:
+            for key in keys:
+                bloom_filter.add(key)
+
+    def close(self) -> None:
+        """Stops building the filter and saves it
+
+        It should be called after the last write to db
+        """
+        self._closed = True
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+        if self._path is None or self._filter is None:
+            return
+
+        try:
+            with open(self._path, 'wb') as f:
+                f.write(self._filter.to_bytes())
+        except OSError as e:
+            Logger.warning(f'Failed to save key filter: {e}', ICON_DB_LOG_TAG)
+
+    def get_status(self) -> dict:
+        bloom_filter = self._filter
+
+        return {
+            'ready': bloom_filter is not None,
+            'building': self._building_filter is not None,
+            'keys': bloom_filter.count if bloom_filter else 0,
+            'capacity': bloom_filter.capacity if bloom_filter else self._capacity,
+            'size': bloom_filter.bit_count // 8 if bloom_filter else 0,
+            'negatives': self.negatives,
+            'rebuilds': self.rebuilds
+        }
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple
+
+from iconcommons.logger import Logger
+
+from ..icon_constant import ICON_DB_LOG_TAG
+
+if TYPE_CHECKING:
+    from ..icon_constant import IconScoreContextType
+
+
+class KeyClass(object):
+    """Classes of state db keys by the component which owns them
+    """
+    ACCOUNT = 'account'
+    DEPLOY = 'deploy'
+    SCORE = 'score'
+    GLOBAL = 'global'
+    OTHER = 'other'
+
+
+class ReadSource(object):
+    """Where a value read by ContextDatabase comes from
+    """
+    TX_BATCH = 'txBatch'
+    BLOCK_BATCH = 'blockBatch'
+    CACHE = 'cache'
+    # Answered as absent by KeyFilter without reading disk
+    FILTER = 'filter'
+    # Past values of a query at a block height
+    HISTORY = 'history'
+    DISK = 'disk'
+
+
+# Upper bounds of disk read latency buckets in microseconds.
+# The last bucket counts the reads slower than all of them
+LATENCY_BUCKETS = (10, 100, 1000, 10000)
+
+_DEPLOY_KEY_PREFIX = b'isds|'
+# Singletons of IcxEngine and IcxStorage
+_GLOBAL_KEYS = frozenset([b'genesis', b'fee_treasury', b'total_supply', b'last_block'])
+
+_EOA_ADDRESS_SIZE = 20
+_CONTRACT_ADDRESS_SIZE = 21
+_CONTRACT_ADDRESS_PREFIX = 1
+_KEY_SEPARATOR = ord('|')
+
+
+def get_key_class(key: bytes) -> str:
+    """Classifies a state db key
+
+    :param key: state db key
+    :return: one of KeyClass
+    """
+    size = len(key)
+
+    if key[:1] == b'\x01':
+        if size == _CONTRACT_ADDRESS_SIZE:
+            return KeyClass.ACCOUNT
+        if size > _CONTRACT_ADDRESS_SIZE and key[_CONTRACT_ADDRESS_SIZE] == _KEY_SEPARATOR:
+            return KeyClass.SCORE
+
+    if key in _GLOBAL_KEYS:
+        return KeyClass.GLOBAL
+    if key.startswith(_DEPLOY_KEY_PREFIX):
+        return KeyClass.DEPLOY
+    if size == _EOA_ADDRESS_SIZE:
+        return KeyClass.ACCOUNT
+
+    return KeyClass.OTHER
+
+
+def _get_latency_bucket(elapsed: float) -> int:
+    elapsed_us = elapsed * 1000000
+    for i, bound in enumerate(LATENCY_BUCKETS):
+        if elapsed_us < bound:
+            return i
+
+    return len(LATENCY_BUCKETS)
+
+
+class _Counters(object):
+    def __init__(self) -> None:
+        # (context type, read source, key class): count
+        self.reads: Dict[Tuple[str, str, str], int] = {}
+        # key class: [read count, total time, count of each latency bucket...]
+        self.disk_reads: Dict[str, List] = {}
+        # key class: [count, bytes]
+        self.writes: Dict[str, List[int]] = {}
+
+    def merge(self, other: '_Counters') -> None:
+        for key, count in other.reads.items():
+            self.reads[key] = self.reads.get(key, 0) + count
+
+        for key_class, values in other.disk_reads.items():
+            merged = self.disk_reads.setdefault(key_class, [0] * len(values))
+            for i, value in enumerate(values):
+                merged[i] += value
+
+        for key_class, (count, size) in other.writes.items():
+            merged = self.writes.setdefault(key_class, [0, 0])
+            merged[0] += count
+            merged[1] += size
+
+    def to_dict(self) -> dict:
+        reads = {}
+        for (context_type, source, key_class), count in sorted(self.reads.items()):
+            reads.setdefault(context_type, {}).setdefault(source, {})[key_class] = count
+
+        disk_reads = {}
+        for key_class, values in sorted(self.disk_reads.items()):
+            disk_reads[key_class] = {
+                'count': values[0],
+                'time': values[1],
+                'latencyBuckets': values[2:]
+            }
+
+        writes = {}
+        for key_class, (count, size) in sorted(self.writes.items()):
+            writes[key_class] = {'count': count, 'bytes': size}
+
+        return {
+            'reads': reads,
+            'diskReads': disk_reads,
+            'writes': writes
+        }
+
+
+class StorageMetrics(object):
+    """Counts the state db I/O of ContextDatabase
+
+    Reads are counted by context type, source and key class.
+    The latency of disk reads is recorded into histograms by key class.
+    Counters are collected per block: end_block() closes the current block,
+    adds it to the totals and appends it to the dump file if given.
+    It is shared by invoke and query threads, so every access is locked.
+    """
+
+    def __init__(self, dump_path: Optional[str]=None) -> None:
+        """Constructor
+
+        :param dump_path: the file where the metrics of each block are appended
+            as a line of json. None means no dump
+        """
+        self._lock = Lock()
+        self._dump_path = dump_path
+
+        self._current = _Counters()
+        self._total = _Counters()
+        self._last_block: Optional[dict] = None
+
+    def on_read(self,
+                context_type: 'IconScoreContextType',
+                source: str,
+                key: bytes) -> None:
+        """Counts a read served from memory
+
+        :param context_type:
+        :param source: one of ReadSource
+        :param key: state db key
+        """
+        counter_key = (context_type.name.lower(), source, get_key_class(key))
+
+        with self._lock:
+            reads = self._current.reads
+            reads[counter_key] = reads.get(counter_key, 0) + 1
+
+    def on_disk_read(self,
+                     context_type: 'IconScoreContextType',
+                     key: bytes,
+                     elapsed: float) -> None:
+        """Counts a read from disk
+
+        :param context_type:
+        :param key: state db key
+        :param elapsed: the time taken to read the key in seconds
+        """
+        key_class = get_key_class(key)
+        counter_key = (context_type.name.lower(), ReadSource.DISK, key_class)
+        bucket = _get_latency_bucket(elapsed)
+
+        with self._lock:
+            reads = self._current.reads
+            reads[counter_key] = reads.get(counter_key, 0) + 1
+
+            disk_reads = self._current.disk_reads.get(key_class)
+            if disk_reads is None:
+                disk_reads = [0, 0.0] + [0] * (len(LATENCY_BUCKETS) + 1)
+                self._current.disk_reads[key_class] = disk_reads
+
+            disk_reads[0] += 1
+            disk_reads[1] += elapsed
+            disk_reads[2 + bucket] += 1
+
+    def on_write(self, states: dict) -> None:
+        """Counts the states written to disk
+
+        :param states: key:value pairs, None value means deletion
+        """
+        writes = {}
+        for key, value in states.items():
+            counter = writes.setdefault(get_key_class(key), [0, 0])
+            counter[0] += 1
+            counter[1] += len(key) + (len(value) if value else 0)
+
+        with self._lock:
+            for key_class, (count, size) in writes.items():
+                counter = self._current.writes.setdefault(key_class, [0, 0])
+                counter[0] += count
+                counter[1] += size
+
+    def end_block(self, block_height: int) -> None:
+        """Closes the counters of a block which has been committed
+
+        :param block_height: the height of the committed block
+        """
+        with self._lock:
+            counters = self._current
+            self._current = _Counters()
+            self._total.merge(counters)
+
+            last_block = counters.to_dict()
+            last_block['blockHeight'] = block_height
+            self._last_block = last_block
+
+        if self._dump_path:
+            self._dump(last_block)
+
+    def _dump(self, block_metrics: dict) -> None:
+        try:
+            with open(self._dump_path, 'a') as f:
+                f.write(json.dumps(block_metrics))
+                f.write('\n')
+        except OSError as e:
+            # Metrics are not worth stopping the commit
+            Logger.warning(f'Failed to dump state db metrics: {e}', ICON_DB_LOG_TAG)
+
+    def get_status(self) -> dict:
+        with self._lock:
+            total = self._total.to_dict()
+            total['latencyBucketBounds'] = list(LATENCY_BUCKETS)
+
+            return {
+                'lastBlock': self._last_block,
+                'total': total
+            }
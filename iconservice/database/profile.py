@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Optional, Union
+
+from ..base.exception import DatabaseException
+
+
+class Keyspace(object):
+    """Groups of state dbs which can be opened with different profiles
+    """
+    # The shared db, or the icx shard in SHARDED_DB mode
+    DEFAULT = 'default'
+    # SCORE shards in SHARDED_DB mode and the dbs of SCOREs in MULTIPLE_DB mode
+    SCORE = 'score'
+    # The reverse diffs of blocks. See database.history.StateHistory
+    HISTORY = 'history'
+
+
+# Profile option: plyvel.DB argument
+_OPTION_NAMES = {
+    'lruCacheSize': 'lru_cache_size',
+    'bloomFilterBits': 'bloom_filter_bits',
+    'writeBufferSize': 'write_buffer_size',
+    'blockSize': 'block_size',
+    'compression': 'compression',
+    'maxOpenFiles': 'max_open_files'
+}
+
+_COMPRESSIONS = ('snappy', 'none')
+
+MB = 1024 * 1024
+
+PRESET_PROFILES = {
+    # LevelDB defaults: 8MB block cache, no bloom filter, 4MB write buffer
+    'default': {},
+    # For nodes with a few GB of memory for state dbs
+    'large': {
+        'lruCacheSize': 512 * MB,
+        'bloomFilterBits': 10,
+        'writeBufferSize': 64 * MB,
+        'blockSize': 16 * 1024,
+        'compression': 'snappy',
+        'maxOpenFiles': 1000
+    },
+    # For small machines and dbs which are rarely read like the ones of SCOREs
+    'small': {
+        'lruCacheSize': 4 * MB,
+        'bloomFilterBits': 10,
+        'writeBufferSize': 2 * MB,
+        'maxOpenFiles': 100
+    }
+}
+
+
+def get_leveldb_options(profile: Union[str, dict, None]) -> dict:
+    """Converts a profile in IconConfig to the arguments of plyvel.DB
+
+    :param profile: the name of a preset profile or a dict of profile options
+        None means the default profile
+    :return: keyword arguments for plyvel.DB
+    """
+    if profile is None:
+        return {}
+
+    if isinstance(profile, str):
+        if profile not in PRESET_PROFILES:
+            raise DatabaseException(f'Unknown state db profile: {profile}')
+        profile = PRESET_PROFILES[profile]
+
+    options = {}
+    for name, value in profile.items():
+        option_name = _OPTION_NAMES.get(name)
+        if option_name is None:
+            raise DatabaseException(f'Unknown state db profile option: {name}')
+
+        if name == 'compression':
+            if value not in _COMPRESSIONS:
+                raise DatabaseException(f'Invalid compression: {value}')
+            value = None if value == 'none' else value
+        elif not isinstance(value, int) or value < 0:
+            raise DatabaseException(f'Invalid {name}: {value}')
+
+        options[option_name] = value
+
+    return options
+
+
+def get_keyspace_profile(profiles: Optional[dict], keyspace: str) -> Union[str, dict, None]:
+    """Returns the profile of a keyspace
+
+    The other keyspaces follow the default one unless they have their own profiles
+
+    :param profiles: keyspace: profile
+    :param keyspace: one of Keyspace
+    """
+    if not profiles:
+        return None
+
+    profile = profiles.get(keyspace)
+    if profile is None and keyspace != Keyspace.DEFAULT:
+        profile = profiles.get(Keyspace.DEFAULT)
+
+    return profile
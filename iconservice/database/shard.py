@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from threading import Lock
+from typing import TYPE_CHECKING, Optional, List, Iterator, Tuple
+
+from ..base.exception import DatabaseException
+
+if TYPE_CHECKING:
+    from .db import KeyValueDatabase
+
+# Address.to_bytes() of a contract is a prefix byte followed by 20 bytes of body
+_CONTRACT_ADDRESS_PREFIX = 1
+_CONTRACT_ADDRESS_SIZE = 21
+_KEY_SEPARATOR = ord('|')
+
+# Keys only used by ShardedKeyValueDatabase. They are stored in every shard
+_META_KEY_PREFIX = b'\x00shard|'
+_SHARD_COUNT_KEY = _META_KEY_PREFIX + b'count'
+_COMMIT_KEY = _META_KEY_PREFIX + b'commit'
+# The states of the other shards written with the last commit of the icx shard
+_JOURNAL_KEY = _META_KEY_PREFIX + b'journal'
+
+_journal_entry_header = struct.Struct('>HIi')
+_commit_struct = struct.Struct('>Q')
+
+ICX_SHARD_INDEX = 0
+
+
+def get_score_shard_index(key: bytes, score_shard_count: int) -> int:
+    """Returns the index of the shard where a given key is stored
+
+    The keys of a SCORE start with its address followed by '|'
+    and they are spread over SCORE shards by the address.
+    The other keys such as ICX accounts are stored in the icx shard.
+
+    :param key: state db key
+    :param score_shard_count: the number of shards for SCOREs
+    :return: shard index
+    """
+    if len(key) > _CONTRACT_ADDRESS_SIZE \
+            and key[_CONTRACT_ADDRESS_SIZE] == _KEY_SEPARATOR \
+            and key[0] == _CONTRACT_ADDRESS_PREFIX:
+        body = key[1:_CONTRACT_ADDRESS_SIZE]
+        return 1 + zlib.crc32(body) % score_shard_count
+
+    return ICX_SHARD_INDEX
+
+
+def _is_range_in_one_score(start: Optional[bytes], stop: Optional[bytes]) -> bool:
+    """Checks if all keys in [start, stop) belong to the same SCORE
+    """
+    if start is None or stop is None or len(stop) <= _CONTRACT_ADDRESS_SIZE:
+        return False
+
+    address_size = _CONTRACT_ADDRESS_SIZE
+    if stop[:address_size] != start[:address_size]:
+        return False
+
+    return stop[address_size] == _KEY_SEPARATOR or \
+        stop == start[:address_size] + bytes([_KEY_SEPARATOR + 1])
+
+
+def _encode_commit(commit: int) -> bytes:
+    return _commit_struct.pack(commit)
+
+
+def _decode_commit(value: Optional[bytes]) -> int:
+    if value is None:
+        return 0
+    return _commit_struct.unpack(value)[0]
+
+
+def _encode_journal(commit: int, shard_states: List[dict]) -> bytes:
+    data = [_encode_commit(commit)]
+
+    for index, states in enumerate(shard_states):
+        if index == ICX_SHARD_INDEX:
+            continue
+
+        for key, value in states.items():
+            value_size = -1 if value is None else len(value)
+            data.append(_journal_entry_header.pack(index, len(key), value_size))
+            data.append(key)
+            if value is not None:
+                data.append(value)
+
+    return b''.join(data)
+
+
+def _decode_journal(journal: bytes, shard_count: int) -> Tuple[int, List[dict]]:
+    commit = _decode_commit(journal[:_commit_struct.size])
+    shard_states = [{} for _ in range(shard_count)]
+
+    offset = _commit_struct.size
+    while offset < len(journal):
+        index, key_size, value_size = \
+            _journal_entry_header.unpack_from(journal, offset)
+        offset += _journal_entry_header.size
+
+        key = journal[offset:offset + key_size]
+        offset += key_size
+
+        if value_size < 0:
+            value = None
+        else:
+            value = journal[offset:offset + value_size]
+            offset += value_size
+
+        shard_states[index][key] = value
+
+    return commit, shard_states
+
+
+class ShardedKeyValueDatabase(object):
+    """KeyValueDatabase whose keyspace is spread over several dbs
+
+    The keys of each SCORE are stored in one of SCORE shards by its address
+    and the other states such as ICX accounts are stored in the icx shard.
+    Each shard has its own compaction and write lock,
+    so the shards of a block are written in parallel.
+
+    A commit is written to the icx shard first together with the states
+    of the other shards as a journal. Every shard keeps the number of
+    the last commit applied to it, so a commit interrupted in the middle
+    is completed from the journal on the next startup.
+    """
+
+    def __init__(self, shards: List['KeyValueDatabase'], writable: bool=True) -> None:
+        """Constructor
+
+        Use ShardedKeyValueDatabase.open() to open shards on disk
+
+        :param shards: the icx shard followed by SCORE shards
+        :param writable: False if shards are snapshots
+        """
+        if len(shards) < 2:
+            raise DatabaseException(f'Too few shards: {len(shards)}')
+
+        self._shards = shards
+        self._score_shard_count = len(shards) - 1
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(len(shards)) if writable else None
+        self._commit = _decode_commit(shards[ICX_SHARD_INDEX].get(_COMMIT_KEY)) \
+            if writable else 0
+
+    @staticmethod
+    def open(shards: List['KeyValueDatabase']) -> 'ShardedKeyValueDatabase':
+        """Opens shards and completes the last commit if it was interrupted
+
+        :param shards: the icx shard followed by SCORE shards
+        """
+        shard_count_bytes = len(shards).to_bytes(2, 'big')
+        icx_shard = shards[ICX_SHARD_INDEX]
+
+        stored_shard_count = icx_shard.get(_SHARD_COUNT_KEY)
+        if stored_shard_count is None:
+            icx_shard.put(_SHARD_COUNT_KEY, shard_count_bytes)
+        elif stored_shard_count != shard_count_bytes:
+            raise DatabaseException(
+                f'Shard count mismatch: '
+                f'{int.from_bytes(stored_shard_count, "big")} != {len(shards)}')
+
+        db = ShardedKeyValueDatabase(shards)
+        db._recover()
+        return db
+
+    @property
+    def shards(self) -> List['KeyValueDatabase']:
+        return self._shards
+
+    @property
+    def commit(self) -> int:
+        """The number of commits written by write_batch()
+        """
+        return self._commit
+
+    def _get_shard(self, key: bytes) -> 'KeyValueDatabase':
+        return self._shards[get_score_shard_index(key, self._score_shard_count)]
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        return self._get_shard(key).get(key)
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[bytes]]:
+        shard_keys = [[] for _ in self._shards]
+        for key in keys:
+            shard_keys[get_score_shard_index(key, self._score_shard_count)].append(key)
+
+        values = {}
+        for shard, keys_in_shard in zip(self._shards, shard_keys):
+            if keys_in_shard:
+                values.update(zip(keys_in_shard, shard.get_many(keys_in_shard)))
+
+        return [values[key] for key in keys]
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self._get_shard(key).put(key, value)
+
+    def delete(self, key: bytes) -> None:
+        self._get_shard(key).delete(key)
+
+    def close(self) -> None:
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+        for shard in self._shards:
+            shard.close()
+
+    def get_snapshot(self) -> 'ShardedKeyValueDatabase':
+        """Returns a read-only db which sees the states at this moment
+
+        Snapshots of all shards are taken between commits
+        not to see a block written to some shards only.
+        """
+        with self._lock:
+            shards = [shard.get_snapshot() for shard in self._shards]
+
+        return ShardedKeyValueDatabase(shards, writable=False)
+
+    def get_sub_db(self, key: bytes):
+        raise DatabaseException('get_sub_db is not supported on sharded db')
+
+    def iterator(self,
+                 start: Optional[bytes]=None,
+                 stop: Optional[bytes]=None,
+                 reverse: bool=False) -> Iterator[Tuple[bytes, bytes]]:
+        """Returns an iterator of (key, value) in key order
+
+        :param start: the first key to include
+        :param stop: the first key to exclude
+        :param reverse: iterate in descending order
+        """
+        if _is_range_in_one_score(start, stop):
+            return self._get_shard(start).iterator(start=start, stop=stop, reverse=reverse)
+
+        iterators = [self._iterate_shard(shard, start, stop, reverse)
+                     for shard in self._shards]
+        return heapq.merge(*iterators, key=itemgetter(0), reverse=reverse)
+
+    @staticmethod
+    def _iterate_shard(shard: 'KeyValueDatabase',
+                       start: Optional[bytes],
+                       stop: Optional[bytes],
+                       reverse: bool) -> Iterator[Tuple[bytes, bytes]]:
+        for key, value in shard.iterator(start=start, stop=stop, reverse=reverse):
+            if not key.startswith(_META_KEY_PREFIX):
+                yield key, value
+
+    def write_batch(self, states: dict) -> None:
+        """Writes the states of a block to shards as a commit
+
+        :param states: key:value pairs
+            key and value should be bytes type
+        """
+        if states is None or len(states) == 0:
+            return
+
+        shard_states = self._split_states(states)
+
+        with self._lock:
+            commit = self._commit + 1
+            commit_bytes = _encode_commit(commit)
+
+            for states_in_shard in shard_states:
+                states_in_shard[_COMMIT_KEY] = commit_bytes
+
+            # The commit is done once the icx shard is written
+            shard_states[ICX_SHARD_INDEX][_JOURNAL_KEY] = \
+                _encode_journal(commit, shard_states)
+            self._shards[ICX_SHARD_INDEX].write_batch(shard_states[ICX_SHARD_INDEX])
+
+            futures = [
+                self._executor.submit(self._shards[i].write_batch, shard_states[i])
+                for i in range(1, len(self._shards))]
+            for future in futures:
+                future.result()
+
+            self._commit = commit
+
+    def flush(self) -> None:
+        """Shards are written synchronously, so there is nothing to wait for
+        """
+        pass
+
+    def _split_states(self, states: dict) -> List[dict]:
+        shard_states = [{} for _ in self._shards]
+        score_shard_count = self._score_shard_count
+
+        for key, value in states.items():
+            index = get_score_shard_index(key, score_shard_count)
+            shard_states[index][key] = value
+
+        return shard_states
+
+    def _recover(self) -> None:
+        """Applies the last commit to the shards which it wasn't written to
+        """
+        journal = self._shards[ICX_SHARD_INDEX].get(_JOURNAL_KEY)
+        if journal is None:
+            return
+
+        commit, shard_states = _decode_journal(journal, len(self._shards))
+        commit_bytes = _encode_commit(commit)
+
+        for i in range(1, len(self._shards)):
+            shard = self._shards[i]
+            shard_commit = _decode_commit(shard.get(_COMMIT_KEY))
+
+            if shard_commit == commit:
+                continue
+            if shard_commit != commit - 1:
+                raise DatabaseException(
+                    f'Broken shard: shard={i} commit={shard_commit} expected={commit}')
+
+            shard_states[i][_COMMIT_KEY] = commit_bytes
+            shard.write_batch(shard_states[i])
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Snapshot files of the committed states to bootstrap a node offline
+
+A snapshot is a directory of chunk files and a manifest.
+Each chunk holds the zlib compressed records of consecutive keys
+and the manifest has the checksum of every chunk.
+
+    manifest.json
+    chunk000000.bin
+    chunk000001.bin
+    ...
+
+The last block is kept in the manifest instead of chunks and written last on import,
+so a db which hasn't been imported completely has no last block.
+Chunks don't share keys, so they can be loaded in any order and in parallel.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Optional, List, Tuple
+
+from iconcommons.logger import Logger
+
+from ..base.block import Block
+from ..base.exception import DatabaseException
+from ..icon_constant import ICON_DB_LOG_TAG
+
+if TYPE_CHECKING:
+    from .db import KeyValueDatabase
+
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+# The size of the records of a chunk before compression
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+DEFAULT_IMPORT_WORKERS = 4
+# The file in the state db root path which records the chunks loaded by an import
+IMPORT_PROGRESS_NAME = 'icon_dex.import'
+
+_CHUNK_MAGIC = b'ICONSS\x00\x01'
+_CHUNK_NAME_FORMAT = 'chunk{:06d}.bin'
+# key size, value size
+_record_header = struct.Struct('>II')
+
+# Same as IcxStorage._LAST_BLOCK_KEY
+_LAST_BLOCK_KEY = b'last_block'
+
+
+def _get_checksum(data: bytes) -> str:
+    return hashlib.sha3_256(data).hexdigest()
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Replaces a file with data at once not to leave a broken file on interruption
+    """
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def _write_json(path: str, obj: dict) -> None:
+    _write_file(path, json.dumps(obj, indent=2).encode())
+
+
+def _encode_chunk(items: List[Tuple[bytes, bytes]]) -> bytes:
+    data = []
+    for key, value in items:
+        data.append(_record_header.pack(len(key), len(value)))
+        data.append(key)
+        data.append(value)
+
+    return _CHUNK_MAGIC + zlib.compress(b''.join(data))
+
+
+def _decode_chunk(data: bytes) -> dict:
+    if not data.startswith(_CHUNK_MAGIC):
+        raise DatabaseException('Invalid snapshot chunk format')
+
+    try:
+        body = zlib.decompress(data[len(_CHUNK_MAGIC):])
+    except zlib.error as e:
+        raise DatabaseException(f'Invalid snapshot chunk: {e}')
+
+    states = {}
+    offset = 0
+    while offset < len(body):
+        if len(body) - offset < _record_header.size:
+            raise DatabaseException('Truncated snapshot chunk')
+
+        key_size, value_size = _record_header.unpack_from(body, offset)
+        offset += _record_header.size
+
+        key = body[offset:offset + key_size]
+        offset += key_size
+        value = body[offset:offset + value_size]
+        offset += value_size
+
+        if len(value) != value_size:
+            raise DatabaseException('Truncated snapshot chunk')
+        states[key] = value
+
+    return states
+
+
+def _read_chunk(path: str, chunk: dict) -> dict:
+    """Reads the states of a chunk after checking its checksum
+
+    :param path: snapshot directory
+    :param chunk: chunk entry in the manifest
+    :return: key:value pairs
+    """
+    name = chunk['name']
+    with open(os.path.join(path, name), 'rb') as f:
+        data = f.read()
+
+    if _get_checksum(data) != chunk['checksum']:
+        raise DatabaseException(f'Checksum mismatch: {name}')
+
+    states = _decode_chunk(data)
+    if len(states) != chunk['keys']:
+        raise DatabaseException(f'Key count mismatch: {name}')
+
+    return states
+
+
+def read_manifest(path: str) -> dict:
+    """Reads the manifest of a snapshot which has been exported completely
+
+    :param path: snapshot directory
+    :return: manifest
+    """
+    try:
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise DatabaseException(f'Failed to read snapshot manifest: {e}')
+
+    if manifest.get('version') != SNAPSHOT_VERSION:
+        raise DatabaseException(f'Unsupported snapshot version: {manifest.get("version")}')
+    if not manifest.get('complete'):
+        raise DatabaseException('Snapshot is not exported completely')
+    if sum(chunk['keys'] for chunk in manifest['chunks']) != manifest['keys']:
+        raise DatabaseException('Key count mismatch: manifest')
+
+    return manifest
+
+
+def _create_manifest(path: str, last_block: bytes) -> dict:
+    """Returns the manifest to resume an export interrupted at the same block
+    or a new one
+    """
+    try:
+        with open(os.path.join(path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        if manifest.get('version') == SNAPSHOT_VERSION \
+                and manifest.get('lastBlock') == last_block.hex():
+            return manifest
+    except (OSError, ValueError):
+        pass
+
+    block = Block.from_bytes(last_block)
+    return {
+        'version': SNAPSHOT_VERSION,
+        'blockHeight': block.height,
+        'blockHash': block.hash.hex(),
+        'lastBlock': last_block.hex(),
+        'complete': False,
+        'keys': 0,
+        'chunks': []
+    }
+
+
+def _export_chunk(path: str, manifest: dict, items: List[Tuple[bytes, bytes]]) -> None:
+    chunks = manifest['chunks']
+    name = _CHUNK_NAME_FORMAT.format(len(chunks))
+    data = _encode_chunk(items)
+    _write_file(os.path.join(path, name), data)
+
+    chunks.append({
+        'name': name,
+        'keys': len(items),
+        'size': len(data),
+        'checksum': _get_checksum(data),
+        'lastKey': items[-1][0].hex()
+    })
+    manifest['keys'] += len(items)
+    # The manifest is written after each chunk to resume the export from the next key
+    _write_json(os.path.join(path, MANIFEST_NAME), manifest)
+
+
+def export_snapshot(key_value_db: 'KeyValueDatabase',
+                    path: str,
+                    chunk_size: int=DEFAULT_CHUNK_SIZE) -> dict:
+    """Exports the committed states of a state db to a snapshot directory
+
+    An interrupted export is resumed from the key after the last chunk written
+    if the db is still at the same block.
+
+    :param key_value_db: state db. ShardedKeyValueDatabase is also available
+    :param path: snapshot directory
+    :param chunk_size: the size of the records of a chunk before compression
+    :return: manifest
+    """
+    os.makedirs(path, exist_ok=True)
+    snapshot = key_value_db.get_snapshot()
+
+    try:
+        last_block = snapshot.get(_LAST_BLOCK_KEY)
+        if last_block is None:
+            raise DatabaseException('No block in state db')
+
+        manifest = _create_manifest(path, last_block)
+        if manifest['complete']:
+            return manifest
+
+        chunks = manifest['chunks']
+        start = bytes.fromhex(chunks[-1]['lastKey']) if chunks else None
+
+        items = []
+        size = 0
+        for key, value in snapshot.iterator(start=start):
+            if key == start or key == _LAST_BLOCK_KEY:
+                continue
+
+            items.append((key, value))
+            size += _record_header.size + len(key) + len(value)
+            if size >= chunk_size:
+                _export_chunk(path, manifest, items)
+                items = []
+                size = 0
+
+        if items:
+            _export_chunk(path, manifest, items)
+    finally:
+        snapshot.close()
+
+    manifest['complete'] = True
+    _write_json(os.path.join(path, MANIFEST_NAME), manifest)
+    return manifest
+
+
+def _load_chunk(key_value_db: 'KeyValueDatabase', path: str, chunk: dict) -> None:
+    """Writes the states of a chunk at once and reads them back to verify
+    """
+    states = _read_chunk(path, chunk)
+    key_value_db.write_batch(states)
+
+    keys = list(states)
+    if key_value_db.get_many(keys) != [states[key] for key in keys]:
+        raise DatabaseException(f'Verification failed: {chunk["name"]}')
+
+
+def _load_progress(progress_path: str, manifest: dict) -> Optional[List[str]]:
+    """Returns the names of chunks loaded by an interrupted import
+
+    :return: None if there is no import to resume
+    """
+    if not os.path.exists(progress_path):
+        return None
+
+    try:
+        with open(progress_path) as f:
+            progress = json.load(f)
+    except (OSError, ValueError) as e:
+        raise DatabaseException(f'Failed to read snapshot import progress: {e}')
+
+    if progress.get('lastBlock') != manifest['lastBlock']:
+        raise DatabaseException('State db is being imported from another snapshot')
+
+    return progress['chunks']
+
+
+def _has_states(key_value_db: 'KeyValueDatabase') -> bool:
+    for _ in key_value_db.iterator():
+        return True
+    return False
+
+
+def import_snapshot(key_value_db: 'KeyValueDatabase',
+                    path: str,
+                    progress_path: str,
+                    workers: int=DEFAULT_IMPORT_WORKERS,
+                    key_filter_path: Optional[str]=None) -> dict:
+    """Loads a snapshot into an empty state db
+
+    Chunks are loaded in parallel, each of them with one write_batch.
+    The names of loaded chunks are recorded in progress_path,
+    so an interrupted import is resumed by calling it again.
+    The file is removed when the import is done.
+
+    :param key_value_db: state db. ShardedKeyValueDatabase is also available
+    :param path: snapshot directory
+    :param progress_path: the file to record the progress of import
+    :param workers: the number of chunks loaded at the same time
+    :param key_filter_path: the key filter saved for the state db.
+        It is removed not to be loaded over the imported keys which it doesn't know
+    :return: manifest
+    """
+    manifest = read_manifest(path)
+
+    loaded = _load_progress(progress_path, manifest)
+    if loaded is None:
+        if _has_states(key_value_db):
+            raise DatabaseException('State db is not empty')
+        loaded = []
+
+    if key_filter_path is not None and os.path.exists(key_filter_path):
+        os.remove(key_filter_path)
+
+    progress = {'lastBlock': manifest['lastBlock'], 'chunks': loaded}
+    _write_json(progress_path, progress)
+
+    chunks = [chunk for chunk in manifest['chunks'] if chunk['name'] not in loaded]
+    with ThreadPoolExecutor(max(workers, 1)) as executor:
+        futures = {executor.submit(_load_chunk, key_value_db, path, chunk): chunk['name']
+                   for chunk in chunks}
+        try:
+            for future in as_completed(futures):
+                future.result()
+                loaded.append(futures[future])
+                _write_json(progress_path, progress)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    key_value_db.write_batch({_LAST_BLOCK_KEY: bytes.fromhex(manifest['lastBlock'])})
+    key_value_db.flush()
+    os.remove(progress_path)
+
+    Logger.info(f'Snapshot imported: height={manifest["blockHeight"]} keys={manifest["keys"]}',
+                ICON_DB_LOG_TAG)
+    return manifest
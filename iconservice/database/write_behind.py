@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from queue import Queue
+from threading import Lock, Thread
+from typing import TYPE_CHECKING, Optional, List, Iterator, Tuple
+
+from iconcommons.logger import Logger
+
+from .db import _merge_items
+from ..base.exception import DatabaseException
+from ..icon_constant import ICON_DB_LOG_TAG
+
+if TYPE_CHECKING:
+    from .db import KeyValueDatabase
+
+
+def _get_from_pending(pending: List[dict], key: bytes) -> Tuple[bool, Optional[bytes]]:
+    """Looks up a key in pending batches from the newest one
+
+    :return: (True, value) if the key is found otherwise (False, None)
+    """
+    for states in reversed(pending):
+        if key in states:
+            value = states[key]
+            # A falsy value is written as a deletion
+            return True, value if value else None
+
+    return False, None
+
+
+class _PendingReader(metaclass=ABCMeta):
+    """Reads the states in pending batches over db
+    """
+
+    def __init__(self, db: 'KeyValueDatabase') -> None:
+        self._db = db
+
+    @abstractmethod
+    def _get_pending(self) -> List[dict]:
+        pass
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        pending = self._get_pending()
+        if pending:
+            found, value = _get_from_pending(pending, key)
+            if found:
+                return value
+
+        return self._db.get(key)
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[bytes]]:
+        pending = self._get_pending()
+        if not pending:
+            return self._db.get_many(keys)
+
+        values = [None] * len(keys)
+        missing_indexes = []
+
+        for i, key in enumerate(keys):
+            found, value = _get_from_pending(pending, key)
+            if found:
+                values[i] = value
+            else:
+                missing_indexes.append(i)
+
+        if missing_indexes:
+            missing_values = self._db.get_many([keys[i] for i in missing_indexes])
+            for i, value in zip(missing_indexes, missing_values):
+                values[i] = value
+
+        return values
+
+    def iterator(self,
+                 start: Optional[bytes]=None,
+                 stop: Optional[bytes]=None,
+                 reverse: bool=False) -> Iterator[Tuple[bytes, bytes]]:
+        pending = self._get_pending()
+        db_items = self._db.iterator(start=start, stop=stop, reverse=reverse)
+        if not pending:
+            return db_items
+
+        pending_states = {}
+        for states in pending:
+            for key, value in states.items():
+                if (start is None or start <= key) and (stop is None or key < stop):
+                    pending_states[key] = value if value else None
+
+        return _merge_items(db_items, sorted(pending_states.items(), reverse=reverse), reverse)
+
+
+class _WriteBehindSnapshot(_PendingReader):
+    """Read-only view of WriteBehindKeyValueDatabase at a point in time
+    """
+
+    def __init__(self, db: 'KeyValueDatabase', pending: List[dict]) -> None:
+        """Constructor
+
+        :param db: the snapshot of the underlying db
+        :param pending: the batches which were not written to db yet
+        """
+        super().__init__(db)
+        self._pending = pending
+
+    def _get_pending(self) -> List[dict]:
+        return self._pending
+
+    def close(self) -> None:
+        if self._db:
+            self._db.close()
+            self._db = None
+
+
+class WriteBehindKeyValueDatabase(_PendingReader):
+    """KeyValueDatabase which writes batches to the underlying db on a background thread
+
+    write_batch() returns as soon as a batch is queued.
+    Batches waiting to be written are read as an overlay over the underlying db,
+    so readers always see the latest states.
+    flush() waits until all queued batches are written.
+    """
+
+    def __init__(self, db: 'KeyValueDatabase') -> None:
+        """Constructor
+
+        :param db: the db where batches are written
+        """
+        super().__init__(db)
+
+        # Batches queued but not written yet in commit order
+        self._pending = deque()
+        self._lock = Lock()
+        self._queue = Queue()
+        # The first exception raised on writing. No more batch is written after it
+        self._error: Optional[BaseException] = None
+
+        self._max_queue_depth = 0
+        self._written_batch_count = 0
+        self._last_write_time = 0.0
+
+        self._thread = Thread(target=self._run, name='StateDbWriter', daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def _get_pending(self) -> List[dict]:
+        if not self._pending:
+            return []
+
+        with self._lock:
+            return list(self._pending)
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            raise DatabaseException(f'Failed to write states: {self._error}')
+
+    def put(self, key: bytes, value: bytes) -> None:
+        self.write_batch({key: value})
+
+    def delete(self, key: bytes) -> None:
+        self.write_batch({key: None})
+
+    def write_batch(self, states: dict) -> None:
+        """Queues states to be written to the underlying db
+
+        :param states: key:value pairs
+            key and value should be bytes type
+        """
+        self._check_error()
+        if states is None or len(states) == 0:
+            return
+
+        # The caller can change states after this call
+        states = dict(states)
+
+        with self._lock:
+            self._pending.append(states)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._pending))
+
+        self._queue.put(states)
+
+    def flush(self) -> None:
+        """Waits until all queued batches are written to the underlying db
+        """
+        self._queue.join()
+        self._check_error()
+
+    def get_snapshot(self) -> '_WriteBehindSnapshot':
+        """Returns a read-only db which sees the states at this moment
+
+        Pending batches are copied together with the snapshot of the underlying db
+        """
+        with self._lock:
+            return _WriteBehindSnapshot(self._db.get_snapshot(), list(self._pending))
+
+    def get_sub_db(self, key: bytes):
+        raise DatabaseException('get_sub_db is not supported on write-behind db')
+
+    def close(self) -> None:
+        """Writes all queued batches and closes the underlying db
+        """
+        if self._db is None:
+            return
+
+        try:
+            self.flush()
+        finally:
+            self._queue.put(None)
+            self._thread.join()
+            self._db.close()
+            self._db = None
+
+    def get_status(self) -> dict:
+        return {
+            'queueDepth': len(self._pending),
+            'maxQueueDepth': self._max_queue_depth,
+            'writtenBatches': self._written_batch_count,
+            'lastWriteTime': self._last_write_time
+        }
+
+    def _run(self) -> None:
+        while True:
+            states = self._queue.get()
+            if states is None:
+                self._queue.task_done()
+                break
+
+            try:
+                if self._error is None:
+                    self._write(states)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, states: dict) -> None:
+        try:
+            start_time = time.monotonic()
+            self._db.write_batch(states)
+            self._last_write_time = time.monotonic() - start_time
+        except BaseException as e:
+            # Keeps the batch pending not to lose its states on reading
+            Logger.exception(f'Failed to write states: {e}', ICON_DB_LOG_TAG)
+            self._error = e
+            return
+
+        with self._lock:
+            self._pending.popleft()
+        self._written_batch_count += 1
@@ -20,6 +20,47 @@ default_icon_config = {
     },
     ConfigKey.SCORE_ROOT_PATH: ".score",
     ConfigKey.STATE_DB_ROOT_PATH: ".statedb",
+    ConfigKey.STATE_DB_CACHE_SIZE: 64 * 1024 * 1024,
+    ConfigKey.STATE_DB_BACKEND: "leveldb",
+    # The number of shards for SCORE states. 0 means a single state db
+    ConfigKey.STATE_DB_SHARD_COUNT: 0,
+    # Commit returns before the states of a block are written to disk
+    ConfigKey.STATE_DB_WRITE_BEHIND: False,
+    # Waits for pending writes every N blocks in write-behind mode. 0 means never
+    ConfigKey.STATE_DB_FLUSH_INTERVAL: 0,
+    # Counts state db reads and writes by context type and key class
+    ConfigKey.STATE_DB_METRICS: False,
+    # Appends the state db metrics of each block to this file as json lines if not empty
+    ConfigKey.STATE_DB_METRICS_DUMP_PATH: "",
+    # LevelDB options by keyspace: "default", "score" (SCORE dbs) and "history" (reverse diffs)
+    # The others default to "default"
+    # A profile is a preset name ("default", "large", "small") or a dict of
+    # lruCacheSize, bloomFilterBits, writeBufferSize, blockSize, compression, maxOpenFiles
+    ConfigKey.STATE_DB_PROFILES: {
+        "default": "default"
+    },
+    # The number of keys expected in the state db to size the filter which
+    # answers reads of absent keys without disk access. 0 means no filter
+    ConfigKey.STATE_DB_KEY_FILTER_CAPACITY: 0,
+    # Memory budget to cache whether keys exist, used to count the steps of SCORE writes
+    ConfigKey.STATE_DB_PRESENCE_CACHE_SIZE: 8 * 1024 * 1024,
+    # Keeps the reverse diffs of this number of last blocks to query the states
+    # at a past block height with "blockHeight". 0 means only the last block
+    ConfigKey.STATE_DB_HISTORY_RETENTION: 0,
+    # The number of threads running the transactions of a block speculatively.
+    # 0 runs them one by one
+    ConfigKey.PARALLEL_INVOKE_WORKERS: 0,
+    # Measures the time taken by each phase of a transaction and counts its operations.
+    # The profile is kept in the transaction result but not passed to chain engine
+    ConfigKey.TX_PROFILE: False,
+    # The number of the slowest transactions in a block to log if txProfile is on
+    ConfigKey.TX_PROFILE_SLOWEST: 5,
+    # The rates from 0.0 to 1.0 at which the requests and responses of the inner service
+    # are logged by method: invoke, query, validate_transaction, write_precommit_state
+    # and remove_precommit_state. The others are logged always
+    ConfigKey.REQUEST_LOG_SAMPLING_RATES: {},
+    # Each field of a logged request or response is cut at this length
+    ConfigKey.REQUEST_LOG_MAX_FIELD_LENGTH: 1024,
     ConfigKey.CHANNEL: "loopchain_default",
     ConfigKey.AMQP_KEY: "7100",
     ConfigKey.AMQP_TARGET: "127.0.0.1",
@@ -64,6 +64,22 @@ class ConfigKey:
     SERVICE_SCORE_PACKAGE_VALIDATOR = 'scorePackageValidator'
     SCORE_ROOT_PATH = 'scoreRootPath'
     STATE_DB_ROOT_PATH = 'stateDbRootPath'
+    STATE_DB_CACHE_SIZE = 'stateDbCacheSize'
+    STATE_DB_BACKEND = 'stateDbBackend'
+    STATE_DB_SHARD_COUNT = 'stateDbShardCount'
+    STATE_DB_WRITE_BEHIND = 'stateDbWriteBehind'
+    STATE_DB_FLUSH_INTERVAL = 'stateDbFlushInterval'
+    STATE_DB_METRICS = 'stateDbMetrics'
+    STATE_DB_METRICS_DUMP_PATH = 'stateDbMetricsDumpPath'
+    STATE_DB_PROFILES = 'stateDbProfiles'
+    STATE_DB_KEY_FILTER_CAPACITY = 'stateDbKeyFilterCapacity'
+    STATE_DB_PRESENCE_CACHE_SIZE = 'stateDbPresenceCacheSize'
+    STATE_DB_HISTORY_RETENTION = 'stateDbHistoryRetention'
+    PARALLEL_INVOKE_WORKERS = 'parallelInvokeWorkers'
+    TX_PROFILE = 'txProfile'
+    TX_PROFILE_SLOWEST = 'txProfileSlowest'
+    REQUEST_LOG_SAMPLING_RATES = 'requestLogSamplingRates'
+    REQUEST_LOG_MAX_FIELD_LENGTH = 'requestLogMaxFieldLength'
     CHANNEL = 'channel'
     AMQP_KEY = 'amqpKey'
     AMQP_TARGET = 'amqpTarget'
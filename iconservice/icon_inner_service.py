@@ -24,9 +24,10 @@ from iconservice.base.block import Block
 from iconservice.base.exception import ExceptionCode, IconServiceBaseException
 from iconservice.base.type_converter import TypeConverter, ParamType
 from iconservice.icon_constant import ICON_INNER_LOG_TAG, ICON_SERVICE_LOG_TAG, \
-    EnableThreadFlag, ENABLE_THREAD_FLAG
+    EnableThreadFlag, ENABLE_THREAD_FLAG, ConfigKey
 from iconservice.icon_service_engine import IconServiceEngine
 from iconservice.utils import check_error_response, to_camel_case
+from iconservice.utils.request_logger import RequestLogger
 
 if TYPE_CHECKING:
     from earlgrey import RobustConnection
@@ -42,6 +43,11 @@ class IconScoreInnerTask(object):
         self._conf = conf
         self._thread_flag = ENABLE_THREAD_FLAG
 
+        self._request_logger = RequestLogger(
+            ICON_INNER_LOG_TAG,
+            conf.get(ConfigKey.REQUEST_LOG_SAMPLING_RATES, {}),
+            conf.get(ConfigKey.REQUEST_LOG_MAX_FIELD_LENGTH, 1024))
+
         self._icon_service_engine = IconServiceEngine()
         self._open()
 
@@ -78,7 +84,7 @@ class IconScoreInnerTask(object):
 
     @message_queue_task
     async def invoke(self, request: dict):
-        Logger.info(f'invoke request with {request}', ICON_INNER_LOG_TAG)
+        self._request_logger.log_request('invoke', request)
         if self._is_thread_flag_on(EnableThreadFlag.Invoke):
             loop = get_event_loop()
             return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE],
@@ -111,18 +117,19 @@ class IconScoreInnerTask(object):
             }
             response = MakeResponse.make_response(results)
         except IconServiceBaseException as icon_e:
-            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('invoke', icon_e.code)
             response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
         except Exception as e:
             self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('invoke', ExceptionCode.SERVER_ERROR)
             response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
         finally:
-            Logger.info(f'invoke response with {response}', ICON_INNER_LOG_TAG)
+            self._request_logger.log_response('invoke', response)
             return response
 
     @message_queue_task
     async def query(self, request: dict):
-        Logger.info(f'query request with {request}', ICON_INNER_LOG_TAG)
+        self._request_logger.log_request('query', request)
         if self._is_thread_flag_on(EnableThreadFlag.Query):
             loop = get_event_loop()
             return await loop.run_in_executor(self._thread_pool[THREAD_QUERY],
@@ -143,18 +150,19 @@ class IconScoreInnerTask(object):
                 value = str(value)
             response = MakeResponse.make_response(value)
         except IconServiceBaseException as icon_e:
-            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('query', icon_e.code)
             response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
         except Exception as e:
             self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('query', ExceptionCode.SERVER_ERROR)
             response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
         finally:
-            Logger.info(f'query response with {response}', ICON_INNER_LOG_TAG)
+            self._request_logger.log_response('query', response)
             return response
 
     @message_queue_task
     async def write_precommit_state(self, request: dict):
-        Logger.info(f'write_precommit_state request with {request}', ICON_INNER_LOG_TAG)
+        self._request_logger.log_request('write_precommit_state', request)
         if self._is_thread_flag_on(EnableThreadFlag.Invoke):
             loop = get_event_loop()
             return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE],
@@ -171,18 +179,21 @@ class IconScoreInnerTask(object):
             self._icon_service_engine.commit(block)
             response = MakeResponse.make_response(ExceptionCode.OK)
         except IconServiceBaseException as icon_e:
-            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('write_precommit_state', icon_e.code)
             response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
         except Exception as e:
             self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('write_precommit_state', ExceptionCode.SERVER_ERROR)
             response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
         finally:
-            Logger.info(f'write_precommit_state response with {response}', ICON_INNER_LOG_TAG)
+            self._request_logger.log_response('write_precommit_state', response)
+            # Failures are logged once a block
+            self._request_logger.flush_failures()
             return response
 
     @message_queue_task
     async def remove_precommit_state(self, request: dict):
-        Logger.info(f'remove_precommit_state request with {request}', ICON_INNER_LOG_TAG)
+        self._request_logger.log_request('remove_precommit_state', request)
         if self._is_thread_flag_on(EnableThreadFlag.Invoke):
             loop = get_event_loop()
             return await loop.run_in_executor(self._thread_pool[THREAD_INVOKE],
@@ -199,18 +210,19 @@ class IconScoreInnerTask(object):
             self._icon_service_engine.rollback(block)
             response = MakeResponse.make_response(ExceptionCode.OK)
         except IconServiceBaseException as icon_e:
-            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('remove_precommit_state', icon_e.code)
             response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
         except Exception as e:
             self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('remove_precommit_state', ExceptionCode.SERVER_ERROR)
             response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
         finally:
-            Logger.info(f'remove_precommit_state response with {response}', ICON_INNER_LOG_TAG)
+            self._request_logger.log_response('remove_precommit_state', response)
             return response
 
     @message_queue_task
     async def validate_transaction(self, request: dict):
-        Logger.info(f'pre_validate_check request with {request}', ICON_INNER_LOG_TAG)
+        self._request_logger.log_request('validate_transaction', request)
         if self._is_thread_flag_on(EnableThreadFlag.Validate):
             loop = get_event_loop()
             return await loop.run_in_executor(self._thread_pool[THREAD_VALIDATE],
@@ -226,13 +238,14 @@ class IconScoreInnerTask(object):
             self._icon_service_engine.validate_transaction(converted_request)
             response = MakeResponse.make_response(ExceptionCode.OK)
         except IconServiceBaseException as icon_e:
-            self._log_exception(icon_e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('validate_transaction', icon_e.code)
             response = MakeResponse.make_error_response(icon_e.code, icon_e.message)
         except Exception as e:
             self._log_exception(e, ICON_SERVICE_LOG_TAG)
+            self._request_logger.count_failure('validate_transaction', ExceptionCode.SERVER_ERROR)
             response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
         finally:
-            Logger.info(f'pre_validate_check response with {response}', ICON_INNER_LOG_TAG)
+            self._request_logger.log_response('validate_transaction', response)
             return response
 
     @message_queue_task
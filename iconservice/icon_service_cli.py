@@ -16,13 +16,19 @@
 
 import argparse
 import asyncio
+import os
 import subprocess
 import sys
 from enum import IntEnum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from iconcommons.icon_config import IconConfig
 from iconcommons.logger import Logger
+from iconservice.base.exception import DatabaseException
+from iconservice.database.factory import ContextDatabaseFactory
+from iconservice.database.key_filter import KEY_FILTER_NAME
+from iconservice.database.snapshot_file import export_snapshot, import_snapshot, \
+    IMPORT_PROGRESS_NAME
 from iconservice.icon_config import default_icon_config
 from iconservice.icon_constant import ICON_SCORE_QUEUE_NAME_FORMAT, ICON_SERVICE_PROCTITLE_FORMAT, ConfigKey
 
@@ -45,6 +51,8 @@ def main():
     iconservice commands:
         start : iconservice start
         stop : iconservice stop
+        export : export the state db to a snapshot directory (iconservice stopped)
+        import : import a snapshot directory into an empty state db (iconservice stopped)
 
         -c : json configure file path
         -sc : icon score root path ex).score
@@ -54,12 +62,14 @@ def main():
         -ch : loopchain channel ex) loopchain_default
         -fg : foreground process
         -tbears : tbears mode
+        -sp : snapshot directory for export and import
+        -sw : the number of snapshot chunks imported at the same time
     """)
 
     parser.add_argument('command', type=str,
                         nargs='*',
-                        choices=['start', 'stop'],
-                        help='iconservice type [start|stop]')
+                        choices=['start', 'stop', 'export', 'import'],
+                        help='iconservice type [start|stop|export|import]')
     parser.add_argument("-sc", dest=ConfigKey.SCORE_ROOT_PATH, type=str, default=None,
                         help="icon score root path  example : .score")
     parser.add_argument("-st", dest=ConfigKey.STATE_DB_ROOT_PATH, type=str, default=None,
@@ -76,6 +86,10 @@ def main():
                         help="icon score service run foreground")
     parser.add_argument("-tbears", dest=ConfigKey.TBEARS_MODE, action='store_true',
                         help="tbears mode")
+    parser.add_argument("-sp", dest='snapshot_path', type=str, default=None,
+                        help="snapshot directory for export and import")
+    parser.add_argument("-sw", dest='snapshot_workers', type=int, default=None,
+                        help="the number of snapshot chunks imported at the same time")
 
     args = parser.parse_args()
 
@@ -102,6 +116,11 @@ def main():
         result = _start(conf)
     elif command == 'stop' and len(args.command) == 1:
         result = _stop(conf)
+    elif command in ('export', 'import') and len(args.command) == 1 and args.snapshot_path:
+        if command == 'export':
+            result = _export(conf, args.snapshot_path)
+        else:
+            result = _import(conf, args.snapshot_path, args.snapshot_workers)
     else:
         parser.print_help()
         result = ExitCode.COMMAND_IS_WRONG.value
@@ -127,6 +146,71 @@ def _stop(conf: 'IconConfig') -> int:
     return ExitCode.SUCCEEDED
 
 
+def _open_state_db(conf: 'IconConfig'):
+    """Opens the shared state db as IconServiceEngine does without caches and key filter
+    """
+    state_db_root_path: str = conf[ConfigKey.STATE_DB_ROOT_PATH].rstrip('/')
+    score_shard_count: int = conf.get(ConfigKey.STATE_DB_SHARD_COUNT, 0)
+    if score_shard_count > 0:
+        db_mode = ContextDatabaseFactory.Mode.SHARDED_DB
+    else:
+        db_mode = ContextDatabaseFactory.Mode.SINGLE_DB
+
+    ContextDatabaseFactory.open(
+        state_db_root_path,
+        db_mode,
+        score_shard_count=score_shard_count,
+        profiles=conf.get(ConfigKey.STATE_DB_PROFILES, {}))
+    return ContextDatabaseFactory.get_shared_db().key_value_db
+
+
+def _export(conf: 'IconConfig', snapshot_path: str) -> int:
+    if _is_running_icon_service(conf):
+        print('iconservice is running')
+        return ExitCode.COMMAND_IS_WRONG
+    if not os.path.isdir(conf[ConfigKey.STATE_DB_ROOT_PATH]):
+        print(f'state db not found : {conf[ConfigKey.STATE_DB_ROOT_PATH]}')
+        return ExitCode.COMMAND_IS_WRONG
+
+    try:
+        manifest = export_snapshot(_open_state_db(conf), snapshot_path)
+    except DatabaseException as e:
+        print(f'export failed : {e.message}')
+        return ExitCode.COMMAND_IS_WRONG
+    finally:
+        ContextDatabaseFactory.close()
+
+    print(f'exported block {manifest["blockHeight"]} : '
+          f'{manifest["keys"]} keys in {len(manifest["chunks"])} chunks')
+    Logger.info(f'export_command done!', ICON_SERVICE_CLI)
+    return ExitCode.SUCCEEDED
+
+
+def _import(conf: 'IconConfig', snapshot_path: str, workers: Optional[int]) -> int:
+    if _is_running_icon_service(conf):
+        print('iconservice is running')
+        return ExitCode.COMMAND_IS_WRONG
+
+    state_db_root_path: str = conf[ConfigKey.STATE_DB_ROOT_PATH].rstrip('/')
+    os.makedirs(state_db_root_path, exist_ok=True)
+    progress_path = os.path.join(state_db_root_path, IMPORT_PROGRESS_NAME)
+    key_filter_path = os.path.join(state_db_root_path, KEY_FILTER_NAME)
+
+    try:
+        kwargs = {} if workers is None else {'workers': workers}
+        manifest = import_snapshot(_open_state_db(conf), snapshot_path, progress_path,
+                                   key_filter_path=key_filter_path, **kwargs)
+    except DatabaseException as e:
+        print(f'import failed : {e.message}')
+        return ExitCode.COMMAND_IS_WRONG
+    finally:
+        ContextDatabaseFactory.close()
+
+    print(f'imported block {manifest["blockHeight"]} : {manifest["keys"]} keys')
+    Logger.info(f'import_command done!', ICON_SERVICE_CLI)
+    return ExitCode.SUCCEEDED
+
+
 def _start_process(conf: 'IconConfig'):
     Logger.info('start_server() start')
     python_module_string = 'iconservice.icon_service'
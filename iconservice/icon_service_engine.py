@@ -14,25 +14,32 @@
 # limitations under the License.
 
 
-from math import ceil
+import copy
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, Future
 from os import makedirs
-
-from typing import TYPE_CHECKING, List, Any, Optional
+from typing import TYPE_CHECKING, List, Any, Optional, Tuple
 
 from iconcommons.logger import Logger
 from .base.address import Address, generate_score_address, generate_score_address_for_tbears
 from .base.address import ZERO_SCORE_ADDRESS, GOVERNANCE_SCORE_ADDRESS
 from .base.block import Block
-from .base.exception import ExceptionCode, RevertException, ScoreErrorException
-from .base.exception import IconServiceBaseException, ServerErrorException
+from .base.exception import ExceptionCode, RevertException
+from .base.exception import IconServiceBaseException, ServerErrorException, DatabaseException
+from .base.exception import InvalidParamsException
 from .base.message import Message
 from .base.transaction import Transaction
-from .database.batch import BlockBatch, TransactionBatch
+from .database.backend import Backend
+from .database.batch import BlockBatch, TransactionBatch, SpeculativeBlockBatch
 from .database.factory import ContextDatabaseFactory
+from .database.snapshot_file import IMPORT_PROGRESS_NAME
+from .database.write_behind import WriteBehindKeyValueDatabase
 from .deploy.icon_builtin_score_loader import IconBuiltinScoreLoader
 from .deploy.icon_score_deploy_engine import IconScoreDeployEngine
 from .deploy.icon_score_deploy_storage import IconScoreDeployStorage
 from .icon_constant import ICON_DEX_DB_NAME, ICON_SERVICE_LOG_TAG, IconServiceFlag, ConfigKey
+from .iconscore.governance_params import GovernanceParams, GOVERNANCE_KEY_PREFIX
 from .iconscore.icon_pre_validator import IconPreValidator
 from .iconscore.icon_score_context import IconScoreContext, IconScoreFuncType, ContextContainer
 from .iconscore.icon_score_context import IconScoreContextFactory
@@ -45,18 +52,17 @@ from .iconscore.icon_score_result import TransactionResult
 from .iconscore.icon_score_step import IconScoreStepCounterFactory, StepType
 from .iconscore.icon_score_trace import Trace, TraceType
 from .iconscore.internal_call import InternalCall
+from .iconscore.tx_profile import TransactionProfile, TxPhase, get_slowest_transactions
 from .icx.icx_account import AccountType
 from .icx.icx_engine import IcxEngine
 from .icx.icx_storage import IcxStorage
 from .precommit_data_manager import PrecommitData, PrecommitDataManager
-from .utils import byte_length_of_int
-from .utils import is_lowercase_hex_string
+from .utils import get_data_size
 from .utils.bloom import BloomFilter
 
 if TYPE_CHECKING:
     from .iconscore.icon_score_step import IconScoreStepCounter
     from .iconscore.icon_score_event_log import EventLog
-    from .builtin_scores.governance.governance import Governance
     from iconcommons.icon_config import IconConfig
 
 
@@ -85,6 +91,23 @@ class IconServiceEngine(ContextContainer):
         self._step_counter_factory = None
         self._icon_pre_validator = None
         self._icon_score_deploy_storage = None
+        self._state_db_flush_interval = 0
+        # Governance parameters at the end of the last committed block
+        self._governance_params: Optional['GovernanceParams'] = None
+        # Reads the states before the block being invoked on top of an uncommitted block
+        # to check balances, which are read from StateDB otherwise
+        self._pre_validation_context: Optional['IconScoreContext'] = None
+        # Runs the transactions of a block speculatively if not None
+        self._invoke_executor: Optional['ThreadPoolExecutor'] = None
+        # The number of transactions run speculatively and the ones run again among them
+        self._speculations = 0
+        self._reexecutions = 0
+        # Measures each transaction if True
+        self._tx_profile = False
+        # The number of the slowest transactions in a block to report
+        self._tx_profile_slowest = 0
+        # The slowest transactions in the block invoked last
+        self._last_slowest_txs: Optional[dict] = None
 
         # JSON-RPC handlers
         self._handlers = {
@@ -112,9 +135,38 @@ class IconServiceEngine(ContextContainer):
         makedirs(score_root_path, exist_ok=True)
         makedirs(state_db_root_path, exist_ok=True)
 
+        if os.path.exists(os.path.join(state_db_root_path, IMPORT_PROGRESS_NAME)):
+            raise DatabaseException('State db is being imported from a snapshot')
+
         # Share one context db with all SCOREs
+        score_shard_count: int = self._conf.get(ConfigKey.STATE_DB_SHARD_COUNT, 0)
+        if score_shard_count > 0:
+            db_mode = ContextDatabaseFactory.Mode.SHARDED_DB
+        else:
+            db_mode = ContextDatabaseFactory.Mode.SINGLE_DB
+
         ContextDatabaseFactory.open(
-            state_db_root_path, ContextDatabaseFactory.Mode.SINGLE_DB)
+            state_db_root_path,
+            db_mode,
+            cache_size=self._conf.get(ConfigKey.STATE_DB_CACHE_SIZE, 0),
+            backend=Backend(self._conf.get(ConfigKey.STATE_DB_BACKEND, Backend.LEVELDB.value)),
+            score_shard_count=score_shard_count,
+            write_behind=self._conf.get(ConfigKey.STATE_DB_WRITE_BEHIND, False),
+            metrics=self._conf.get(ConfigKey.STATE_DB_METRICS, False),
+            metrics_dump_path=self._conf.get(ConfigKey.STATE_DB_METRICS_DUMP_PATH, ''),
+            profiles=self._conf.get(ConfigKey.STATE_DB_PROFILES, {}),
+            key_filter_capacity=self._conf.get(ConfigKey.STATE_DB_KEY_FILTER_CAPACITY, 0),
+            presence_cache_size=self._conf.get(ConfigKey.STATE_DB_PRESENCE_CACHE_SIZE, 0),
+            history_retention=self._conf.get(ConfigKey.STATE_DB_HISTORY_RETENTION, 0))
+        self._state_db_flush_interval: int = \
+            self._conf.get(ConfigKey.STATE_DB_FLUSH_INTERVAL, 0)
+
+        parallel_invoke_workers: int = self._conf.get(ConfigKey.PARALLEL_INVOKE_WORKERS, 0)
+        if parallel_invoke_workers > 0:
+            self._invoke_executor = ThreadPoolExecutor(parallel_invoke_workers)
+
+        self._tx_profile: bool = self._conf.get(ConfigKey.TX_PROFILE, False)
+        self._tx_profile_slowest: int = self._conf.get(ConfigKey.TX_PROFILE_SLOWEST, 0)
 
         self._context_factory = IconScoreContextFactory(max_size=5)
         self._icon_score_loader = IconScoreLoader(score_root_path)
@@ -177,55 +229,58 @@ class IconServiceEngine(ContextContainer):
         finally:
             self._pop_context()
 
-    def _init_global_value_by_governance_score(self):
+    def _init_global_value_by_governance_score(
+            self, governance_params: Optional['GovernanceParams'] = None):
         """Initialize step_counter_factory with parameters
         managed by governance SCORE
 
+        :param governance_params: the parameters read before.
+            If None, they are read from the committed states of governance SCORE
         :return:
         """
-        context: 'IconScoreContext' = self._context_factory.create(IconScoreContextType.QUERY)
-        # Clarifies that This Context does not count steps
-        context.step_counter = None
+        if governance_params is None:
+            context: 'IconScoreContext' = self._context_factory.create(IconScoreContextType.QUERY)
+            # Clarifies that This Context does not count steps
+            context.step_counter = None
 
-        try:
-            self._push_context(context)
-            # Gets the governance SCORE
-            governance_score: 'Governance' = context.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
-            if governance_score is None:
-                raise ServerErrorException(f'governance_score is None')
-
-            # Gets the step price if the fee flag is on
-            # and set to the counter factory
-            if context.is_service_flag_on(IconServiceFlag.fee):
-                step_price = governance_score.getStepPrice()
-            else:
-                step_price = 0
+            try:
+                governance_params = self._load_governance_params(context)
+            finally:
+                self._context_factory.destroy(context)
 
-            self._step_counter_factory.set_step_price(step_price)
+            self._governance_params = governance_params
 
-            # Gets the step costs and set to the counter factory
-            step_costs = governance_score.getStepCosts()
+        self._step_counter_factory.set_step_price(governance_params.step_price)
 
-            for key, value in step_costs.items():
-                try:
-                    self._step_counter_factory.set_step_cost(
-                        StepType(key), value)
-                except ValueError:
-                    # Pass the unknown step type
-                    pass
+        for step_type, value in governance_params.step_costs.items():
+            self._step_counter_factory.set_step_cost(step_type, value)
 
-            # Gets the max step limit and keep into the counter factory
-            self._step_counter_factory.set_max_step_limit(
-                IconScoreContextType.INVOKE,
-                governance_score.getMaxStepLimit("invoke"))
-            self._step_counter_factory.set_max_step_limit(
-                IconScoreContextType.QUERY,
-                governance_score.getMaxStepLimit("query"))
+        for context_type, value in governance_params.max_step_limits.items():
+            self._step_counter_factory.set_max_step_limit(context_type, value)
 
+    def _load_governance_params(self, context: 'IconScoreContext') -> 'GovernanceParams':
+        """Reads the parameters managed by governance SCORE with a given context
+
+        :param context: the context to read the states with
+        :return: GovernanceParams
+        """
+        governance_params = context.governance_params
+        step_counter = context.step_counter
+        tx_profile = context.tx_profile
+        # Reads governance SCORE not the old parameters without counting steps
+        context.governance_params = None
+        context.step_counter = None
+        # The reads don't belong to any transaction
+        context.tx_profile = None
+
+        try:
+            self._push_context(context)
+            return GovernanceParams.load(context)
         finally:
             self._pop_context()
-
-        self._context_factory.destroy(context)
+            context.governance_params = governance_params
+            context.step_counter = step_counter
+            context.tx_profile = tx_profile
 
     def _validate_deployer_whitelist(
             self, context: 'IconScoreContext', params: dict):
@@ -240,12 +295,7 @@ class IconServiceEngine(ContextContainer):
 
         try:
             self._push_context(context)
-            # Gets the governance SCORE
-            governance_score: 'Governance' = context.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
-            if governance_score is None:
-                raise ServerErrorException(f'governance_score is None')
-
-            if not governance_score.isDeployer(_from):
+            if not context.is_deployer(_from):
                 raise ServerErrorException(f'Invalid deployer: no permission (address: {_from})')
         finally:
             self._pop_context()
@@ -259,12 +309,7 @@ class IconServiceEngine(ContextContainer):
 
         try:
             self._push_context(context)
-            # Gets the governance SCORE
-            governance_score: 'Governance' = context.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
-            if governance_score is None:
-                raise ServerErrorException(f'governance_score is None')
-
-            if governance_score.isInScoreBlackList(_to):
+            if context.is_in_score_blacklist(_to):
                 raise ServerErrorException(f'The Score is in Black List (address: {_to})')
         finally:
             self._pop_context()
@@ -285,6 +330,10 @@ class IconServiceEngine(ContextContainer):
             ContextDatabaseFactory.close()
             self._clear_context()
 
+            if self._invoke_executor is not None:
+                self._invoke_executor.shutdown()
+                self._invoke_executor = None
+
     def invoke(self,
                block: 'Block',
                tx_requests: list) -> tuple:
@@ -304,40 +353,261 @@ class IconServiceEngine(ContextContainer):
             return precommit_data.block_result, precommit_data.state_root_hash
 
         # Check for block validation before invoke
-        self._precommit_data_manager.validate_block_to_invoke(block)
-
-        self._init_global_value_by_governance_score()
+        # The block can be invoked on top of its parent which is not committed yet
+        parent: Optional['PrecommitData'] = \
+            self._precommit_data_manager.validate_block_to_invoke(block)
+        parent_batch: Optional['BlockBatch'] = None
+        parent_score_mapper: Optional['IconScoreMapper'] = None
+        if parent is not None:
+            parent_batch = parent.block_batch
+            parent_score_mapper = parent.score_mapper
+
+        # The parameters at the end of the parent block are used as they are
+        # unless a transaction changes them
+        if parent is not None:
+            governance_params: Optional['GovernanceParams'] = parent.governance_params
+        else:
+            governance_params: Optional['GovernanceParams'] = self._governance_params
+        self._init_global_value_by_governance_score(governance_params)
 
         context = self._context_factory.create(IconScoreContextType.INVOKE)
         context.block = block
-        context.block_batch = BlockBatch(Block.from_block(block))
+        context.block_batch = BlockBatch(Block.from_block(block), parent_batch)
         context.tx_batch = TransactionBatch()
-        context.new_icon_score_mapper = IconScoreMapper()
+        context.new_icon_score_mapper = IconScoreMapper(parent=parent_score_mapper)
+        context.governance_params = governance_params
         block_result = []
 
-        if block.height == 0:
-            # Assume that there is only one tx in genesis_block
-            tx_result = self._invoke_genesis(context, tx_requests[0], 0)
-            block_result.append(tx_result)
-            context.block_batch.update(context.tx_batch)
-            context.tx_batch.clear()
-        else:
-            for index, tx_request in enumerate(tx_requests):
-                tx_result = self._invoke_request(context, tx_request, index)
+        if parent_batch is not None:
+            self._pre_validation_context = self._create_parent_state_context(parent_batch)
+
+        try:
+            if block.height == 0:
+                # Assume that there is only one tx in genesis_block
+                tx_result = self._invoke_genesis(context, tx_requests[0], 0)
                 block_result.append(tx_result)
                 context.block_batch.update(context.tx_batch)
                 context.tx_batch.clear()
+            elif self._invoke_executor is not None:
+                block_result = self._invoke_requests_in_parallel(context, tx_requests)
+            else:
+                for index, tx_request in enumerate(tx_requests):
+                    tx_result = self._invoke_request(context, tx_request, index)
+                    block_result.append(tx_result)
+                    governance_changed = self._is_governance_changed(tx_request, context.tx_batch)
+                    context.block_batch.update(context.tx_batch)
+                    context.tx_batch.clear()
+                    if governance_changed and context.governance_params is not None:
+                        context.governance_params = self._load_governance_params(context)
+        finally:
+            if self._pre_validation_context is not None:
+                self._context_factory.destroy(self._pre_validation_context)
+                self._pre_validation_context = None
+
+        self._log_failures(block, block_result)
+        if self._tx_profile and self._tx_profile_slowest > 0:
+            self._report_slowest_transactions(block, block_result)
 
         # Save precommit data
         # It will be written to levelDB on commit
         precommit_data = PrecommitData(
-            context.block_batch, block_result, context.new_icon_score_mapper)
+            context.block_batch, block_result, context.new_icon_score_mapper,
+            context.governance_params)
         self._precommit_data_manager.push(precommit_data)
 
         self._context_factory.destroy(context)
 
         return block_result, precommit_data.state_root_hash
 
+    @staticmethod
+    def _log_failures(block: 'Block', block_result: List['TransactionResult']) -> None:
+        """Logs the number of failed transactions in a block by error code in a line
+
+        :param block: the block invoked
+        :param block_result: the results of the transactions in the block
+        """
+        failures = {}
+        for tx_result in block_result:
+            if tx_result.failure is not None:
+                code = tx_result.failure.code
+                failures[code] = failures.get(code, 0) + 1
+
+        if failures:
+            Logger.info(f'Failed transactions in block {block.height}: {failures}',
+                        ICON_SERVICE_LOG_TAG)
+
+    def _report_slowest_transactions(self,
+                                     block: 'Block',
+                                     block_result: List['TransactionResult']) -> None:
+        """Logs the profiles of the slowest transactions in a block
+        and keeps them for ise_getStatus
+
+        :param block: the block invoked
+        :param block_result: the results of the transactions in the block
+        """
+        slowest_txs = {
+            'blockHeight': block.height,
+            'blockHash': f'0x{block.hash.hex()}',
+            'transactions': get_slowest_transactions(block_result, self._tx_profile_slowest)
+        }
+        self._last_slowest_txs = slowest_txs
+
+        Logger.info(f'Slowest transactions: {json.dumps(slowest_txs)}', ICON_SERVICE_LOG_TAG)
+
+    def _create_parent_state_context(self, parent_batch: 'BlockBatch') -> 'IconScoreContext':
+        """Creates a context which reads the states at the end of an uncommitted block
+        instead of the ones in StateDB
+
+        :param parent_batch: BlockBatch of the uncommitted block
+        """
+        context = self._context_factory.create(IconScoreContextType.INVOKE)
+        context.block_batch = BlockBatch(parent_batch.block, parent_batch)
+        context.tx_batch = TransactionBatch()
+        # Clarifies that This Context does not count steps
+        context.step_counter = None
+
+        return context
+
+    def _invoke_requests_in_parallel(self,
+                                     context: 'IconScoreContext',
+                                     tx_requests: list) -> List['TransactionResult']:
+        """Runs the transactions of a block speculatively in parallel
+
+        Every transaction is run on a thread against the states before the block
+        except charging its fee. After all of them are done,
+        they are validated in block order:
+        a transaction which has read none of the keys written by the preceding ones
+        is charged its fee and its states are put into BlockBatch as they are,
+        otherwise it is run again in order. So BlockBatch and tx results are
+        the same as the ones of running the transactions one by one.
+
+        :param context: invoke context with an empty BlockBatch
+        :param tx_requests: transactions in a block
+        :return: tx results
+        """
+        futures = []
+        for index, tx_request in enumerate(tx_requests):
+            future = None
+            if self._is_speculative_request(tx_request):
+                future = self._invoke_executor.submit(
+                    self._execute_speculatively, context.block, context.block_batch,
+                    context.governance_params, tx_request, index)
+            futures.append(future)
+
+        # BlockBatch is not changed until no transaction reads it on threads
+        speculations = [self._get_speculation(future) for future in futures]
+
+        block_result = []
+        # The keys written by the transactions validated so far
+        written_keys = set()
+        # Reads of governance parameters are not recorded,
+        # so every transaction is run again after they are changed
+        governance_changed = False
+
+        for index, (tx_request, speculation) in enumerate(zip(tx_requests, speculations)):
+            tx_context = None
+            if speculation is not None:
+                self._speculations += 1
+                tx_context, tx_result = speculation
+                if governance_changed or tx_context.block_batch.has_read(written_keys):
+                    self._reexecutions += 1
+                    self._context_factory.destroy(tx_context)
+                    tx_context = None
+
+            if tx_context is not None:
+                tx_context.block_batch = context.block_batch
+                tx_context.cumulative_step_used = context.cumulative_step_used
+                self._finalize_transaction(tx_context, tx_request['params'], tx_result)
+                context.cumulative_step_used = tx_context.cumulative_step_used
+                tx_batch = tx_context.tx_batch
+            else:
+                tx_result = self._invoke_request(context, tx_request, index)
+                tx_batch = context.tx_batch
+
+            block_result.append(tx_result)
+            written_keys.update(tx_batch)
+            is_governance_changed = self._is_governance_changed(tx_request, tx_batch)
+            context.block_batch.update(tx_batch)
+            tx_batch.clear()
+
+            if tx_context is not None:
+                self._context_factory.destroy(tx_context)
+
+            if is_governance_changed and context.governance_params is not None:
+                governance_changed = True
+                context.governance_params = self._load_governance_params(context)
+
+        return block_result
+
+    @staticmethod
+    def _get_speculation(future: Optional['Future']) \
+            -> Optional[Tuple['IconScoreContext', 'TransactionResult']]:
+        """Waits for a transaction run speculatively
+
+        :return: None if it has not been run or has raised an exception,
+        which is raised again when it is run in order
+        """
+        if future is None:
+            return None
+
+        try:
+            return future.result()
+        except BaseException as e:
+            Logger.warning(f'Speculative execution failed: {e}', ICON_SERVICE_LOG_TAG)
+            return None
+
+    @staticmethod
+    def _is_speculative_request(tx_request: dict) -> bool:
+        """Checks if a transaction can be run speculatively
+
+        Deploying SCOREs and governance calls change more than states
+        such as SCORE files and IconScoreMapper, so they are always run in order.
+        """
+        params = tx_request['params']
+        return tx_request['method'] == 'icx_sendTransaction' \
+            and params.get('dataType') != 'deploy' \
+            and params['to'] != GOVERNANCE_SCORE_ADDRESS
+
+    def _execute_speculatively(self,
+                               block: 'Block',
+                               block_batch: 'BlockBatch',
+                               governance_params: 'GovernanceParams',
+                               tx_request: dict,
+                               index: int) -> Tuple['IconScoreContext', 'TransactionResult']:
+        """Runs a transaction except charging its fee on a thread
+
+        :param block:
+        :param block_batch: the states before the block, not changed until validation
+        :param governance_params: governance parameters before the block
+        :param tx_request:
+        :param index: the index of the transaction in the block
+        :return: the context holding the states of the transaction and its result
+        """
+        context = self._context_factory.create(IconScoreContextType.INVOKE)
+        context.block = block
+        context.block_batch = SpeculativeBlockBatch(block_batch)
+        context.tx_batch = TransactionBatch()
+        context.governance_params = governance_params
+
+        # SCORE params are converted in place, so the request is kept for running it again
+        tx_request = copy.deepcopy(tx_request)
+
+        self._push_context(context)
+        try:
+            self._prepare_request(context, tx_request, index)
+            tx_result = TransactionResult(context.tx, context.block)
+            self._execute_transaction(context, tx_request['params'], tx_result)
+            # The time waiting for validation is not a part of the transaction
+            if context.tx_profile is not None:
+                context.tx_profile.pause()
+        except BaseException:
+            self._context_factory.destroy(context)
+            raise
+        finally:
+            self._pop_context()
+
+        return context, tx_result
+
     @staticmethod
     def _is_genesis_block(
             tx_index: int, block_height: int, tx_params: dict) -> bool:
@@ -412,8 +682,46 @@ class IconServiceEngine(ContextContainer):
         :param index:
         :return:
         """
+        self._prepare_request(context, request, index)
+
+        governance_params = context.governance_params
+        if request['params']['to'] == GOVERNANCE_SCORE_ADDRESS:
+            # Governance SCORE can change its parameters in the middle of the transaction
+            context.governance_params = None
+
+        try:
+            return self._call(context, request['method'], request['params'])
+        finally:
+            context.governance_params = governance_params
+
+    @staticmethod
+    def _is_governance_changed(request: dict, tx_batch: 'TransactionBatch') -> bool:
+        """Checks if a transaction can have changed the parameters managed by governance SCORE
+
+        :param request: transaction request
+        :param tx_batch: the states written by the transaction
+        """
+        if request['params']['to'] == GOVERNANCE_SCORE_ADDRESS:
+            return True
 
-        method = request['method']
+        # Other SCOREs can call governance SCORE internally
+        for key in tx_batch:
+            if key.startswith(GOVERNANCE_KEY_PREFIX):
+                return True
+
+        return False
+
+    def _prepare_request(self,
+                         context: 'IconScoreContext',
+                         request: dict,
+                         index: int) -> None:
+        """Sets up a context to run a transaction request
+
+        :param context:
+        :param request:
+        :param index: the index of the transaction in its block
+        """
+        context.tx_profile = TransactionProfile() if self._tx_profile else None
         params = request['params']
 
         from_ = params['from']
@@ -439,8 +747,6 @@ class IconServiceEngine(ContextContainer):
         context.msg_stack.clear()
         context.event_log_stack.clear()
 
-        return self._call(context, method, params)
-
     def query(self, method: str, params: dict) -> Any:
         """Process a query message call from outside
 
@@ -450,29 +756,43 @@ class IconServiceEngine(ContextContainer):
         * icx_getTotalSupply
         * icx_call
 
+        With blockHeight in params, it reads the states at the block height
+        if state history retains them.
+
         :param method:
         :param params:
         :return: the result of query
         """
         context = self._context_factory.create(IconScoreContextType.QUERY)
-        context.block = self._icx_storage.last_block
-        step_limit = self._step_counter_factory.get_max_step_limit(context.type)
-
-        if params:
-            from_: 'Address' = params.get('from', None)
-            context.msg = Message(sender=from_)
-            if 'stepLimit' in params:
-                step_limit = min(params['stepLimit'], step_limit)
-
-        context.traces: List['Trace'] = []
-        context.step_counter: IconScoreStepCounter = \
-            self._step_counter_factory.create(step_limit)
-
-        ret = self._call(context, method, params)
-
-        self._context_factory.destroy(context)
+        # A query reads the states committed before it starts
+        # not to see a block committed in the middle of it
+        snapshot = self._icx_context_db.get_snapshot()
+        context.snapshot = snapshot
 
-        return ret
+        try:
+            context.block = self._icx_storage.get_block_info(snapshot)
+
+            block_height: Optional[int] = params.get('blockHeight') if params else None
+            if block_height is not None:
+                last_block_height = -1 if context.block is None else context.block.height
+                self._icx_context_db.rewind_snapshot(snapshot, last_block_height, block_height)
+                context.block = self._icx_storage.get_block_info(snapshot)
+            step_limit = self._step_counter_factory.get_max_step_limit(context.type)
+
+            if params:
+                from_: 'Address' = params.get('from', None)
+                context.msg = Message(sender=from_)
+                if 'stepLimit' in params:
+                    step_limit = min(params['stepLimit'], step_limit)
+
+            context.traces: List['Trace'] = []
+            context.step_counter: IconScoreStepCounter = \
+                self._step_counter_factory.create(step_limit)
+
+            return self._call(context, method, params)
+        finally:
+            snapshot.release()
+            self._context_factory.destroy(context)
 
     def validate_transaction(self, request: dict) -> None:
         """Validate JSON-RPC transaction request
@@ -498,14 +818,15 @@ class IconServiceEngine(ContextContainer):
         if 'data' in params:
             # minimum_step is the sum of
             # default STEP cost and input STEP costs if data field exists
-            data = params['data']
-            input_size = self._get_byte_length(data)
+            input_size = get_data_size(params).byte_length
             minimum_step += input_size * \
                 self._step_counter_factory.get_step_cost(StepType.INPUT)
 
         self._icon_pre_validator.execute(params, step_price, minimum_step)
 
         context: 'IconScoreContext' = self._context_factory.create(IconScoreContextType.QUERY)
+        # The committed states of governance SCORE are checked with the lists cached in them
+        context.governance_params = self._governance_params
         self._validate_score_blacklist(context, params)
         if context.is_service_flag_on(IconServiceFlag.deployerWhiteList):
             self._validate_deployer_whitelist(context, params)
@@ -596,23 +917,161 @@ class IconServiceEngine(ContextContainer):
         """
         tx_result = TransactionResult(context.tx, context.block)
 
+        if self._is_icx_transfer(params):
+            self._handle_icx_transfer(context, params, tx_result)
+            return tx_result
+
+        try:
+            self._execute_transaction(context, params, tx_result)
+        finally:
+            self._finalize_transaction(context, params, tx_result)
+
+        return tx_result
+
+    @staticmethod
+    def _is_icx_transfer(params: dict) -> bool:
+        """Checks if a transaction only transfers icx to an EOA
+        """
+        return params.get('data') is None and not params['to'].is_contract
+
+    def _handle_icx_transfer(self,
+                             context: 'IconScoreContext',
+                             params: dict,
+                             tx_result: 'TransactionResult') -> None:
+        """Transfers icx and charges a fee at once
+
+        It gives the same states and result as _execute_transaction()
+        and _finalize_transaction() for an EOA to EOA transfer,
+        reading and writing each account only once.
+
+        :param context:
+        :param params: JSON-RPC params
+        :param tx_result: the result to fill in
+        """
+        from_: 'Address' = params['from']
+        to: 'Address' = params['to']
+        value: int = params.get('value', 0)
+        fee_treasury: 'Address' = self._icx_engine.fee_treasury_address
+        step_counter = context.step_counter
+        tx_result.to = to
+
+        # Accounts are kept in variables rather than a dict, hashing Address costs
+        from_account = to_account = None
+        transferred = charged = False
+        profile = context.tx_profile
+
+        try:
+            if profile is not None:
+                profile.enter(TxPhase.BALANCE_CHECK)
+            # Check if from account can charge a tx fee
+            self._icon_pre_validator.execute_to_check_out_of_balance(
+                params,
+                step_price=step_counter.step_price,
+                context=self._pre_validation_context)
+
+            if profile is not None:
+                profile.enter(TxPhase.TRANSFER)
+            # No INPUT step without data
+            step_counter.apply_step(StepType.DEFAULT, 1)
+
+            if value < 0:
+                raise InvalidParamsException('Amount is less than zero')
+            if from_ != to and value > 0:
+                from_account, to_account = self._icx_storage.get_accounts(context, [from_, to])
+                # Account.withdraw() raises an exception before changing the balance
+                from_account.withdraw(value)
+                to_account.deposit(value)
+                transferred = True
+
+            tx_result.status = TransactionResult.SUCCESS
+        except BaseException as e:
+            tx_result.failure = self._get_failure_from_exception(e)
+            trace = self._get_trace_from_exception(context.current_address, e)
+            context.traces.append(trace)
+
+        if profile is not None:
+            profile.enter(TxPhase.FEE)
+        step_used, step_price = self._get_final_step(
+            context, params, tx_result.status, step_counter.step_used)
+
+        fee: int = step_used * step_price
+        if from_ != fee_treasury and fee > 0:
+            try:
+                if to_account is not None and to == fee_treasury:
+                    treasury_account = to_account
+                elif from_account is not None:
+                    treasury_account = self._icx_storage.get_account(context, fee_treasury)
+                else:
+                    from_account, treasury_account = \
+                        self._icx_storage.get_accounts(context, [from_, fee_treasury])
+
+                from_account.withdraw(fee)
+                treasury_account.deposit(fee)
+                charged = True
+            except BaseException as e:
+                message = e.message if hasattr(e, 'message') else str(e)
+                Logger.exception(message, ICON_SERVICE_LOG_TAG)
+                step_used = 0
+
+        # In the order IcxEngine writes accounts: from, to, from, fee treasury
+        if transferred or charged:
+            self._icx_storage.put_account(context, from_, from_account)
+        if transferred:
+            self._icx_storage.put_account(context, to, to_account)
+        if charged and not (transferred and to == fee_treasury):
+            self._icx_storage.put_account(context, fee_treasury, treasury_account)
+
+        context.cumulative_step_used += step_used
+        tx_result.step_used = step_used
+        tx_result.step_price = step_price
+        tx_result.cumulative_step_used = context.cumulative_step_used
+        tx_result.event_logs = context.event_logs
+        tx_result.logs_bloom = BloomFilter()
+        tx_result.traces = context.traces
+
+        if profile is not None:
+            profile.pause()
+            tx_result.profile = profile
+
+    def _execute_transaction(self,
+                             context: 'IconScoreContext',
+                             params: dict,
+                             tx_result: 'TransactionResult') -> None:
+        """Runs a transaction except charging its fee
+
+        :param context:
+        :param params: JSON-RPC params
+        :param tx_result: the result to fill in
+        """
+        profile = context.tx_profile
+
         try:
             to: Address = params['to']
             tx_result.to = to
 
+            if profile is not None:
+                profile.enter(TxPhase.BALANCE_CHECK)
             # Check if from account can charge a tx fee
             self._icon_pre_validator.execute_to_check_out_of_balance(
                 params,
-                step_price=context.step_counter.step_price)
+                step_price=context.step_counter.step_price,
+                context=self._pre_validation_context)
 
+            if profile is not None:
+                profile.enter(TxPhase.INPUT)
             # Every send_transaction are calculated DEFAULT STEP at first
             context.step_counter.apply_step(StepType.DEFAULT, 1)
-            input_size = self._get_byte_length(params.get('data', None))
+            input_size = get_data_size(params).byte_length
 
             context.step_counter.apply_step(StepType.INPUT, input_size)
+
+            if profile is not None:
+                profile.enter(TxPhase.TRANSFER)
             self._transfer_coin(context, params)
 
             if to.is_contract:
+                if profile is not None:
+                    profile.enter(TxPhase.SCORE_CALL)
                 tx_result.score_address = self._handle_score_invoke(context, to, params)
 
             tx_result.status = TransactionResult.SUCCESS
@@ -622,52 +1081,48 @@ class IconServiceEngine(ContextContainer):
             context.tx_batch.clear()
             context.traces.append(trace)
             context.event_logs.clear()
-        finally:
-            # Revert func_type to IconScoreFuncType.WRITABLE
-            # to avoid DatabaseException in self._charge_transaction_fee()
-            context.func_type = IconScoreFuncType.WRITABLE
-
-            # Charge a fee to from account
-            final_step_used, final_step_price = \
-                self._charge_transaction_fee(
-                    context,
-                    params,
-                    tx_result.status,
-                    context.step_counter.step_used)
-
-            # Finalize tx_result
-            context.cumulative_step_used += final_step_used
-            tx_result.step_used = final_step_used
-            tx_result.step_price = final_step_price
-            tx_result.cumulative_step_used = context.cumulative_step_used
-            tx_result.event_logs = context.event_logs
-            tx_result.logs_bloom = self._generate_logs_bloom(context.event_logs)
-            tx_result.traces = context.traces
 
-        return tx_result
+    def _finalize_transaction(self,
+                              context: 'IconScoreContext',
+                              params: dict,
+                              tx_result: 'TransactionResult') -> None:
+        """Charges the fee of a transaction and fills the rest of its result
 
-    def _get_byte_length(self, data) -> int:
-        size = 0
-        if data:
-            if isinstance(data, dict):
-                for v in data.values():
-                    size += self._get_byte_length(v)
-            elif isinstance(data, list):
-                for v in data:
-                    size += self._get_byte_length(v)
-            elif isinstance(data, str):
-                # If the value is hexstring, it is calculated as bytes otherwise
-                # string
-                data_body = data[2:] if data.startswith('0x') else data
-                if is_lowercase_hex_string(data_body):
-                    size += ceil(len(data_body) / 2)
-                else:
-                    size += len(data.encode('utf-8'))
-            else:
-                # int and bool
-                if isinstance(data, int):
-                    size += byte_length_of_int(data)
-        return size
+        :param context:
+        :param params: JSON-RPC params
+        :param tx_result: the result filled by _execute_transaction()
+        """
+        # Revert func_type to IconScoreFuncType.WRITABLE
+        # to avoid DatabaseException in self._charge_transaction_fee()
+        context.func_type = IconScoreFuncType.WRITABLE
+
+        profile = context.tx_profile
+        if profile is not None:
+            profile.enter(TxPhase.FEE)
+
+        # Charge a fee to from account
+        final_step_used, final_step_price = \
+            self._charge_transaction_fee(
+                context,
+                params,
+                tx_result.status,
+                context.step_counter.step_used)
+
+        # Finalize tx_result
+        context.cumulative_step_used += final_step_used
+        tx_result.step_used = final_step_used
+        tx_result.step_price = final_step_price
+        tx_result.cumulative_step_used = context.cumulative_step_used
+        tx_result.event_logs = context.event_logs
+
+        if profile is not None:
+            profile.enter(TxPhase.BLOOM)
+        tx_result.logs_bloom = self._generate_logs_bloom(context.event_logs)
+        tx_result.traces = context.traces
+
+        if profile is not None:
+            profile.pause()
+            tx_result.profile = profile
 
     def _transfer_coin(self,
                        context: 'IconScoreContext',
@@ -700,9 +1155,37 @@ class IconServiceEngine(ContextContainer):
         :param status: 1: SUCCESS, 0: FAILURE
         :return: final step_used, step_price
         """
-        version: int = params.get('version', 2)
         from_: 'Address' = params['from']
+        step_used, step_price = self._get_final_step(context, params, status, step_used)
 
+        # Charge a fee to from account
+        fee: int = step_used * step_price
+        try:
+            self._icx_engine.charge_fee(context, from_, fee)
+        except BaseException as e:
+            if hasattr(e, 'message'):
+                message = e.message
+            else:
+                message = str(e)
+            Logger.exception(message, ICON_SERVICE_LOG_TAG)
+            step_used = 0
+
+        # final step_used and step_price
+        return step_used, step_price
+
+    @staticmethod
+    def _get_final_step(context: 'IconScoreContext',
+                        params: dict,
+                        status: int,
+                        step_used: int) -> (int, int):
+        """Returns step_used and step_price which a fee is charged with
+
+        :param params:
+        :param status: 1: SUCCESS, 0: FAILURE
+        :param step_used: steps used by the transaction
+        :return: step_used, step_price
+        """
+        version: int = params.get('version', 2)
         step_price = context.step_counter.step_price
 
         if version < 3:
@@ -719,19 +1202,6 @@ class IconServiceEngine(ContextContainer):
                 # FIXED_FEE(0.01 icx) == step_used(10**6) * step_price(10**10)
                 step_price = 10 ** 10
 
-        # Charge a fee to from account
-        fee: int = step_used * step_price
-        try:
-            self._icx_engine.charge_fee(context, from_, fee)
-        except BaseException as e:
-            if hasattr(e, 'message'):
-                message = e.message
-            else:
-                message = str(e)
-            Logger.exception(message, ICON_SERVICE_LOG_TAG)
-            step_used = 0
-
-        # final step_used and step_price
         return step_used, step_price
 
     def _get_step_price(self):
@@ -778,7 +1248,7 @@ class IconServiceEngine(ContextContainer):
                 score_address = to
                 context.step_counter.apply_step(StepType.CONTRACT_UPDATE, 1)
 
-            data_size = self._get_byte_length(data.get('content', None))
+            data_size = get_data_size(params).content_byte_length
             context.step_counter.apply_step(StepType.CONTRACT_SET, data_size)
 
             self._icon_score_deploy_engine.invoke(
@@ -802,10 +1272,8 @@ class IconServiceEngine(ContextContainer):
         """
 
         if isinstance(e, IconServiceBaseException):
-            if e.code == ExceptionCode.SCORE_ERROR or isinstance(e, ScoreErrorException):
-                Logger.warning(e.message, ICON_SERVICE_LOG_TAG)
-            else:
-                Logger.exception(e.message, ICON_SERVICE_LOG_TAG)
+            # Expected failures are counted by block in _log_failures() without stack dumps
+            Logger.debug(e.message, ICON_SERVICE_LOG_TAG)
 
             code = e.code
             message = e.message
@@ -871,6 +1339,50 @@ class IconServiceEngine(ContextContainer):
         if not bool(params) or params.get('filter'):
             last_block_status = self._make_last_block_status()
             response['lastBlock'] = last_block_status
+
+        cache = self._icx_context_db.cache
+        if cache is not None:
+            if not bool(params) or 'stateDbCache' in params.get('filter', []):
+                response['stateDbCache'] = cache.get_status()
+
+        presence_cache = self._icx_context_db.presence_cache
+        if presence_cache is not None:
+            if not bool(params) or 'stateDbPresenceCache' in params.get('filter', []):
+                response['stateDbPresenceCache'] = presence_cache.get_status()
+
+        key_value_db = self._icx_context_db.key_value_db
+        if isinstance(key_value_db, WriteBehindKeyValueDatabase):
+            if not bool(params) or 'stateDbWriter' in params.get('filter', []):
+                response['stateDbWriter'] = key_value_db.get_status()
+
+        metrics = self._icx_context_db.metrics
+        if metrics is not None:
+            if not bool(params) or 'stateDbMetrics' in params.get('filter', []):
+                response['stateDbMetrics'] = metrics.get_status()
+
+        key_filter = self._icx_context_db.key_filter
+        if key_filter is not None:
+            if not bool(params) or 'stateDbKeyFilter' in params.get('filter', []):
+                response['stateDbKeyFilter'] = key_filter.get_status()
+
+        history = self._icx_context_db.history
+        if history is not None:
+            if not bool(params) or 'stateDbHistory' in params.get('filter', []):
+                response['stateDbHistory'] = history.get_status()
+
+        executor = self._invoke_executor
+        if executor is not None:
+            if not bool(params) or 'parallelInvoke' in params.get('filter', []):
+                response['parallelInvoke'] = {
+                    'workers': executor._max_workers,
+                    'speculations': self._speculations,
+                    'reexecutions': self._reexecutions
+                }
+
+        slowest_txs = self._last_slowest_txs
+        if slowest_txs is not None:
+            if not bool(params) or 'txProfile' in params.get('filter', []):
+                response['txProfile'] = slowest_txs
         return response
 
     def _make_last_block_status(self) -> Optional[dict]:
@@ -917,17 +1429,25 @@ class IconServiceEngine(ContextContainer):
         if new_icon_score_mapper:
             self._icon_score_mapper.update(new_icon_score_mapper)
 
-        self._icx_context_db.write_batch(
-            context=context, states=block_batch)
-
-        self._icx_storage.put_block_info(context, block_batch.block)
+        self._icx_storage.write_block_batch(context, block_batch)
         self._precommit_data_manager.commit(block_batch.block)
+        if precommit_data.governance_params is not None:
+            self._governance_params = precommit_data.governance_params
         self._context_factory.destroy(context)
 
+        if self._icx_context_db.metrics is not None:
+            self._icx_context_db.metrics.end_block(block.height)
+
+        # In write-behind mode, the states can be still waiting to be written
+        if self._state_db_flush_interval > 0 \
+                and block.height % self._state_db_flush_interval == 0:
+            self._icx_context_db.flush()
+
     def rollback(self, block: 'Block') -> None:
         """Throw away a precommit state
         in context.block_batch and IconScoreEngine
         """
         # Check for block validation before rollback
-        self._precommit_data_manager.validate_precommit_block(block)
+        self._precommit_data_manager.validate_block_to_rollback(block)
+        # The blocks invoked on top of it are also thrown away
         self._precommit_data_manager.rollback(block)
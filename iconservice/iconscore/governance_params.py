@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import TYPE_CHECKING, Optional
+
+from .icon_score_step import StepType
+from ..base.address import GOVERNANCE_SCORE_ADDRESS
+from ..base.exception import ServerErrorException
+from ..icon_constant import IconScoreContextType, IconServiceFlag
+
+if TYPE_CHECKING:
+    from .icon_score_context import IconScoreContext
+    from ..builtin_scores.governance.governance import Governance
+
+# All keys of the states of governance SCORE start with it. See IconScoreDatabase
+GOVERNANCE_KEY_PREFIX: bytes = GOVERNANCE_SCORE_ADDRESS.to_bytes() + b'|'
+
+
+def get_service_flag(governance_score: 'Governance', default_flag: int) -> int:
+    """Returns the service flag of governance SCORE or default_flag if it has none
+    """
+    try:
+        return governance_score.service_config
+    except AttributeError:
+        return default_flag
+
+
+# noinspection PyBroadException
+def get_revision(governance_score: Optional['Governance']) -> int:
+    try:
+        if governance_score is not None:
+            if hasattr(governance_score, 'revision_code'):
+                return governance_score.revision_code
+    except:
+        pass
+
+    return 0
+
+
+# noinspection PyBroadException
+def is_icx_send_defective(governance_score: Optional['Governance']) -> bool:
+    """Governance SCORE 0.0.2 makes icx.send() to EOA return False though it succeeds
+    """
+    try:
+        if governance_score is not None:
+            if hasattr(governance_score, 'getVersion'):
+                version = governance_score.getVersion()
+                return version == '0.0.2'
+    except BaseException:
+        pass
+
+    return False
+
+
+class GovernanceParams(object):
+    """The parameters managed by governance SCORE at a point of the chain
+
+    It is loaded once and kept as it is until a transaction writes
+    the states of governance SCORE, so transactions don't read them
+    from governance SCORE every time.
+    The membership of the lists such as SCORE blacklist is cached as well.
+    """
+
+    def __init__(self,
+                 step_costs: dict,
+                 step_price: int,
+                 max_step_limits: dict,
+                 service_flag: int,
+                 revision: int,
+                 icx_send_defective: bool) -> None:
+        """Constructor
+
+        :param step_costs: step costs by StepType
+        :param step_price: step price, 0 if the fee flag is off
+        :param max_step_limits: max step limits by IconScoreContextType
+        :param service_flag: IconServiceFlag values
+        :param revision: revision code
+        :param icx_send_defective: whether icx.send() to EOA returns False
+        """
+        self._step_costs = step_costs
+        self._step_price = step_price
+        self._max_step_limits = max_step_limits
+        self._service_flag = service_flag
+        self._revision = revision
+        self._icx_send_defective = icx_send_defective
+        # Whether addresses are in the lists such as SCORE blacklist by list name.
+        # They are filled on demand and valid as long as the parameters are
+        self._list_caches = {}
+
+    @property
+    def step_costs(self) -> dict:
+        return dict(self._step_costs)
+
+    @property
+    def step_price(self) -> int:
+        return self._step_price
+
+    @property
+    def max_step_limits(self) -> dict:
+        return dict(self._max_step_limits)
+
+    @property
+    def service_flag(self) -> int:
+        return self._service_flag
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    @property
+    def icx_send_defective(self) -> bool:
+        return self._icx_send_defective
+
+    def get_list_cache(self, name: str) -> dict:
+        """Returns the membership cache of a list managed by governance SCORE
+
+        :param name: list name
+        :return: dict of address to whether it is in the list
+        """
+        return self._list_caches.setdefault(name, {})
+
+    @staticmethod
+    def load(context: 'IconScoreContext') -> 'GovernanceParams':
+        """Reads the parameters from governance SCORE
+
+        context should have been pushed to the context stack
+        and should not count steps.
+
+        :param context: the context which reads the states of governance SCORE
+        :return: GovernanceParams
+        """
+        governance_score: 'Governance' = context.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
+        if governance_score is None:
+            raise ServerErrorException(f'governance_score is None')
+
+        service_flag: int = get_service_flag(governance_score, context.icon_service_flag)
+
+        # The step price is 0 if the fee flag is off
+        if service_flag & IconServiceFlag.fee == IconServiceFlag.fee:
+            step_price = governance_score.getStepPrice()
+        else:
+            step_price = 0
+
+        step_costs = {}
+        for key, value in governance_score.getStepCosts().items():
+            try:
+                step_costs[StepType(key)] = value
+            except ValueError:
+                # Pass the unknown step type
+                pass
+
+        max_step_limits = {
+            IconScoreContextType.INVOKE: governance_score.getMaxStepLimit("invoke"),
+            IconScoreContextType.QUERY: governance_score.getMaxStepLimit("query")
+        }
+
+        return GovernanceParams(step_costs,
+                                step_price,
+                                max_step_limits,
+                                service_flag,
+                                get_revision(governance_score),
+                                is_icx_send_defective(governance_score))
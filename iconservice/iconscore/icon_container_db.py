@@ -170,11 +170,34 @@ class DictDB(object):
     def __init__(self, var_key: str, db: 'IconScoreDatabase', value_type: type, depth: int=1) -> None:
 
         prefix: bytes = ContainerUtil.create_db_prefix(type(self), var_key)
-        self._db = db.get_sub_db(prefix)
+        self.__db = db.get_sub_db(prefix)
 
         self.__value_type = value_type
         self.__depth = depth
 
+        # A nested DictDB keeps the db of the outermost one and its key path from there
+        self.__root_db = self.__db
+        self.__path = []
+
+    @property
+    def _db(self) -> 'IconScoreDatabase':
+        if self.__db is None:
+            # Encodes the whole key path at once
+            # instead of creating a sub db at each depth
+            self.__db = self.__root_db.get_sub_db(b'|'.join(self.__path))
+
+        return self.__db
+
+    def __get_sub_dict_db(self, key: K) -> 'DictDB':
+        sub_dict_db = DictDB.__new__(DictDB)
+        sub_dict_db.__db = None
+        sub_dict_db.__value_type = self.__value_type
+        sub_dict_db.__depth = self.__depth - 1
+        sub_dict_db.__root_db = self.__root_db
+        sub_dict_db.__path = self.__path + [DICT_DB_ID, ContainerUtil.encode_key(key)]
+
+        return sub_dict_db
+
     def remove(self, key: K) -> None:
         self.__remove(key)
 
@@ -191,7 +214,7 @@ class DictDB(object):
         if self.__depth == 1:
             return ContainerUtil.decode_object(self._db.get(ContainerUtil.encode_key(key)), self.__value_type)
         else:
-            return DictDB(key, self._db, self.__value_type, self.__depth - 1)
+            return self.__get_sub_dict_db(key)
 
     def __delitem__(self, key):
         self.__remove(key)
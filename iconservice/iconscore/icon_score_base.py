@@ -440,7 +440,7 @@ class IconScoreBase(IconScoreObject, ContextGetter,
     @staticmethod
     def __on_db_put(context: 'IconScoreContext',
                     key: bytes,
-                    old_value: bytes,
+                    old_value_exists: bool,
                     new_value: bytes):
         """Invoked when `put` is called in `ContextDatabase`.
 
@@ -449,13 +449,13 @@ class IconScoreBase(IconScoreObject, ContextGetter,
 
         :param context: SCORE context
         :param key: key
-        :param old_value: old value
+        :param old_value_exists: True if the key has a value which is not empty
         :param new_value: new value
         """
 
         if context and context.step_counter and \
                 context.type == IconScoreContextType.INVOKE:
-            if old_value:
+            if old_value_exists:
                 # modifying a value
                 context.step_counter.apply_step(
                     StepType.REPLACE, len(new_value))
@@ -18,6 +18,8 @@ import warnings
 import threading
 from typing import TYPE_CHECKING, Optional, List, Tuple
 
+from .governance_params import GovernanceParams, get_service_flag, get_revision, is_icx_send_defective
+from .icon_score_step import StepType
 from .icon_score_trace import Trace
 from .internal_call import InternalCall
 from ..base.address import GOVERNANCE_SCORE_ADDRESS
@@ -35,10 +37,33 @@ if TYPE_CHECKING:
     from ..deploy.icon_score_deploy_engine import IconScoreDeployEngine
     from .icon_score_base import IconScoreBase
     from ..base.address import Address
+    from ..database.db import ContextDatabaseSnapshot
+    from .tx_profile import TransactionProfile
 
 _thread_local_data = threading.local()
 
 
+class _GetStepRecorder(object):
+    """Step counter which records the counts of GET steps
+    and passes all steps to the step counter of a context if any
+    """
+
+    def __init__(self, step_counter: Optional['IconScoreStepCounter']) -> None:
+        self._step_counter = step_counter
+        self._get_counts = []
+
+    @property
+    def get_counts(self) -> tuple:
+        return tuple(self._get_counts)
+
+    def apply_step(self, step_type: 'StepType', count: int) -> int:
+        if step_type == StepType.GET:
+            self._get_counts.append(count)
+        if self._step_counter is None:
+            return 0
+        return self._step_counter.apply_step(step_type, count)
+
+
 class ContextContainer(object):
     """ContextContainer mixin
 
@@ -100,6 +125,8 @@ class IconScoreContext(object):
     icon_score_deploy_engine: 'IconScoreDeployEngine'
     icon_service_flag: int = 0
     legacy_tbears_mode = False
+    snapshot: 'ContextDatabaseSnapshot' = None
+    tx_profile: 'TransactionProfile' = None
 
     def __init__(self,
                  context_type: 'IconScoreContextType' = IconScoreContextType.QUERY,
@@ -134,6 +161,12 @@ class IconScoreContext(object):
         self.step_counter: 'IconScoreStepCounter' = None
         self.event_logs: List['EventLog'] = None
         self.traces: List['Trace'] = None
+        # Committed states which a query context reads
+        self.snapshot: 'ContextDatabaseSnapshot' = None
+        # Governance parameters for invoking a block. None reads governance SCORE every time
+        self.governance_params: Optional['GovernanceParams'] = None
+        # Measures the transaction being invoked if not None
+        self.tx_profile: Optional['TransactionProfile'] = None
 
         self.internal_call = InternalCall(self)
         self.msg_stack = []
@@ -157,6 +190,9 @@ class IconScoreContext(object):
         self.step_counter = None
         self.event_logs = None
         self.traces = None
+        self.snapshot = None
+        self.governance_params = None
+        self.tx_profile = None
         self.func_type = IconScoreFuncType.WRITABLE
 
         self.msg_stack.clear()
@@ -214,12 +250,7 @@ class IconScoreContext(object):
         if not score_address.is_contract:
             raise ServerErrorException(f'Invalid SCORE address: {score_address}')
 
-        # Gets the governance SCORE
-        governance_score: 'Governance' = self.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
-        if governance_score is None:
-            raise ServerErrorException(f'governance_score is None')
-
-        if governance_score.isInScoreBlackList(score_address):
+        if self.is_in_score_blacklist(score_address):
             raise ServerErrorException(f'SCORE in blacklist: {score_address}')
 
     def validate_deployer(self, deployer: 'Address'):
@@ -227,16 +258,71 @@ class IconScoreContext(object):
 
         :param deployer: EOA address to deploy a SCORE
         """
+        if not self.is_deployer(deployer):
+            raise ServerErrorException(f'Invalid deployer: no permission (address: {deployer})')
+
+    def is_in_score_blacklist(self, score_address: 'Address') -> bool:
+        return self._is_in_governance_list('isInScoreBlackList', score_address)
+
+    def is_deployer(self, address: 'Address') -> bool:
+        return self._is_in_governance_list('isDeployer', address)
+
+    def _is_in_governance_list(self, method_name: str, address: 'Address') -> bool:
+        """Checks if an address is in a list managed by governance SCORE
+
+        The result is kept in governance_params until governance SCORE changes its states,
+        together with the GET steps of reading the list. They are charged again
+        on a cache hit, so step_used is the same whether the cache is hit or not.
+
+        :param method_name: the method of governance SCORE to check the list with
+        :param address:
+        """
+        cache: Optional[dict] = None
+        if self.governance_params is not None and self.type != IconScoreContextType.DIRECT:
+            cache = self.governance_params.get_list_cache(method_name)
+            cached: Optional[tuple] = cache.get(address)
+            if cached is not None:
+                is_in_list, get_counts = cached
+                self._apply_get_steps(get_counts)
+                return is_in_list
+
         # Gets the governance SCORE
         governance_score: 'Governance' = self.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
         if governance_score is None:
             raise ServerErrorException(f'governance_score is None')
 
-        if not governance_score.isDeployer(deployer):
-            raise ServerErrorException(f'Invalid deployer: no permission (address: {deployer})')
+        if cache is None:
+            return getattr(governance_score, method_name)(address)
+
+        # The list is read on this context to record its GET steps
+        # even if the context is not pushed as in validate_transaction()
+        step_counter = self.step_counter
+        recorder = _GetStepRecorder(step_counter)
+        self.step_counter = recorder
+        is_pushed = ContextContainer._get_context() is not self
+        if is_pushed:
+            ContextContainer._push_context(self)
+        try:
+            is_in_list: bool = getattr(governance_score, method_name)(address)
+        finally:
+            if is_pushed:
+                ContextContainer._pop_context()
+            self.step_counter = step_counter
+
+        cache[address] = (is_in_list, recorder.get_counts)
+        return is_in_list
+
+    def _apply_get_steps(self, get_counts: tuple) -> None:
+        # Charged as IconScoreBase charges GET steps on reading its db
+        if self.step_counter:
+            for count in get_counts:
+                self.step_counter.apply_step(StepType.GET, count)
 
     def is_service_flag_on(self, flag: 'IconServiceFlag'):
-        service_flag = self._get_service_flag()
+        if self.governance_params is not None:
+            service_flag = self.governance_params.service_flag
+        else:
+            service_flag = self._get_service_flag()
         return self._is_flag_on(service_flag, flag)
 
     @staticmethod
@@ -248,23 +334,27 @@ class IconScoreContext(object):
         if governance_score is None:
             raise ServerErrorException(f'governance_score is None')
 
-        service_config = self.icon_service_flag
-        try:
-            service_config = governance_score.service_config
-        except AttributeError:
-            pass
-        return service_config
+        return get_service_flag(governance_score, self.icon_service_flag)
 
+    # noinspection PyBroadException
     def get_revision(self) -> int:
+        if self.governance_params is not None:
+            return self.governance_params.revision
+
         try:
-            governance_score = self.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
-            if governance_score is not None:
-                if hasattr(governance_score, 'revision_code'):
-                    return governance_score.revision_code
+            return get_revision(self.get_icon_score(GOVERNANCE_SCORE_ADDRESS))
         except:
-            pass
+            return 0
+
+    # noinspection PyBroadException
+    def is_icx_send_defective(self) -> bool:
+        if self.governance_params is not None:
+            return self.governance_params.icx_send_defective
 
-        return 0
+        try:
+            return is_icx_send_defective(self.get_icon_score(GOVERNANCE_SCORE_ADDRESS))
+        except BaseException:
+            return False
 
     def get_tx_hashes_by_score_address(self,
                                        context: 'IconScoreContext',
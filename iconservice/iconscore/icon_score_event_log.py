@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from time import perf_counter
 from typing import TYPE_CHECKING, List, Optional, Any
 
 from .icon_score_step import StepType
@@ -25,6 +26,7 @@ from ..utils import int_to_bytes, byte_length_of_int
 if TYPE_CHECKING:
     from .icon_score_constant import BaseType
     from .icon_score_context import IconScoreContext
+    from .tx_profile import TransactionProfile
 
 
 class EventLog(object):
@@ -83,6 +85,9 @@ class EventLogEmitter(object):
         :param indexed_args_count: count of the indexed arguments
         :return:
         """
+        profile: Optional['TransactionProfile'] = context.tx_profile
+        if profile is not None:
+            start_time = perf_counter()
 
         if context.readonly:
             raise EventLogException(
@@ -112,6 +117,9 @@ class EventLogEmitter(object):
         event = EventLog(score_address, indexed, data)
         context.event_logs.append(event)
 
+        if profile is not None:
+            profile.on_event_log(perf_counter() - start_time)
+
     @staticmethod
     def __get_byte_length(data: 'BaseType') -> int:
         if data is None:
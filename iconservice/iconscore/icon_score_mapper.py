@@ -47,12 +47,17 @@ class IconScoreMapper(object):
     icon_score_loader: 'IconScoreLoader' = None
     deploy_storage: 'IconScoreDeployStorage' = None
 
-    def __init__(self, is_lock: bool = False) -> None:
+    def __init__(self, is_lock: bool = False, parent: Optional['IconScoreMapper'] = None) -> None:
         """Constructor
+
+        :param is_lock:
+        :param parent: the mapper of the uncommitted parent block
+            which is looked up for the scores absent from this one
         """
         self._score_mapper = IconScoreMapperObject()
         self._lock = Lock()
         self._is_lock = is_lock
+        self.parent = parent
 
     def __contains__(self, address: 'Address'):
         if self._is_lock:
@@ -71,9 +76,13 @@ class IconScoreMapper(object):
     def get(self, key):
         if self._is_lock:
             with self._lock:
-                return self._score_mapper.get(key)
+                value = self._score_mapper.get(key)
         else:
-            return self._score_mapper.get(key)
+            value = self._score_mapper.get(key)
+
+        if value is None and self.parent is not None:
+            value = self.parent.get(key)
+        return value
 
     def update(self, mapper: 'IconScoreMapper'):
         if self._is_lock:
@@ -80,6 +80,8 @@ class TransactionResult(object):
 
         # Traces are managed in TransactionResult but not passed to chain engine
         self.traces = None
+        # The time taken by each phase of the transaction. Not passed to chain engine either
+        self.profile = None
 
     def __str__(self) -> str:
         return '\n'.join([f'{k}: {v}' for k, v in self.__dict__.items()])
@@ -107,8 +109,8 @@ class TransactionResult(object):
                         'code': value.code,
                         'message': value.message
                     }
-            elif key == 'traces':
-                # traces are excluded from dict property
+            elif key in ('traces', 'profile'):
+                # traces and profile are excluded from dict property
                 continue
             else:
                 new_dict[new_key] = value
@@ -16,7 +16,7 @@
 
 from typing import TYPE_CHECKING
 
-from ..base.address import Address, GOVERNANCE_SCORE_ADDRESS
+from ..base.address import Address
 
 if TYPE_CHECKING:
     from .icon_score_context import IconScoreContext
@@ -59,15 +59,5 @@ class Icx(object):
     def get_balance(self, address: 'Address') -> int:
         return self._context.internal_call.get_icx_balance(address)
 
-    # noinspection PyBroadException
     def _is_icx_send_defective(self) -> bool:
-        try:
-            governance_score = self._context.get_icon_score(GOVERNANCE_SCORE_ADDRESS)
-            if governance_score is not None:
-                if hasattr(governance_score, 'getVersion'):
-                    version = governance_score.getVersion()
-                    return version == '0.0.2'
-        except BaseException:
-            pass
-
-        return False
+        return self._context.is_icx_send_defective()
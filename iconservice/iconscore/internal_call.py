@@ -66,6 +66,8 @@ class InternalCall(object):
               amount: int) -> Any:
 
         self.__context.enter_call()
+        if self.__context.tx_profile is not None:
+            self.__context.tx_profile.on_internal_call()
 
         try:
             self._make_trace(addr_from, addr_to, func_name, arg_params, kw_params, amount)
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from time import perf_counter
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from .icon_score_result import TransactionResult
+
+
+class TxPhase(object):
+    """Phases of running a transaction in order
+    """
+    # Setting up the context
+    PREPARE = 'prepare'
+    # Checking if from account can pay the value and the fee
+    BALANCE_CHECK = 'balanceCheck'
+    # Counting the steps of the input
+    INPUT = 'input'
+    TRANSFER = 'transfer'
+    SCORE_CALL = 'scoreCall'
+    FEE = 'fee'
+    BLOOM = 'bloom'
+
+
+class TransactionProfile(object):
+    """The time taken by each phase of a transaction and the number of its operations
+
+    A phase lasts until the next one is entered, so the time of handling an exception
+    is included in the phase which it is raised in.
+    DB reads and writes, event logs and internal calls happen in the phases,
+    so their time is a part of the phase time as well.
+    Times are in seconds.
+    """
+
+    def __init__(self) -> None:
+        # The profile starts in PREPARE
+        self._phase: Optional[str] = TxPhase.PREPARE
+        self._phase_start: float = perf_counter()
+
+        self.phases = {}
+        self.db_reads = 0
+        self.db_read_time = 0.0
+        self.db_writes = 0
+        self.db_write_time = 0.0
+        self.event_logs = 0
+        self.event_log_time = 0.0
+        self.internal_calls = 0
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def enter(self, phase: str) -> None:
+        """Closes the current phase and starts a given one
+
+        :param phase: one of TxPhase
+        """
+        now = perf_counter()
+        self._close(now)
+        self._phase = phase
+        self._phase_start = now
+
+    def pause(self) -> None:
+        """Closes the current phase without starting another one
+
+        The time until the next phase is entered is not counted.
+        """
+        self._close(perf_counter())
+        self._phase = None
+
+    def _close(self, now: float) -> None:
+        phase = self._phase
+        if phase is not None:
+            self.phases[phase] = self.phases.get(phase, 0.0) + now - self._phase_start
+
+    def on_db_read(self, count: int, elapsed: float) -> None:
+        self.db_reads += count
+        self.db_read_time += elapsed
+
+    def on_db_write(self, elapsed: float) -> None:
+        self.db_writes += 1
+        self.db_write_time += elapsed
+
+    def on_event_log(self, elapsed: float) -> None:
+        self.event_logs += 1
+        self.event_log_time += elapsed
+
+    def on_internal_call(self) -> None:
+        self.internal_calls += 1
+
+    def to_dict(self) -> dict:
+        return {
+            'total': self.total,
+            'phases': dict(self.phases),
+            'dbReads': {'count': self.db_reads, 'time': self.db_read_time},
+            'dbWrites': {'count': self.db_writes, 'time': self.db_write_time},
+            'eventLogs': {'count': self.event_logs, 'time': self.event_log_time},
+            'internalCalls': self.internal_calls
+        }
+
+
+def get_slowest_transactions(tx_results: List['TransactionResult'], count: int) -> List[dict]:
+    """Returns the profiles of the slowest transactions in a block
+
+    :param tx_results: the results of the transactions in a block
+    :param count: the max number of transactions to return
+    :return: the profiles with txHash and txIndex, the slowest first
+    """
+    profiled = [tx_result for tx_result in tx_results if tx_result.profile is not None]
+    profiled.sort(key=lambda tx_result: tx_result.profile.total, reverse=True)
+
+    slowest = []
+    for tx_result in profiled[:count]:
+        profile = tx_result.profile.to_dict()
+        profile['txHash'] = f'0x{tx_result.tx_hash.hex()}'
+        profile['txIndex'] = tx_result.tx_index
+        slowest.append(profile)
+
+    return slowest
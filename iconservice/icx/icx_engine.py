@@ -67,6 +67,10 @@ class IcxEngine(object):
     def storage(self) -> 'IcxStorage':
         return self._storage
 
+    @property
+    def fee_treasury_address(self) -> 'Address':
+        return self._fee_treasury_address
+
     def close(self) -> None:
         """Close resources
         """
@@ -256,8 +260,8 @@ class IcxEngine(object):
         """
         if from_ != to and amount > 0:
             # get account info from state db.
-            from_account = self._storage.get_account(context, from_)
-            to_account = self._storage.get_account(context, to)
+            from_account, to_account = \
+                self._storage.get_accounts(context, [from_, to])
 
             from_account.withdraw(amount)
             to_account.deposit(amount)
@@ -14,7 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, List
 
 from .icx_account import Account
 from ..base.address import Address
@@ -22,7 +22,8 @@ from ..base.block import Block
 from ..icon_constant import DEFAULT_BYTE_SIZE, DATA_BYTE_ORDER
 
 if TYPE_CHECKING:
-    from ..database.db import ContextDatabase
+    from ..database.batch import BlockBatch
+    from ..database.db import ContextDatabase, ContextDatabaseSnapshot
     from ..iconscore.icon_score_context import IconScoreContext
 
 
@@ -59,10 +60,38 @@ class IcxStorage(object):
 
         self._last_block = Block.from_bytes(block_bytes)
 
+    def get_block_info(self, snapshot: 'ContextDatabaseSnapshot') -> Optional['Block']:
+        """Returns the last block committed before a given snapshot is taken
+
+        Unlike load_last_block_info, it doesn't change the last_block property
+
+        :param snapshot: the snapshot of the state db
+        """
+        block_bytes = snapshot.get(self._LAST_BLOCK_KEY)
+        if block_bytes is None:
+            return None
+
+        return Block.from_bytes(block_bytes)
+
     def put_block_info(self, context: 'IconScoreContext', block: 'Block') -> None:
         self._db.put(context, self._LAST_BLOCK_KEY, bytes(block))
         self._last_block = block
 
+    def write_block_batch(self, context: 'IconScoreContext', block_batch: 'BlockBatch') -> None:
+        """Writes the states of a block and the block info at once
+
+        Snapshots taken by queries always see the block info
+        matched with the states
+
+        :param context:
+        :param block_batch: the states changed by block_batch.block
+        """
+        states = dict(block_batch)
+        states[self._LAST_BLOCK_KEY] = bytes(block_batch.block)
+
+        self._db.write_batch(context, states, block_batch.block.height)
+        self._last_block = block_batch.block
+
     def get_text(self, context: 'IconScoreContext', name: str) -> Optional[str]:
         """Return text format value from db
 
@@ -114,6 +143,31 @@ class IcxStorage(object):
         account.address = address
         return account
 
+    def get_accounts(self,
+                     context: 'IconScoreContext',
+                     addresses: List['Address']) -> List['Account']:
+        """Returns the accounts indicated by addresses at once
+
+        :param context:
+        :param addresses: account addresses
+        :return: (list) accounts in the same order as addresses
+            If an account is not present, create a new account.
+        """
+        keys = [address.to_bytes() for address in addresses]
+        values = self._db.get_many(context, keys)
+
+        accounts = []
+        for address, value in zip(addresses, values):
+            if value:
+                account = Account.from_bytes(value)
+            else:
+                account = Account()
+
+            account.address = address
+            accounts.append(account)
+
+        return accounts
+
     def put_account(self,
                     context: 'IconScoreContext',
                     address: 'Address',
@@ -15,28 +15,34 @@
 # limitations under the License.
 
 from threading import Lock
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, List
 
 from .base.block import Block
 from .base.exception import ServerErrorException
 from .database.batch import BlockBatch
 from .iconscore.icon_score_mapper import IconScoreMapper
 
+if TYPE_CHECKING:
+    from .iconscore.governance_params import GovernanceParams
+
 
 class PrecommitData(object):
     def __init__(self,
                  block_batch: 'BlockBatch',
                  block_result: list,
-                 score_mapper: Optional['IconScoreMapper']=None):
+                 score_mapper: Optional['IconScoreMapper']=None,
+                 governance_params: Optional['GovernanceParams']=None):
         """
 
         :param block_batch: changed states for a block
         :param block_result: tx_results made from transactions in a block
         :param score_mapper: newly deployed scores in a block
+        :param governance_params: governance parameters at the end of a block
         """
         self.block_batch = block_batch
         self.block_result = block_result
         self.score_mapper = score_mapper
+        self.governance_params = governance_params
         self.block = block_batch.block
         self.state_root_hash: bytes = self.block_batch.digest()
 
@@ -78,13 +84,44 @@ class PrecommitDataManager(object):
         with self._lock:
             self._last_block = block
 
-        # Clear remaining precommit data which have the same block height
-        self._precommit_data_mapper.clear()
+        # Keep the precommit data of the blocks invoked on top of the committed block
+        # and clear the others, such as the ones which have the same block height
+        descendants = self._get_descendants(block.hash)
+        for precommit_data in descendants:
+            if precommit_data.block.prev_hash == block.hash:
+                # The states of the parent are in StateDB now
+                precommit_data.block_batch.parent = None
+                if precommit_data.score_mapper is not None:
+                    precommit_data.score_mapper.parent = None
+
+        self._precommit_data_mapper = {
+            precommit_data.block.hash: precommit_data for precommit_data in descendants}
 
     def rollback(self, block: 'Block'):
+        """Removes the precommit data of a block and the blocks invoked on top of it
+        """
         if block.hash in self._precommit_data_mapper:
             del self._precommit_data_mapper[block.hash]
 
+        for precommit_data in self._get_descendants(block.hash):
+            del self._precommit_data_mapper[precommit_data.block.hash]
+
+    def _get_descendants(self, block_hash: bytes) -> List['PrecommitData']:
+        """Returns the precommit data of the blocks descending from a block
+        in the order of block height
+        """
+        descendants = []
+        hashes = {block_hash}
+
+        precommit_data_list = sorted(
+            self._precommit_data_mapper.values(), key=lambda x: x.block.height)
+        for precommit_data in precommit_data_list:
+            if precommit_data.block.prev_hash in hashes:
+                hashes.add(precommit_data.block.hash)
+                descendants.append(precommit_data)
+
+        return descendants
+
     def empty(self) -> bool:
         return len(self._precommit_data_mapper) == 0
 
@@ -95,17 +132,25 @@ class PrecommitDataManager(object):
         """
         self._precommit_data_mapper.clear()
 
-    def validate_block_to_invoke(self, block: 'Block'):
+    def validate_block_to_invoke(self, block: 'Block') -> Optional['PrecommitData']:
         """Check if the block to invoke is valid before invoking it
 
+        A block can be invoked on top of the last committed block
+        or a block which has been invoked but not committed yet.
+
         :param block: block to invoke
+        :return: the precommit data of the parent block if it is not committed yet
         """
+        parent = self._precommit_data_mapper.get(block.prev_hash)
+        if parent is not None and block.height == parent.block.height + 1:
+            return parent
+
         if self._last_block is None:
-            return
+            return None
 
         if block.prev_hash == self._last_block.hash and \
                 block.height == self._last_block.height + 1:
-            return
+            return None
 
         raise ServerErrorException(
             f'Failed to invoke a block: '
@@ -113,8 +158,10 @@ class PrecommitDataManager(object):
             f'block_to_invoke({block})')
 
     def validate_precommit_block(self, precommit_block: 'Block'):
-        """Check block validation
-        before write_precommit_state() or remove_precommit_state()
+        """Check block validation before write_precommit_state()
+
+        The parent of the block should have been committed,
+        so the blocks invoked on top of uncommitted ones are committed in order.
 
         :param precommit_block:
         """
@@ -134,3 +181,16 @@ class PrecommitDataManager(object):
                 self._last_block.height + 1 != precommit_block.height:
             raise ServerErrorException(
                 f'Invalid precommit block: last_block({self._last_block}) precommit_block({precommit_block})')
+
+    def validate_block_to_rollback(self, block: 'Block'):
+        """Check block validation before remove_precommit_state()
+
+        Every precommit data descends from the last committed block,
+        so any of them can be removed with its descendants.
+
+        :param block:
+        """
+        assert isinstance(block, Block)
+
+        if block.hash not in self._precommit_data_mapper:
+            raise ServerErrorException(f'No precommit data: block({block})')
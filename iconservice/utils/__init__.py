@@ -37,20 +37,111 @@ def byte_length_of_int(n: int):
     return (n.bit_length() + 8) // 8
 
 
+_LOWERCASE_HEX_PATTERN = re.compile('[0-9a-f]+')
+
+# The key of DataSize cached in the params of a transaction
+DATA_SIZE_KEY = '_dataSize'
+
+
 def is_lowercase_hex_string(value: str) -> bool:
     """Check whether value is hexadecimal format or not
 
     :param value: text
     :return: True(lowercase hexadecimal) otherwise False
     """
+    return isinstance(value, str) and _LOWERCASE_HEX_PATTERN.fullmatch(value) is not None
+
+
+class DataSize(object):
+    """The sizes of the data field of a transaction
+    """
+
+    def __init__(self, length: int = 0, byte_length: int = 0, content_byte_length: int = 0) -> None:
+        """Constructor
+
+        :param length: the number of characters of keys and string values, limited by MAX_DATA_SIZE
+        :param byte_length: the number of bytes of values charged as INPUT step
+        :param content_byte_length: byte_length of data['content'] charged as CONTRACT_SET step
+        """
+        self.length = length
+        self.byte_length = byte_length
+        self.content_byte_length = content_byte_length
+
+
+def measure_data(data: Any) -> 'DataSize':
+    """Measures the sizes of the data field in a pass
+
+    A lowercase hexadecimal string with or without '0x' prefix is counted as bytes,
+    the other strings as utf-8 bytes and ints as signed big endian bytes.
+
+    :param data: the data field which has not been converted
+    :return: DataSize
+    """
+    if not isinstance(data, dict):
+        length, byte_length = _measure(data)
+        return DataSize(length, byte_length)
+
+    data_size = DataSize()
+    for key, value in data.items():
+        length, byte_length = _measure(value)
+        data_size.length += len(key) + length
+        data_size.byte_length += byte_length
+        if key == 'content':
+            data_size.content_byte_length = byte_length
 
-    try:
-        result = re.match('[0-9a-f]+', value)
-        return len(result.group(0)) == len(value)
-    except:
-        pass
+    return data_size
+
+
+def _measure(data: Any) -> tuple:
+    """Returns the character length and the byte length of data
+    """
+    if not data:
+        return 0, 0
+
+    if isinstance(data, dict):
+        length = byte_length = 0
+        for key, value in data.items():
+            value_length, value_byte_length = _measure(value)
+            length += len(key) + value_length
+            byte_length += value_byte_length
+        return length, byte_length
+
+    if isinstance(data, list):
+        length = byte_length = 0
+        for value in data:
+            value_length, value_byte_length = _measure(value)
+            length += value_length
+            byte_length += value_byte_length
+        return length, byte_length
+
+    if isinstance(data, str):
+        body = data[2:] if data.startswith('0x') else data
+        if is_lowercase_hex_string(body):
+            return len(data), (len(body) + 1) // 2
+        return len(data), len(data.encode('utf-8'))
+
+    if isinstance(data, int):
+        # int and bool
+        return 0, byte_length_of_int(data)
+
+    return 0, 0
+
+
+def get_data_size(params: dict) -> 'DataSize':
+    """Returns the sizes of params['data'], measuring them only at the first call
+
+    The result is cached in params, so the pre-validator and each step
+    of a transaction share the same pass over a large data field like SCORE content.
+
+    :param params: the params of icx_sendTransaction which have been converted
+    :return: DataSize
+    """
+    data_size = params.get(DATA_SIZE_KEY)
+    if data_size is None:
+        data_size = measure_data(params.get('data'))
+        params[DATA_SIZE_KEY] = data_size
 
-    return False
+    return data_size
 
 
 def sha3_256(data: bytes) -> bytes:
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from threading import Lock
+from typing import Any, Optional
+
+from iconcommons.logger import Logger
+
+_ELLIPSIS = '...'
+
+
+def format_bounded(value: Any, max_length: int) -> str:
+    """Formats a value like str() but stops at max_length characters
+
+    Nested dicts and lists are formatted only as far as needed,
+    so a large value costs no more than a small one.
+
+    :param value: value to format
+    :param max_length: the max length of the result without the trailing ellipsis
+    :return: formatted value, ending with '...' if truncated
+    """
+    parts = []
+    remaining = _format_into(value, parts, max_length)
+    text = ''.join(parts)
+    if remaining < 0:
+        return text[:max_length] + _ELLIPSIS
+    return text
+
+
+def _format_into(value: Any, parts: list, remaining: int) -> int:
+    """Appends the text of a value to parts until remaining becomes negative
+
+    :return: the number of characters which can be appended still
+    """
+    if isinstance(value, dict):
+        remaining = _append('{', parts, remaining)
+        for i, (k, v) in enumerate(value.items()):
+            if remaining < 0:
+                return remaining
+            if i > 0:
+                remaining = _append(', ', parts, remaining)
+            remaining = _format_into(k, parts, remaining)
+            remaining = _append(': ', parts, remaining)
+            remaining = _format_into(v, parts, remaining)
+        return _append('}', parts, remaining)
+
+    if isinstance(value, (list, tuple)):
+        remaining = _append('[', parts, remaining)
+        for i, v in enumerate(value):
+            if remaining < 0:
+                return remaining
+            if i > 0:
+                remaining = _append(', ', parts, remaining)
+            remaining = _format_into(v, parts, remaining)
+        return _append(']', parts, remaining)
+
+    if isinstance(value, str):
+        # Long strings like SCORE contents are cut before being quoted
+        return _append(repr(value[:remaining + 1]), parts, remaining)
+
+    return _append(repr(value), parts, remaining)
+
+
+def _append(text: str, parts: list, remaining: int) -> int:
+    if remaining >= 0:
+        parts.append(text)
+    return remaining - len(text)
+
+
+class _LazyMessage(object):
+    """A log message formatted only when it is written
+    """
+
+    def __init__(self, header: str, value: Any, max_field_length: int) -> None:
+        self._header = header
+        self._value = value
+        self._max_field_length = max_field_length
+
+    def __str__(self) -> str:
+        value = self._value
+        if not isinstance(value, dict):
+            return f'{self._header} {format_bounded(value, self._max_field_length)}'
+
+        fields = ', '.join(f'{key}={format_bounded(field, self._max_field_length)}'
+                           for key, field in value.items())
+        return f'{self._header} {fields}'
+
+
+class RequestLogger(object):
+    """Logs the requests and responses of IconScoreInnerTask
+
+    Messages are formatted only if they are written, and each field of them
+    is cut at max_field_length.
+    The calls of each method are logged at its sampling rate: 1.0 logs all of them
+    and 0.1 logs every 10th call. Sampling is done by counting calls,
+    so the request and the response of a call are logged together.
+    Failed requests are counted by method and error code
+    to be logged at once with flush_failures().
+    """
+
+    def __init__(self,
+                 tag: str,
+                 sampling_rates: Optional[dict] = None,
+                 max_field_length: int = 1024) -> None:
+        """Constructor
+
+        :param tag: log tag
+        :param sampling_rates: method: rate from 0.0 to 1.0. The others are 1.0
+        :param max_field_length: the max length of each field in a message
+        """
+        self._tag = tag
+        self._sampling_rates = sampling_rates or {}
+        self._max_field_length = max_field_length
+
+        self._lock = Lock()
+        # (method, 'request' or 'response'): the number of calls
+        self._calls = {}
+        # method: {code: count}
+        self._failures = {}
+
+    def _is_sampled(self, method: str, kind: str) -> bool:
+        rate = self._sampling_rates.get(method, 1.0)
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+
+        key = (method, kind)
+        with self._lock:
+            count = self._calls.get(key, 0) + 1
+            self._calls[key] = count
+
+        # True whenever count * rate passes an integer
+        return int(count * rate) != int((count - 1) * rate)
+
+    def log_request(self, method: str, request: Any) -> None:
+        if self._is_sampled(method, 'request'):
+            Logger.info(_LazyMessage(f'{method} request', request, self._max_field_length),
+                        self._tag)
+
+    def log_response(self, method: str, response: Any) -> None:
+        if self._is_sampled(method, 'response'):
+            Logger.info(_LazyMessage(f'{method} response', response, self._max_field_length),
+                        self._tag)
+
+    def count_failure(self, method: str, code: Any) -> None:
+        """Counts a failed request instead of logging it
+
+        :param method: the method of the request
+        :param code: error code
+        """
+        with self._lock:
+            failures = self._failures.setdefault(method, {})
+            failures[code] = failures.get(code, 0) + 1
+
+    def get_failures(self) -> dict:
+        with self._lock:
+            return {method: dict(failures) for method, failures in self._failures.items()}
+
+    def flush_failures(self) -> None:
+        """Logs the failures counted so far in a line and resets them
+        """
+        with self._lock:
+            failures = self._failures
+            self._failures = {}
+
+        if failures:
+            Logger.info(f'failed requests: {failures}', self._tag)
@@ -86,6 +86,12 @@ class TestAddress(unittest.TestCase):
         addr2 = Address.from_bytes(buf)
         self.assertEqual(addr1, addr2)
 
+    def test_to_bytes_cached(self):
+        addr = create_address(prefix=1)
+        buf = addr.to_bytes()
+        self.assertEqual(b'\x01' + addr.body, buf)
+        self.assertIs(buf, addr.to_bytes())
+
     def test_address_from_to_string_EOA(self):
         addr1 = create_address()
         buf = str(addr1)
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import Backend, KeyValueStore, MemoryDB
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.factory import ContextDatabaseFactory
+
+
+class TestMemoryDB(unittest.TestCase):
+    def setUp(self):
+        self.db = MemoryDB()
+
+    def test_get_put_delete(self):
+        db = self.db
+
+        self.assertIsNone(db.get(b'key0'))
+        db.put(b'key0', b'value0')
+        self.assertEqual(b'value0', db.get(b'key0'))
+
+        db.delete(b'key0')
+        self.assertIsNone(db.get(b'key0'))
+        # Deleting an absent key is allowed
+        db.delete(b'key0')
+
+        with self.assertRaises(TypeError):
+            db.put(b'key1', None)
+
+    def test_write_batch(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+
+        with db.write_batch() as wb:
+            wb.put(b'key1', b'value1')
+            wb.delete(b'key0')
+            # Not written until leaving the context
+            self.assertIsNone(db.get(b'key1'))
+
+        self.assertIsNone(db.get(b'key0'))
+        self.assertEqual(b'value1', db.get(b'key1'))
+
+    def test_iterator(self):
+        db = self.db
+        for key in [b'c', b'a', b'd', b'b']:
+            db.put(key, key.upper())
+
+        self.assertEqual([b'a', b'b', b'c', b'd'], [k for k, _ in db.iterator()])
+        self.assertEqual([(b'b', b'B'), (b'c', b'C')],
+                         list(db.iterator(start=b'b', stop=b'd')))
+        self.assertEqual([b'c', b'b', b'a'],
+                         [k for k, _ in db.iterator(stop=b'd', reverse=True)])
+
+    def test_prefixed_db(self):
+        db = self.db
+        db.put(b'a|0', b'a0')
+        db.put(b'b|0', b'b0')
+
+        sub_db = db.prefixed_db(b'b|')
+        self.assertIsNone(sub_db.get(b'a|0'))
+        self.assertEqual(b'b0', sub_db.get(b'0'))
+
+        sub_db.put(b'1', b'b1')
+        self.assertEqual(b'b1', db.get(b'b|1'))
+        self.assertEqual([(b'0', b'b0'), (b'1', b'b1')], list(sub_db.iterator()))
+
+    def test_snapshot(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+
+        snapshot = db.snapshot()
+        db.put(b'key0', b'value1')
+        db.put(b'key1', b'value1')
+
+        self.assertEqual(b'value0', snapshot.get(b'key0'))
+        self.assertIsNone(snapshot.get(b'key1'))
+        self.assertEqual([(b'key0', b'value0')], list(snapshot.iterator()))
+
+    def test_snapshot_copy_on_write(self):
+        db = self.db
+        db.put(b'key0', b'value0')
+
+        snapshot0 = db.snapshot()
+        snapshot1 = db.snapshot()
+        db.delete(b'key0')
+        snapshot2 = db.snapshot()
+        db.put(b'key1', b'value1')
+
+        self.assertEqual(b'value0', snapshot0.get(b'key0'))
+        self.assertEqual(b'value0', snapshot1.get(b'key0'))
+        self.assertIsNone(snapshot2.get(b'key0'))
+        self.assertIsNone(snapshot2.get(b'key1'))
+        self.assertEqual([(b'key1', b'value1')], list(db.iterator()))
+
+    def test_close(self):
+        db = self.db
+        db.close()
+
+        with self.assertRaises(DatabaseException):
+            db.get(b'key0')
+
+    def test_key_value_store(self):
+        self.assertIsInstance(self.db, KeyValueStore)
+
+        key_value_db = KeyValueDatabase(self.db)
+        key_value_db.write_batch({b'key0': b'value0', b'key1': None})
+        self.assertEqual(b'value0', key_value_db.get(b'key0'))
+        self.assertEqual([b'value0', None], key_value_db.get_many([b'key0', b'key1']))
+
+
+class TestContextDatabaseFactoryOnMemory(unittest.TestCase):
+    def setUp(self):
+        ContextDatabaseFactory.open(
+            'unused', ContextDatabaseFactory.Mode.MULTIPLE_DB, backend=Backend.MEMORY)
+
+    def tearDown(self):
+        ContextDatabaseFactory.close()
+
+    def test_create_by_name(self):
+        context_db = ContextDatabaseFactory.create_by_name('db0')
+        context_db.put(None, b'key0', b'value0')
+        context_db.close(None)
+
+        # States are kept until the factory is closed
+        context_db = ContextDatabaseFactory.create_by_name('db0')
+        self.assertEqual(b'value0', context_db.get(None, b'key0'))
+        # Opened dbs are cached by name
+        self.assertIs(context_db, ContextDatabaseFactory.create_by_name('db0'))
+
+        context_db = ContextDatabaseFactory.create_by_name('db1')
+        self.assertIsNone(context_db.get(None, b'key0'))
@@ -18,10 +18,27 @@
 import unittest
 
 from iconservice.base.block import Block
-from iconservice.database.batch import BlockBatch, TransactionBatch
+from iconservice.database.batch import BlockBatch, TransactionBatch, SpeculativeBlockBatch
 from iconservice.utils import sha3_256
 from tests import create_hash_256
 
+# (states in order, state root hash) pinned to keep the digest algorithm unchanged
+DIGEST_CORPUS = [
+    ([], 'a7ffc6f8bf1ed76651c14756a061d662f580ff4de43b49fa82d80a4b80f8434a'),
+    ([(b'key0', None)], '5f7d011447048232ba8a361f59bddbf3880e7b8edf12ac0f027878268f07b191'),
+    ([(b'key0', b'')], '9f7dcc7d501191e8314f7d1c15e5443cc24296fd893483b9ce21e7623394ef4b'),
+    ([(b'key0', b'value0')], '02f122f15ca8869baf4287b2371463c1ef1e57dc933afaafb101ee1cf83e9f98'),
+    ([(b'key0', b'value0'), (b'key1', None), (b'key2', b'value2')],
+     '618556cb5b9439487de73d7bcf9b6fee8325f69ec199ea27f8244bb15a110b3e'),
+    ([(b'key0', b'value0'), (b'key1', b''), (b'key2', b'value2')],
+     '06b93822c631d22f66e443a2af25fdb757afda818f884d5418d2b74647644347'),
+    ([(b'key0', None), (b'key1', None)], 'fbedaed848a8b55b219844b079569d96aac17b994d27b0ccce14177399dcac80'),
+    ([(b'', b'value0'), (b'key1', b'|')], '02f9bd2ed61c0c003946c0db2f2e2eca1b0ec144d47cf995e4e2e95a399a1e28'),
+    ([(b'key|0', b'value|0'), (b'key1', b'value1')],
+     '53465629e577221a8c4c6c598e914db7bab133c483d78ecd6804c879382bb414'),
+    ([(bytes(range(32)), bytes(range(256)))], 'bef3e914c45d3f1f726be7ec61fe7c19f3d2589b8be27907f6f63fe39aecc9c5'),
+]
+
 
 class TestBatch(unittest.TestCase):
     def setUp(self):
@@ -122,3 +139,32 @@ class TestBatch(unittest.TestCase):
         block_batch[key2] = b''
         hash2 = block_batch.digest()
         self.assertNotEqual(hash1, hash2)
+
+    def test_digest_corpus(self):
+        for items, expected in DIGEST_CORPUS:
+            block_batch = BlockBatch()
+            for key, value in items:
+                block_batch[key] = value
+
+            self.assertEqual(expected, block_batch.digest().hex(), items)
+
+            tx_batch = TransactionBatch()
+            tx_batch.update(items)
+            self.assertEqual(expected, tx_batch.digest().hex(), items)
+
+    def test_speculative_block_batch(self):
+        self.block_batch[b'key0'] = b'value0'
+        view = SpeculativeBlockBatch(self.block_batch)
+        self.assertEqual(self.block_batch.block, view.block)
+
+        self.assertEqual(b'value0', view[b'key0'])
+        # Keys absent from BlockBatch are also read from the states before it
+        self.assertNotIn(b'key1', view)
+        view.add_read_range(b'range0', b'range1')
+
+        self.assertFalse(view.has_read({b'key2', b'range1'}))
+        self.assertTrue(view.has_read({b'key1'}))
+        self.assertTrue(view.has_read({b'range0|key'}))
+
+        view.add_read_range(b'tail', None)
+        self.assertTrue(view.has_read({b'zzz'}))
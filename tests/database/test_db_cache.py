@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+from unittest.mock import Mock
+
+from iconservice.database.batch import BlockBatch, TransactionBatch
+from iconservice.database.cache import LRUCache, ENTRY_OVERHEAD_SIZE
+from iconservice.database.db import ContextDatabase
+from iconservice.iconscore.icon_score_context import IconScoreContextFactory
+from iconservice.iconscore.icon_score_context import IconScoreContextType
+from tests.mock_db import MockKeyValueDatabase
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = LRUCache(1024)
+
+        hit, value = cache.get(b'key0')
+        self.assertFalse(hit)
+        self.assertIsNone(value)
+
+        cache.put(b'key0', b'value0', cache.generation)
+        cache.put(b'key1', None, cache.generation)
+
+        self.assertEqual((True, b'value0'), cache.get(b'key0'))
+        # negative lookup
+        self.assertEqual((True, None), cache.get(b'key1'))
+
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_evict(self):
+        entry_size = ENTRY_OVERHEAD_SIZE + len(b'key0') + len(b'value0')
+        cache = LRUCache(entry_size * 2)
+
+        cache.put(b'key0', b'value0', cache.generation)
+        cache.put(b'key1', b'value1', cache.generation)
+        # key0 becomes the most recently used one
+        cache.get(b'key0')
+        cache.put(b'key2', b'value2', cache.generation)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(entry_size * 2, cache.size)
+        self.assertFalse(cache.get(b'key1')[0])
+        self.assertTrue(cache.get(b'key0')[0])
+        self.assertTrue(cache.get(b'key2')[0])
+
+    def test_update(self):
+        cache = LRUCache(1024)
+        cache.put(b'key0', b'value0', cache.generation)
+        cache.put(b'key1', None, cache.generation)
+
+        cache.update({b'key0': None, b'key1': b'value1', b'key2': b'value2'})
+
+        self.assertEqual((True, None), cache.get(b'key0'))
+        self.assertEqual((True, b'value1'), cache.get(b'key1'))
+        # Keys not cached are not added on update
+        self.assertFalse(cache.get(b'key2')[0])
+
+        cache.update({b'key2': b'value2', b'key3': None}, insert=True)
+        self.assertEqual((True, b'value2'), cache.get(b'key2'))
+        self.assertEqual((True, None), cache.get(b'key3'))
+
+    def test_put_with_old_generation(self):
+        cache = LRUCache(1024)
+
+        generation = cache.generation
+        cache.update({b'key0': b'value1'})
+        # A value read before committing can be stale
+        cache.put(b'key0', b'value0', generation)
+
+        self.assertFalse(cache.get(b'key0')[0])
+
+
+class TestContextDatabaseWithCache(unittest.TestCase):
+    def setUp(self):
+        self.key_value_db = MockKeyValueDatabase.create_db()
+        self.key_value_db.put(b'key0', b'value0')
+
+        self.cache = LRUCache(1024)
+        self.context_db = ContextDatabase(self.key_value_db, cache=self.cache)
+
+        context_factory = IconScoreContextFactory(max_size=1)
+        context = context_factory.create(IconScoreContextType.INVOKE)
+        context.block_batch = BlockBatch()
+        context.tx_batch = TransactionBatch()
+        self.context = context
+
+    def test_get(self):
+        context_db = self.context_db
+        self.key_value_db.get = Mock(side_effect=self.key_value_db.get)
+
+        for _ in range(3):
+            self.assertEqual(b'value0', context_db.get(self.context, b'key0'))
+            self.assertIsNone(context_db.get(None, b'key1'))
+
+        self.assertEqual(2, self.key_value_db.get.call_count)
+        self.assertEqual(4, self.cache.hits)
+        self.assertEqual(2, self.cache.misses)
+
+    def test_write_batch(self):
+        context_db = self.context_db
+        context = self.context
+
+        self.assertEqual(b'value0', context_db.get(context, b'key0'))
+        self.assertIsNone(context_db.get(context, b'key1'))
+
+        context.block_batch[b'key0'] = None
+        context.block_batch[b'key1'] = b'value1'
+        context_db.write_batch(context, context.block_batch)
+        context.block_batch.clear()
+
+        self.assertIsNone(context_db.get(context, b'key0'))
+        self.assertEqual(b'value1', context_db.get(context, b'key1'))
+
+    def test_put_and_delete_on_direct_context(self):
+        context_db = self.context_db
+
+        self.assertEqual(b'value0', context_db.get(None, b'key0'))
+
+        context_db.put(None, b'key0', b'value1')
+        self.assertEqual(b'value1', context_db.get(None, b'key0'))
+
+        context_db.delete(None, b'key0')
+        self.assertIsNone(context_db.get(None, b'key0'))
+        self.assertIsNone(self.key_value_db.get(b'key0'))
+
+
+class TestContextDatabaseWithPresenceCache(unittest.TestCase):
+    def setUp(self):
+        self.key_value_db = MockKeyValueDatabase.create_db()
+        self.key_value_db.put(b'key0', b'value0')
+
+        self.presence_cache = LRUCache(1024)
+        self.context_db = ContextDatabase(self.key_value_db, presence_cache=self.presence_cache)
+
+        context_factory = IconScoreContextFactory(max_size=1)
+        context = context_factory.create(IconScoreContextType.INVOKE)
+        context.block_batch = BlockBatch()
+        context.tx_batch = TransactionBatch()
+        self.context = context
+
+    def test_exists(self):
+        context_db = self.context_db
+        context = self.context
+        self.key_value_db.get = Mock(side_effect=self.key_value_db.get)
+
+        for _ in range(3):
+            self.assertTrue(context_db.exists(context, b'key0'))
+            self.assertFalse(context_db.exists(context, b'key1'))
+        self.assertEqual(2, self.key_value_db.get.call_count)
+
+        context.tx_batch[b'key0'] = None
+        context.block_batch[b'key1'] = b'value1'
+        self.assertFalse(context_db.exists(context, b'key0'))
+        self.assertTrue(context_db.exists(context, b'key1'))
+
+        context_db.write_batch(context, {b'key0': None, b'key1': b'value1'})
+        context.tx_batch.clear()
+        context.block_batch.clear()
+        self.assertFalse(context_db.exists(context, b'key0'))
+        self.assertTrue(context_db.exists(context, b'key1'))
+        self.assertEqual(2, self.key_value_db.get.call_count)
+
+    def test_exists_after_commit(self):
+        context_db = self.context_db
+        context = self.context
+        self.key_value_db.get = Mock(side_effect=self.key_value_db.get)
+
+        # Committed keys are cached without being read
+        context_db.write_batch(context, {b'key1': b'value1', b'key0': None})
+        self.assertTrue(context_db.exists(context, b'key1'))
+        self.assertFalse(context_db.exists(context, b'key0'))
+        self.key_value_db.get.assert_not_called()
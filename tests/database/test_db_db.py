@@ -66,6 +66,23 @@ class TestKeyValueDatabase(unittest.TestCase):
         self.assertEqual(b'value1', db.get(b'key1'))
         self.assertEqual(b'value0', db.get(b'key0'))
 
+    def test_get_many(self):
+        db = self.db
+
+        db.put(b'key0', b'value0')
+        db.put(b'key2', b'value2')
+        values = db.get_many([b'key0', b'key1', b'key2', b'key0'])
+        self.assertEqual([b'value0', None, b'value2', b'value0'], values)
+
+        # Many keys are looked up on a thread pool
+        keys = [i.to_bytes(4, DATA_BYTE_ORDER) for i in range(100)]
+        for key in keys[::2]:
+            db.put(key, key)
+        values = db.get_many(keys)
+        self.assertEqual(len(keys), len(values))
+        for i, (key, value) in enumerate(zip(keys, values)):
+            self.assertEqual(key if i % 2 == 0 else None, value)
+
 
 class TestContextDatabaseOnWriteMode(unittest.TestCase):
     def setUp(self):
@@ -125,6 +142,86 @@ class TestContextDatabaseOnWriteMode(unittest.TestCase):
         self.assertEqual(batch[b'key0'], b'value1')
         self.assertEqual(batch[b'key1'], b'value1')
 
+    def test_get_many(self):
+        context = self.context
+        db = self.context_db
+
+        db.key_value_db.put(b'key0', b'value0')
+        db.key_value_db.put(b'key1', b'value1')
+        db.key_value_db.put(b'key2', b'value2')
+        context.block_batch[b'key1'] = b'block_value1'
+        context.block_batch[b'key2'] = b'block_value2'
+        db.put(context, b'key2', b'tx_value2')
+        db.delete(context, b'key3')
+
+        keys = [b'key0', b'key1', b'key2', b'key3', b'key4']
+        expected = [b'value0', b'block_value1', b'tx_value2', None, None]
+        self.assertEqual(expected, db.get_many(context, keys))
+        self.assertEqual([db.get(context, key) for key in keys],
+                         db.get_many(context, keys))
+
+        # DIRECT context reads StateDB only
+        self.assertEqual([b'value0', b'value1', b'value2', None, None],
+                         db.get_many(None, keys))
+
+    def test_iterate(self):
+        context = self.context
+        db = self.context_db
+
+        db.key_value_db.write_batch({
+            b'a|0': b'db0', b'a|1': b'db1', b'a|2': b'db2',
+            b'a|4': b'db4', b'b|0': b'other'})
+        context.block_batch[b'a|1'] = None
+        context.block_batch[b'a|3'] = b'block3'
+        db.put(context, b'a|2', b'tx2')
+        db.put(context, b'a|5', b'tx5')
+        db.delete(context, b'a|4')
+        db.put(context, b'b|1', b'other')
+
+        items = list(db.iterate(context, b'a|'))
+        self.assertEqual(
+            [(b'a|0', b'db0'), (b'a|2', b'tx2'), (b'a|3', b'block3'), (b'a|5', b'tx5')],
+            items)
+
+        items = list(db.iterate(context, b'a|', reverse=True))
+        self.assertEqual(
+            [(b'a|5', b'tx5'), (b'a|3', b'block3'), (b'a|2', b'tx2'), (b'a|0', b'db0')],
+            items)
+
+        items = list(db.iterate(context, b'a|', start=b'a|1', stop=b'a|5'))
+        self.assertEqual([(b'a|2', b'tx2'), (b'a|3', b'block3')], items)
+
+        # DIRECT context reads StateDB only
+        items = list(db.iterate(None, b'a|'))
+        self.assertEqual(
+            [(b'a|0', b'db0'), (b'a|1', b'db1'), (b'a|2', b'db2'), (b'a|4', b'db4')],
+            items)
+
+    def test_get_on_snapshot(self):
+        db = self.context_db
+        db.key_value_db.write_batch({b'a|0': b'value0', b'a|1': b'value1'})
+
+        context = self.context_factory.create(IconScoreContextType.QUERY)
+        snapshot = db.get_snapshot()
+        context.snapshot = snapshot
+
+        # Commit a block after the snapshot is taken
+        db.write_batch(None, {b'a|0': b'value2', b'a|1': None, b'a|2': b'value2'})
+
+        self.assertEqual(b'value0', db.get(context, b'a|0'))
+        self.assertEqual([b'value0', b'value1', None],
+                         db.get_many(context, [b'a|0', b'a|1', b'a|2']))
+        self.assertEqual([(b'a|0', b'value0'), (b'a|1', b'value1')],
+                         list(db.iterate(context, b'a|')))
+
+        # A context without the snapshot sees the latest states
+        self.assertEqual(b'value2', db.get(None, b'a|0'))
+        self.assertIsNone(db.get(None, b'a|1'))
+
+        snapshot.release()
+        context.clear()
+        self.assertIsNone(context.snapshot)
+
     def test_put_on_readonly_exception(self):
         context = self.context
         context.func_type = IconScoreFuncType.READONLY
@@ -240,3 +337,28 @@ class TestIconScoreDatabase(unittest.TestCase):
 
         db.put(key, value.to_bytes(32, DATA_BYTE_ORDER))
         self.assertEqual(value.to_bytes(32, DATA_BYTE_ORDER), db.get(key))
+
+    def test_get_many(self):
+        db = self.db
+
+        db.put(b'key0', b'value0')
+        db.put(b'key1', b'value1')
+        self.assertEqual([b'value1', None, b'value0'],
+                         db.get_many([b'key1', b'key2', b'key0']))
+
+    def test_iterate(self):
+        db = self.db
+        sub_db = db.get_sub_db(b'sub')
+
+        db.put(b'key', b'value')
+        for i in range(5):
+            sub_db.put(b'item' + bytes([i]), bytes([i]))
+        sub_db.put(b'other', b'other')
+
+        items = list(sub_db.iterate(b'item'))
+        self.assertEqual([(b'item' + bytes([i]), bytes([i])) for i in range(5)], items)
+
+        items = list(sub_db.iterate(b'item', start=b'item\x01', stop=b'item\x03', reverse=True))
+        self.assertEqual([(b'item\x02', b'\x02'), (b'item\x01', b'\x01')], items)
+
+        self.assertEqual(6, len(list(sub_db.iterate())))
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+from unittest.mock import Mock
+
+from iconservice.base.exception import InvalidParamsException
+from iconservice.database.backend import MemoryDB
+from iconservice.database.db import KeyValueDatabase, ContextDatabase
+from iconservice.database.history import StateHistory
+from iconservice.database.key_filter import KeyFilter
+from iconservice.icon_constant import IconScoreContextType
+
+
+class TestStateHistory(unittest.TestCase):
+    def setUp(self):
+        self.history_db = KeyValueDatabase(MemoryDB())
+        self.history = StateHistory(self.history_db, 2)
+
+    def test_get_overlay(self):
+        self.history.write(1, {b'key0': None, b'key1': b'value1'})
+        self.history.write(2, {b'key0': b'value0', b'key2': None})
+
+        self.assertEqual({}, self.history.get_overlay(2, 2))
+        self.assertEqual({b'key0': b'value0', b'key2': None}, self.history.get_overlay(2, 1))
+        # The older diff overrides key0
+        self.assertEqual({b'key0': None, b'key1': b'value1', b'key2': None},
+                         self.history.get_overlay(2, 0))
+
+        for block_height in (-1, 3):
+            with self.assertRaises(InvalidParamsException):
+                self.history.get_overlay(2, block_height)
+
+    def test_retention(self):
+        for block_height in range(1, 5):
+            self.history.write(block_height, {b'key': block_height.to_bytes(1, 'big')})
+
+        self.assertEqual({b'key': b'\x03'}, self.history.get_overlay(4, 2))
+        with self.assertRaises(InvalidParamsException):
+            self.history.get_overlay(4, 1)
+        self.assertEqual(2, len(list(self.history_db.iterator())))
+
+        # Reopened
+        history = StateHistory(self.history_db, 2)
+        self.assertEqual(
+            {'retention': 2, 'oldestBlockHeight': 2, 'lastBlockHeight': 4}, history.get_status())
+
+    def test_missing_diff(self):
+        # History has been turned on at block 2
+        self.history.write(2, {b'key': b'value'})
+
+        with self.assertRaises(InvalidParamsException):
+            self.history.get_overlay(3, 1)
+
+
+class TestContextDatabaseWithHistory(unittest.TestCase):
+    def setUp(self):
+        self.key_value_db = KeyValueDatabase(MemoryDB())
+        self.key_filter = KeyFilter(100)
+        self.key_filter.open(self.key_value_db)
+        self.history = StateHistory(KeyValueDatabase(MemoryDB()), 10)
+        self.context_db = ContextDatabase(
+            self.key_value_db, key_filter=self.key_filter, history=self.history)
+
+        self.context_db.write_batch(None, {b'key0': b'value0', b'key1': b'value1'}, 1)
+        self.context_db.write_batch(None, {b'key0': None, b'key2': b'value2'}, 2)
+
+        self.context = Mock()
+        self.context.type = IconScoreContextType.QUERY
+        self.context.snapshot = self.context_db.get_snapshot()
+
+    def tearDown(self):
+        self.context.snapshot.release()
+        self.key_filter.close()
+
+    def test_read_at_block_height(self):
+        context = self.context
+        context_db = self.context_db
+        context_db.rewind_snapshot(context.snapshot, 2, 1)
+
+        # Keys which the current filter doesn't contain are read from overlay
+        self.key_filter.might_contain = Mock(return_value=False)
+
+        self.assertEqual(b'value0', context_db.get(context, b'key0'))
+        self.assertIsNone(context_db.get(context, b'key2'))
+        self.assertEqual([b'value0', None], context_db.get_many(context, [b'key0', b'key2']))
+        self.assertTrue(context_db.exists(context, b'key0'))
+        self.assertEqual(b'value0', context.snapshot.get(b'key0'))
+
+        self.key_filter.might_contain = Mock(return_value=True)
+        self.assertEqual(b'value1', context_db.get(context, b'key1'))
+        self.assertEqual([(b'key0', b'value0'), (b'key1', b'value1')],
+                         list(context_db.iterate(context, b'key')))
+
+        # The latest states
+        self.assertIsNone(context_db.get(None, b'key0'))
+
+    def test_rewind_without_history(self):
+        context_db = ContextDatabase(self.key_value_db)
+        snapshot = context_db.get_snapshot()
+
+        context_db.rewind_snapshot(snapshot, 2, 2)
+        with self.assertRaises(InvalidParamsException):
+            context_db.rewind_snapshot(snapshot, 2, 1)
+        snapshot.release()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from iconservice.database.backend import MemoryDB
+from iconservice.database.db import KeyValueDatabase, ContextDatabase
+from iconservice.database.key_filter import BloomFilter, KeyFilter, _REBUILD_CHUNK_SIZE
+
+
+def wait_until_ready(key_filter: 'KeyFilter', rebuilds: int=1):
+    for _ in range(500):
+        if key_filter.ready and key_filter.rebuilds >= rebuilds:
+            return
+        time.sleep(0.01)
+
+    raise TimeoutError('Key filter is not built')
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_might_contain(self):
+        bloom_filter = BloomFilter(1000)
+        keys = [os.urandom(32) for _ in range(1000)]
+        for key in keys:
+            bloom_filter.add(key)
+
+        for key in keys:
+            self.assertTrue(bloom_filter.might_contain(key))
+
+        false_positives = sum(bloom_filter.might_contain(os.urandom(32)) for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+        # Adding the same key again doesn't increase count
+        count = bloom_filter.count
+        bloom_filter.add(keys[0])
+        self.assertEqual(count, bloom_filter.count)
+
+    def test_to_bytes(self):
+        bloom_filter = BloomFilter(100)
+        bloom_filter.add(b'key0')
+
+        loaded = BloomFilter.from_bytes(bloom_filter.to_bytes())
+        self.assertEqual(bloom_filter.bit_count, loaded.bit_count)
+        self.assertEqual(bloom_filter.hash_count, loaded.hash_count)
+        self.assertEqual(1, loaded.count)
+        self.assertTrue(loaded.might_contain(b'key0'))
+
+
+class TestContextDatabaseWithKeyFilter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'keyfilter')
+
+        self.key_value_db = KeyValueDatabase(MemoryDB())
+        self.key_value_db.write_batch({b'key0': b'value0', b'key1': b'value1'})
+        self.key_filter = self._open_key_filter()
+        self.context_db = ContextDatabase(self.key_value_db, key_filter=self.key_filter)
+
+    def tearDown(self):
+        self.key_filter.close()
+        self.temp_dir.cleanup()
+
+    def _open_key_filter(self) -> 'KeyFilter':
+        key_filter = KeyFilter(100, self.path)
+        key_filter.open(self.key_value_db)
+        return key_filter
+
+    def test_get(self):
+        context_db = self.context_db
+        get = self.key_value_db.get
+        self.key_value_db.get = Mock(side_effect=get)
+
+        get_many = self.key_value_db.get_many
+        self.key_value_db.get_many = Mock(side_effect=get_many)
+        wait_until_ready(self.key_filter)
+
+        self.assertIsNone(context_db.get(None, b'absent'))
+        self.key_value_db.get.assert_not_called()
+
+        self.assertEqual([b'value0', None], context_db.get_many(None, [b'key0', b'absent']))
+        self.key_value_db.get_many.assert_called_once_with([b'key0'])
+        self.assertEqual(2, self.key_filter.negatives)
+
+        context_db.write_batch(None, {b'key2': b'value2'})
+        self.assertEqual(b'value2', context_db.get(None, b'key2'))
+
+    def test_save_and_load(self):
+        wait_until_ready(self.key_filter)
+        self.context_db.write_batch(None, {b'key2': b'value2'})
+        self.key_filter.close()
+        self.assertTrue(os.path.exists(self.path))
+
+        self.key_filter = self._open_key_filter()
+        # Loaded without scanning db
+        self.assertTrue(self.key_filter.ready)
+        self.assertTrue(self.key_filter.might_contain(b'key2'))
+        # The file is not used again after a crash
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_rebuild_when_full(self):
+        self.key_filter.close()
+        self.key_filter = KeyFilter(2)
+        self.key_filter.open(self.key_value_db)
+        context_db = ContextDatabase(self.key_value_db, key_filter=self.key_filter)
+        wait_until_ready(self.key_filter)
+
+        states = {f'key{i}'.encode(): b'value' for i in range(2, 10)}
+        context_db.write_batch(None, states)
+        wait_until_ready(self.key_filter, rebuilds=2)
+
+        status = self.key_filter.get_status()
+        self.assertEqual(4, status['capacity'])
+        for key in states:
+            self.assertTrue(self.key_filter.might_contain(key))
+
+    def test_commit_while_rebuilding(self):
+        self.key_filter.close()
+        self.key_value_db.write_batch(
+            {f'scanned{i}'.encode(): b'value' for i in range(_REBUILD_CHUNK_SIZE * 3)})
+
+        unlocked_adds = []
+        add = BloomFilter.add
+
+        def add_with_lock_check(bloom_filter, key):
+            if not key_filter._lock.locked():
+                unlocked_adds.append(key)
+            add(bloom_filter, key)
+
+        with patch.object(BloomFilter, 'add', autospec=True, side_effect=add_with_lock_check):
+            key_filter = KeyFilter(_REBUILD_CHUNK_SIZE * 4)
+            key_filter.open(self.key_value_db)
+            self.key_filter = key_filter
+            context_db = ContextDatabase(self.key_value_db, key_filter=key_filter)
+
+            committed = []
+            while not key_filter.ready:
+                key = f'committed{len(committed)}'.encode()
+                context_db.write_batch(None, {key: b'value'})
+                committed.append(key)
+            wait_until_ready(key_filter)
+
+        self.assertGreater(len(committed), 0)
+        self.assertEqual([], unlocked_adds)
+        # No false negatives for the keys committed during the rebuild
+        for key in committed:
+            self.assertTrue(key_filter.might_contain(key))
+        for key, _ in self.key_value_db.iterator():
+            self.assertTrue(key_filter.might_contain(key))
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from iconservice.base.address import AddressPrefix
+from iconservice.database.batch import BlockBatch, TransactionBatch
+from iconservice.database.cache import LRUCache
+from iconservice.database.db import ContextDatabase
+from iconservice.database.metrics import StorageMetrics, KeyClass, LATENCY_BUCKETS, \
+    get_key_class
+from iconservice.iconscore.icon_score_context import IconScoreContextFactory
+from iconservice.iconscore.icon_score_context import IconScoreContextType
+from tests import create_address
+from tests.mock_db import MockKeyValueDatabase
+
+
+class TestStorageMetrics(unittest.TestCase):
+    def test_get_key_class(self):
+        eoa = create_address(AddressPrefix.EOA)
+        score = create_address(AddressPrefix.CONTRACT)
+
+        self.assertEqual(KeyClass.ACCOUNT, get_key_class(eoa.to_bytes()))
+        self.assertEqual(KeyClass.ACCOUNT, get_key_class(score.to_bytes()))
+        self.assertEqual(KeyClass.SCORE, get_key_class(score.to_bytes() + b'|key'))
+        self.assertEqual(KeyClass.DEPLOY, get_key_class(b'isds|di|' + score.to_bytes()))
+        self.assertEqual(KeyClass.GLOBAL, get_key_class(b'total_supply'))
+        self.assertEqual(KeyClass.GLOBAL, get_key_class(b'last_block'))
+        self.assertEqual(KeyClass.OTHER, get_key_class(b'unknown'))
+
+    def test_end_block(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            dump_path = os.path.join(temp_dir, 'metrics.json')
+            metrics = StorageMetrics(dump_path)
+
+            metrics.on_disk_read(IconScoreContextType.QUERY, b'total_supply', 0.00005)
+            metrics.on_write({b'total_supply': b'\x01', b'last_block': None})
+            metrics.end_block(1)
+            metrics.on_disk_read(IconScoreContextType.INVOKE, b'total_supply', 0.5)
+            metrics.end_block(2)
+
+            status = metrics.get_status()
+            last_block = status['lastBlock']
+            self.assertEqual(2, last_block['blockHeight'])
+            self.assertEqual({'invoke': {'disk': {KeyClass.GLOBAL: 1}}}, last_block['reads'])
+            self.assertEqual({}, last_block['writes'])
+
+            total = status['total']
+            self.assertEqual(LATENCY_BUCKETS, tuple(total['latencyBucketBounds']))
+            disk_reads = total['diskReads'][KeyClass.GLOBAL]
+            self.assertEqual(2, disk_reads['count'])
+            self.assertEqual([0, 1, 0, 0, 1], disk_reads['latencyBuckets'])
+            self.assertEqual({'count': 2, 'bytes': len(b'total_supply') + 1 + len(b'last_block')},
+                             total['writes'][KeyClass.GLOBAL])
+
+            with open(dump_path) as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual([1, 2], [line['blockHeight'] for line in lines])
+            self.assertEqual(1, lines[0]['reads']['query']['disk'][KeyClass.GLOBAL])
+
+
+class TestContextDatabaseWithMetrics(unittest.TestCase):
+    def setUp(self):
+        self.key_value_db = MockKeyValueDatabase.create_db()
+        self.metrics = StorageMetrics()
+        self.context_db = ContextDatabase(
+            self.key_value_db, cache=LRUCache(1024), metrics=self.metrics)
+
+        context_factory = IconScoreContextFactory(max_size=1)
+        context = context_factory.create(IconScoreContextType.INVOKE)
+        context.block_batch = BlockBatch()
+        context.tx_batch = TransactionBatch()
+        self.context = context
+
+    def test_read_sources(self):
+        context_db = self.context_db
+        context = self.context
+        key = create_address(AddressPrefix.CONTRACT).to_bytes() + b'|key'
+
+        context.block_batch[b'total_supply'] = b'\x01'
+        context.tx_batch[key] = b'value'
+
+        context_db.get(context, key)
+        context_db.get(context, b'total_supply')
+        # The first read goes to disk and the second one hits the cache
+        context_db.get_many(context, [b'last_block'])
+        context_db.get(context, b'last_block')
+        context_db.get(None, b'last_block')
+
+        context_db.write_batch(None, {key: b'value'})
+        self.metrics.end_block(1)
+
+        block = self.metrics.get_status()['lastBlock']
+        self.assertEqual({
+            'invoke': {
+                'txBatch': {KeyClass.SCORE: 1},
+                'blockBatch': {KeyClass.GLOBAL: 1},
+                'disk': {KeyClass.GLOBAL: 1},
+                'cache': {KeyClass.GLOBAL: 1}
+            },
+            'direct': {
+                'cache': {KeyClass.GLOBAL: 1}
+            }
+        }, block['reads'])
+        self.assertEqual(1, block['diskReads'][KeyClass.GLOBAL]['count'])
+        self.assertEqual(1, block['writes'][KeyClass.SCORE]['count'])
@@ -21,6 +21,7 @@ from iconservice import IconScoreDatabase
 from iconservice.base.address import AddressPrefix, Address
 from iconservice.database.db import ContextDatabase
 from iconservice.database.db import DatabaseObserver
+from iconservice.iconscore.icon_score_step import OutOfStepException, StepType
 from iconservice.utils import sha3_256
 
 
@@ -39,9 +40,17 @@ class TestDatabaseObserver(unittest.TestCase):
         def get(caller, key):
             return self.last_value
 
+        def exists(caller, key):
+            return bool(self.last_value)
+
+        def put(caller, key, value):
+            self.last_value = value
+
         score_address = Address.from_data(AddressPrefix.CONTRACT, b'score')
         context_db = Mock(spec=ContextDatabase)
         context_db.get = get
+        context_db.exists = exists
+        context_db.put = put
         self._observer = Mock(spec=DatabaseObserver)
         self._icon_score_database = IconScoreDatabase(score_address, context_db)
         self._icon_score_database.set_observer(self._observer)
@@ -52,20 +61,39 @@ class TestDatabaseObserver(unittest.TestCase):
         self._observer.on_put.assert_called()
         args, _ = self._observer.on_put.call_args
         self.assertEqual(self.key_, args[1])
-        self.assertEqual(None, args[2])
+        self.assertFalse(args[2])
         self.assertEqual(value, args[3])
         self.last_value = value
 
     def test_replace(self):
+        self.last_value = b"value1"
         value = b"value2"
         self._icon_score_database.put(self.key_, value)
         self._observer.on_put.assert_called()
         args, _ = self._observer.on_put.call_args
         self.assertEqual(self.key_, args[1])
-        self.assertEqual(self.last_value, args[2])
+        self.assertTrue(args[2])
         self.assertEqual(value, args[3])
         self.last_value = value
 
+    def test_put_none(self):
+        self.last_value = b"oldvalue"
+        self._icon_score_database.put(self.key_, None)
+        self._observer.on_put.assert_not_called()
+        self._observer.on_delete.assert_called()
+        args, _ = self._observer.on_delete.call_args
+        self.assertEqual(self.key_, args[1])
+        self.assertEqual(b"oldvalue", args[2])
+        self.assertIsNone(self.last_value)
+
+    def test_put_none_out_of_step(self):
+        # The DELETE step is charged before the field is deleted
+        self.last_value = b"oldvalue"
+        self._observer.on_delete.side_effect = OutOfStepException(0, 0, 1, StepType.DELETE)
+        with self.assertRaises(OutOfStepException):
+            self._icon_score_database.put(self.key_, None)
+        self.assertEqual(b"oldvalue", self.last_value)
+
     def test_get(self):
         value = self._icon_score_database.get(self.key_)
         self._observer.on_get.assert_called()
@@ -81,3 +109,16 @@ class TestDatabaseObserver(unittest.TestCase):
         args, _ = self._observer.on_delete.call_args
         self.assertEqual(self.key_, args[1])
         self.assertEqual(self.last_value, args[2])
+
+    def test_iterate(self):
+        db = self._icon_score_database
+        items = [(db._hash_key(b'key0'), b'value0'), (db._hash_key(b'key1'), b'value1')]
+        db._context_db.iterate = Mock(return_value=iter(items))
+
+        result = list(db.iterate())
+        self.assertEqual([(b'key0', b'value0'), (b'key1', b'value1')], result)
+        self.assertEqual(2, self._observer.on_get.call_count)
+        for i, call_args in enumerate(self._observer.on_get.call_args_list):
+            args, _ = call_args
+            self.assertEqual(result[i][0], args[1])
+            self.assertEqual(result[i][1], args[2])
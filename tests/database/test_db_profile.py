@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+from unittest.mock import patch
+
+from iconservice.base.address import AddressPrefix
+from iconservice.base.exception import DatabaseException
+from iconservice.database.factory import ContextDatabaseFactory
+from iconservice.database.profile import Keyspace, get_leveldb_options, get_keyspace_profile
+from tests import create_address
+
+
+class TestProfile(unittest.TestCase):
+    def test_get_leveldb_options(self):
+        self.assertEqual({}, get_leveldb_options(None))
+        self.assertEqual({}, get_leveldb_options('default'))
+        self.assertEqual(10, get_leveldb_options('large')['bloom_filter_bits'])
+
+        options = get_leveldb_options({
+            'lruCacheSize': 1024,
+            'bloomFilterBits': 10,
+            'writeBufferSize': 2048,
+            'blockSize': 4096,
+            'compression': 'none',
+            'maxOpenFiles': 100
+        })
+        self.assertEqual({
+            'lru_cache_size': 1024,
+            'bloom_filter_bits': 10,
+            'write_buffer_size': 2048,
+            'block_size': 4096,
+            'compression': None,
+            'max_open_files': 100
+        }, options)
+
+    def test_invalid_profile(self):
+        invalid_profiles = [
+            'unknown',
+            {'cacheSize': 1024},
+            {'compression': 'zlib'},
+            {'lruCacheSize': -1},
+            {'blockSize': '4096'}
+        ]
+
+        for profile in invalid_profiles:
+            with self.assertRaises(DatabaseException):
+                get_leveldb_options(profile)
+
+    def test_get_keyspace_profile(self):
+        self.assertIsNone(get_keyspace_profile({}, Keyspace.SCORE))
+
+        profiles = {Keyspace.DEFAULT: 'large'}
+        self.assertEqual('large', get_keyspace_profile(profiles, Keyspace.SCORE))
+
+        profiles[Keyspace.SCORE] = 'small'
+        self.assertEqual('large', get_keyspace_profile(profiles, Keyspace.DEFAULT))
+        self.assertEqual('small', get_keyspace_profile(profiles, Keyspace.SCORE))
+
+
+class TestContextDatabaseFactoryWithProfiles(unittest.TestCase):
+    def tearDown(self):
+        ContextDatabaseFactory.close()
+
+    @patch('iconservice.database.db.plyvel.DB')
+    def test_open_by_keyspace(self, plyvel_db):
+        profiles = {Keyspace.DEFAULT: 'large', Keyspace.SCORE: {'lruCacheSize': 1024}}
+
+        ContextDatabaseFactory.open(
+            'state_db', ContextDatabaseFactory.Mode.MULTIPLE_DB, profiles=profiles)
+
+        ContextDatabaseFactory.create_by_name('icon_dex')
+        _, kwargs = plyvel_db.call_args
+        self.assertEqual(get_leveldb_options('large')['lru_cache_size'], kwargs['lru_cache_size'])
+        self.assertEqual(10, kwargs['bloom_filter_bits'])
+
+        ContextDatabaseFactory.create_by_address(create_address(AddressPrefix.CONTRACT))
+        _, kwargs = plyvel_db.call_args
+        self.assertEqual(1024, kwargs['lru_cache_size'])
+        self.assertNotIn('bloom_filter_bits', kwargs)
+
+    def test_invalid_profile(self):
+        with self.assertRaises(DatabaseException):
+            ContextDatabaseFactory.open(
+                'state_db', ContextDatabaseFactory.Mode.SINGLE_DB,
+                profiles={Keyspace.DEFAULT: 'unknown'})
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+from unittest.mock import Mock
+
+from iconservice.base.address import AddressPrefix
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import Backend, MemoryDB
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.factory import ContextDatabaseFactory
+from iconservice.database.shard import ShardedKeyValueDatabase, ICX_SHARD_INDEX, \
+    get_score_shard_index
+from tests import create_address
+
+SCORE_SHARD_COUNT = 3
+
+
+def create_score_key(address, key: bytes) -> bytes:
+    return b'|'.join([address.to_bytes(), key])
+
+
+class TestShardedKeyValueDatabase(unittest.TestCase):
+    def setUp(self):
+        self.memory_dbs = [MemoryDB() for _ in range(SCORE_SHARD_COUNT + 1)]
+        self.db = self._open()
+
+        self.eoa_key = create_address(AddressPrefix.EOA).to_bytes()
+        self.score_keys = [create_score_key(create_address(AddressPrefix.CONTRACT), b'key')
+                           for _ in range(8)]
+
+    def _open(self) -> 'ShardedKeyValueDatabase':
+        return ShardedKeyValueDatabase.open(
+            [KeyValueDatabase(memory_db.prefixed_db(b'')) for memory_db in self.memory_dbs])
+
+    def test_get_score_shard_index(self):
+        address = create_address(AddressPrefix.CONTRACT)
+        index = get_score_shard_index(create_score_key(address, b'0'), SCORE_SHARD_COUNT)
+        self.assertTrue(1 <= index <= SCORE_SHARD_COUNT)
+        self.assertEqual(index, get_score_shard_index(
+            create_score_key(address, b'1|2'), SCORE_SHARD_COUNT))
+
+        # ICX accounts including the ones of SCOREs
+        self.assertEqual(ICX_SHARD_INDEX, get_score_shard_index(address.to_bytes(), SCORE_SHARD_COUNT))
+        self.assertEqual(ICX_SHARD_INDEX, get_score_shard_index(self.eoa_key, SCORE_SHARD_COUNT))
+        self.assertEqual(ICX_SHARD_INDEX, get_score_shard_index(b'last_block', SCORE_SHARD_COUNT))
+
+    def test_write_batch(self):
+        db = self.db
+        states = {key: b'value' for key in self.score_keys}
+        states[self.eoa_key] = b'account'
+        db.write_batch(states)
+
+        self.assertEqual(1, db.commit)
+        for key, value in states.items():
+            self.assertEqual(value, db.get(key))
+            shard = db.shards[get_score_shard_index(key, SCORE_SHARD_COUNT)]
+            self.assertEqual(value, shard.get(key))
+
+        keys = list(states) + [b'absent']
+        self.assertEqual([db.get(key) for key in keys], db.get_many(keys))
+
+        db.write_batch({self.score_keys[0]: None})
+        self.assertIsNone(db.get(self.score_keys[0]))
+        self.assertEqual(2, db.commit)
+
+    def test_iterator(self):
+        db = self.db
+        states = {key: b'value' for key in self.score_keys}
+        states[self.eoa_key] = b'account'
+        db.write_batch(states)
+
+        # Meta keys of shards are hidden
+        self.assertEqual(sorted(states.items()), list(db.iterator()))
+        self.assertEqual(sorted(states.items(), reverse=True), list(db.iterator(reverse=True)))
+
+        address_bytes = self.score_keys[0][:21]
+        shard = db.shards[get_score_shard_index(self.score_keys[0], SCORE_SHARD_COUNT)]
+        shard.iterator = Mock(side_effect=shard.iterator)
+        items = list(db.iterator(start=address_bytes + b'|', stop=address_bytes + b'}'))
+        self.assertEqual([(self.score_keys[0], b'value')], items)
+        # The keys of a SCORE are read from its shard only
+        shard.iterator.assert_called_once()
+
+    def test_snapshot(self):
+        db = self.db
+        key = self.score_keys[0]
+        db.write_batch({key: b'value0', self.eoa_key: b'account0'})
+
+        snapshot = db.get_snapshot()
+        db.write_batch({key: b'value1', self.eoa_key: None})
+
+        self.assertEqual(b'value0', snapshot.get(key))
+        self.assertEqual(b'account0', snapshot.get(self.eoa_key))
+        self.assertEqual(b'value1', db.get(key))
+        snapshot.close()
+
+    def test_recover(self):
+        db = self.db
+        db.write_batch({key: b'value0' for key in self.score_keys})
+
+        # Stops after the icx shard is written
+        for shard in db.shards[1:]:
+            shard.write_batch = Mock(side_effect=DatabaseException('crash'))
+        with self.assertRaises(DatabaseException):
+            db.write_batch({key: b'value1' for key in self.score_keys})
+        for shard in db.shards[1:]:
+            del shard.write_batch
+
+        for key in self.score_keys:
+            self.assertEqual(b'value0', db.get(key))
+
+        db = self._open()
+        self.assertEqual(2, db.commit)
+        for key in self.score_keys:
+            self.assertEqual(b'value1', db.get(key))
+
+        db.write_batch({self.score_keys[0]: b'value2'})
+        self.assertEqual(3, db.commit)
+        self.assertEqual(b'value2', self._open().get(self.score_keys[0]))
+
+    def test_shard_count_mismatch(self):
+        self.memory_dbs.append(MemoryDB())
+        with self.assertRaises(DatabaseException):
+            self._open()
+
+
+class TestContextDatabaseFactoryWithShards(unittest.TestCase):
+    def setUp(self):
+        ContextDatabaseFactory.open(
+            'unused', ContextDatabaseFactory.Mode.SHARDED_DB,
+            backend=Backend.MEMORY, score_shard_count=SCORE_SHARD_COUNT)
+
+    def tearDown(self):
+        ContextDatabaseFactory.close()
+
+    def test_create_by_address(self):
+        context_db = ContextDatabaseFactory.create_by_address(
+            create_address(AddressPrefix.CONTRACT))
+        self.assertIs(ContextDatabaseFactory.get_shared_db(), context_db)
+        self.assertIs(context_db, ContextDatabaseFactory.create_by_name('icon_dex'))
+
+        key_value_db = context_db.key_value_db
+        self.assertIsInstance(key_value_db, ShardedKeyValueDatabase)
+        self.assertEqual(SCORE_SHARD_COUNT + 1, len(key_value_db.shards))
+
+    def test_invalid_shard_count(self):
+        with self.assertRaises(DatabaseException):
+            ContextDatabaseFactory.open(
+                'unused', ContextDatabaseFactory.Mode.SHARDED_DB, backend=Backend.MEMORY)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import json
+import os
+import tempfile
+import unittest
+
+from iconservice.base.block import Block
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import MemoryDB
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.key_filter import KeyFilter
+from iconservice.database.shard import ShardedKeyValueDatabase
+from iconservice.database.snapshot_file import MANIFEST_NAME, export_snapshot, import_snapshot
+from tests import create_block_hash
+from tests.database.test_db_key_filter import wait_until_ready
+
+
+def create_states(count: int) -> dict:
+    states = {os.urandom(20): os.urandom(40) for _ in range(count)}
+    states[b'last_block'] = bytes(Block(10, create_block_hash(), 0, create_block_hash()))
+    return states
+
+
+def get_items(key_value_db: 'KeyValueDatabase') -> dict:
+    return dict(key_value_db.iterator())
+
+
+class TestSnapshotFile(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'snapshot')
+        self.progress_path = os.path.join(self.temp_dir.name, 'progress')
+
+        self.states = create_states(100)
+        self.source_db = KeyValueDatabase(MemoryDB())
+        self.source_db.write_batch(self.states)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _corrupt(self, name: str):
+        with open(os.path.join(self.path, name), 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xff]))
+
+    def test_export_and_import(self):
+        manifest = export_snapshot(self.source_db, self.path, chunk_size=1024)
+        self.assertEqual(10, manifest['blockHeight'])
+        self.assertEqual(100, manifest['keys'])
+        self.assertGreater(len(manifest['chunks']), 1)
+
+        target_db = KeyValueDatabase(MemoryDB())
+        import_snapshot(target_db, self.path, self.progress_path, workers=3)
+        self.assertEqual(self.states, get_items(target_db))
+        self.assertFalse(os.path.exists(self.progress_path))
+
+        # Keys are spread over shards again
+        sharded_db = ShardedKeyValueDatabase.open(
+            [KeyValueDatabase(MemoryDB()) for _ in range(3)])
+        import_snapshot(sharded_db, self.path, self.progress_path)
+        self.assertEqual(self.states, dict(sharded_db.iterator()))
+
+        with self.assertRaises(DatabaseException):
+            import_snapshot(target_db, self.path, self.progress_path)
+
+    def test_resume_export(self):
+        manifest = export_snapshot(self.source_db, self.path, chunk_size=1024)
+
+        # Interrupted after the first chunk
+        partial = dict(manifest, complete=False, chunks=manifest['chunks'][:1],
+                       keys=manifest['chunks'][0]['keys'])
+        with open(os.path.join(self.path, MANIFEST_NAME), 'w') as f:
+            json.dump(partial, f)
+
+        self.assertEqual(manifest, export_snapshot(self.source_db, self.path, chunk_size=1024))
+
+    def test_resume_import(self):
+        manifest = export_snapshot(self.source_db, self.path, chunk_size=1024)
+        target_db = KeyValueDatabase(MemoryDB())
+
+        broken_name = manifest['chunks'][1]['name']
+        self._corrupt(broken_name)
+        with self.assertRaises(DatabaseException):
+            import_snapshot(target_db, self.path, self.progress_path, workers=1)
+
+        # Not imported completely
+        self.assertIsNone(target_db.get(b'last_block'))
+        with open(self.progress_path) as f:
+            loaded = json.load(f)['chunks']
+        self.assertIn(manifest['chunks'][0]['name'], loaded)
+        self.assertNotIn(broken_name, loaded)
+
+        self._corrupt(broken_name)
+        # Loaded chunks are not read again
+        os.remove(os.path.join(self.path, manifest['chunks'][0]['name']))
+        import_snapshot(target_db, self.path, self.progress_path, workers=1)
+        self.assertEqual(self.states, get_items(target_db))
+
+    def test_import_over_stale_key_filter(self):
+        export_snapshot(self.source_db, self.path)
+        key_filter_path = os.path.join(self.temp_dir.name, 'keyfilter')
+
+        # The filter saved for a state db which has been wiped out
+        stale_db = KeyValueDatabase(MemoryDB())
+        stale_db.write_batch({b'stale': b'value'})
+        key_filter = KeyFilter(100, key_filter_path)
+        key_filter.open(stale_db)
+        wait_until_ready(key_filter)
+        key_filter.close()
+        self.assertTrue(os.path.exists(key_filter_path))
+
+        target_db = KeyValueDatabase(MemoryDB())
+        import_snapshot(target_db, self.path, self.progress_path, key_filter_path=key_filter_path)
+        self.assertFalse(os.path.exists(key_filter_path))
+
+        # Rebuilt from the imported keys
+        key_filter = KeyFilter(100, key_filter_path)
+        key_filter.open(target_db)
+        wait_until_ready(key_filter)
+        for key in self.states:
+            self.assertTrue(key_filter.might_contain(key))
+        key_filter.close()
+
+    def test_incomplete_snapshot(self):
+        manifest = export_snapshot(self.source_db, self.path)
+        manifest['complete'] = False
+        with open(os.path.join(self.path, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f)
+
+        with self.assertRaises(DatabaseException):
+            import_snapshot(KeyValueDatabase(MemoryDB()), self.path, self.progress_path)
+
+    def test_export_without_block(self):
+        self.source_db.delete(b'last_block')
+        with self.assertRaises(DatabaseException):
+            export_snapshot(self.source_db, self.path)
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest
+from threading import Event
+from unittest.mock import Mock
+
+from iconservice.base.exception import DatabaseException
+from iconservice.database.backend import Backend, MemoryDB
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.factory import ContextDatabaseFactory
+from iconservice.database.write_behind import WriteBehindKeyValueDatabase
+
+
+class TestWriteBehindKeyValueDatabase(unittest.TestCase):
+    def setUp(self):
+        self.key_value_db = KeyValueDatabase(MemoryDB())
+        self.key_value_db.write_batch({b'a|0': b'db0', b'a|1': b'db1', b'a|2': b'db2'})
+
+        # Blocks the writer thread until self.write_event is set
+        self.write_event = Event()
+        write_batch = self.key_value_db.write_batch
+
+        def wait_and_write_batch(states):
+            self.write_event.wait()
+            write_batch(states)
+
+        self.key_value_db.write_batch = Mock(side_effect=wait_and_write_batch)
+        self.db = WriteBehindKeyValueDatabase(self.key_value_db)
+
+    def tearDown(self):
+        self.write_event.set()
+        self.db.close()
+
+    def test_read_pending_states(self):
+        db = self.db
+        db.write_batch({b'a|0': b'block1', b'a|1': None})
+        db.write_batch({b'a|0': b'block2', b'a|3': b'block2'})
+
+        self.assertEqual(2, db.queue_depth)
+        self.assertEqual(b'db0', self.key_value_db.get(b'a|0'))
+
+        self.assertEqual(b'block2', db.get(b'a|0'))
+        self.assertIsNone(db.get(b'a|1'))
+        self.assertEqual([b'block2', None, b'db2', b'block2'],
+                         db.get_many([b'a|0', b'a|1', b'a|2', b'a|3']))
+        self.assertEqual([(b'a|0', b'block2'), (b'a|2', b'db2'), (b'a|3', b'block2')],
+                         list(db.iterator(start=b'a|', stop=b'a}')))
+        self.assertEqual([(b'a|3', b'block2'), (b'a|2', b'db2')],
+                         list(db.iterator(start=b'a|1', reverse=True)))
+
+    def test_flush(self):
+        db = self.db
+        db.write_batch({b'a|0': b'block1'})
+        db.write_batch({b'a|1': None})
+
+        self.write_event.set()
+        db.flush()
+
+        self.assertEqual(0, db.queue_depth)
+        self.assertEqual(b'block1', self.key_value_db.get(b'a|0'))
+        self.assertIsNone(self.key_value_db.get(b'a|1'))
+
+        status = db.get_status()
+        self.assertEqual(0, status['queueDepth'])
+        self.assertEqual(2, status['maxQueueDepth'])
+        self.assertEqual(2, status['writtenBatches'])
+
+    def test_snapshot(self):
+        db = self.db
+        db.write_batch({b'a|0': b'block1'})
+        snapshot = db.get_snapshot()
+        db.write_batch({b'a|0': b'block2'})
+
+        self.write_event.set()
+        db.flush()
+
+        self.assertEqual(b'block1', snapshot.get(b'a|0'))
+        self.assertEqual(b'block2', db.get(b'a|0'))
+        snapshot.close()
+
+    def test_write_error(self):
+        db = self.db
+        self.key_value_db.write_batch.side_effect = DatabaseException('disk error')
+        db.write_batch({b'a|0': b'block1'})
+        db.write_batch({b'a|0': b'block2'})
+
+        with self.assertRaises(DatabaseException):
+            db.flush()
+        with self.assertRaises(DatabaseException):
+            db.write_batch({b'a|0': b'block3'})
+
+        # States which failed to be written are still readable
+        self.assertEqual(b'block2', db.get(b'a|0'))
+        self.assertEqual(1, self.key_value_db.write_batch.call_count)
+
+        self.key_value_db.write_batch.side_effect = None
+        with self.assertRaises(DatabaseException):
+            db.close()
+
+
+class TestContextDatabaseFactoryWithWriteBehind(unittest.TestCase):
+    def setUp(self):
+        ContextDatabaseFactory.open(
+            'unused', ContextDatabaseFactory.Mode.SINGLE_DB,
+            backend=Backend.MEMORY, cache_size=1024, write_behind=True)
+
+    def tearDown(self):
+        ContextDatabaseFactory.close()
+
+    def test_write_batch(self):
+        context_db = ContextDatabaseFactory.get_shared_db()
+        self.assertIsInstance(context_db.key_value_db, WriteBehindKeyValueDatabase)
+
+        self.assertIsNone(context_db.get(None, b'key0'))
+        context_db.write_batch(None, {b'key0': b'value0'})
+        self.assertEqual(b'value0', context_db.get(None, b'key0'))
+
+        context_db.flush()
+        self.assertEqual(0, context_db.key_value_db.queue_depth)
+        self.assertEqual(b'value0', context_db.get(None, b'key0'))
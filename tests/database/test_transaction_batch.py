@@ -52,6 +52,43 @@ class TestTransactionBatch(unittest.TestCase):
         self.assertEqual(b'value', tx_batch[b'key'])
         self.assertEqual(call_count, tx_batch.call_count)
 
+    def test_revert_nested_call(self):
+        tx_batch = TransactionBatch()
+        tx_batch[b'key0'] = b'value0'
+
+        tx_batch.enter_call()
+        tx_batch[b'key0'] = b'call1'
+        tx_batch[b'key1'] = b'call1'
+
+        tx_batch.enter_call()
+        tx_batch[b'key0'] = b'call2'
+        tx_batch[b'key2'] = b'call2'
+        tx_batch.leave_call()
+
+        self.assertEqual(b'call2', tx_batch[b'key0'])
+        self.assertEqual(b'call2', tx_batch[b'key2'])
+
+        # Reverts the states changed by the nested call as well
+        tx_batch.revert_call()
+        self.assertEqual(b'value0', tx_batch[b'key0'])
+        self.assertFalse(b'key1' in tx_batch)
+        self.assertFalse(b'key2' in tx_batch)
+        self.assertEqual(1, len(tx_batch))
+        tx_batch.leave_call()
+
+        tx_batch[b'key3'] = None
+        expected = BlockBatch()
+        expected[b'key0'] = b'value0'
+        expected[b'key3'] = None
+        self.assertEqual(expected.digest(), tx_batch.digest())
+
+    def test_digest_in_call(self):
+        tx_batch = TransactionBatch()
+        tx_batch.enter_call()
+
+        with self.assertRaises(ServerErrorException):
+            tx_batch.digest()
+
     def test_iter(self):
         tx_batch = TransactionBatch()
         tx_batch[b'key0'] = b'value0'
@@ -84,11 +121,11 @@ class TestTransactionBatch(unittest.TestCase):
         tx_batch[b'key0'] = None
         tx_batch[b'key1'] = b'key1'
         tx_batch[b'key2'] = b'value2'
-        self.assertEqual(5, len(tx_batch))
+        self.assertEqual(3, len(tx_batch))
         self.assertEqual(init_call_count + 2, tx_batch.call_count)
 
         tx_batch.leave_call()
-        self.assertEqual(4, len(tx_batch))
+        self.assertEqual(3, len(tx_batch))
         self.assertEqual(b'key1', tx_batch[b'key1'])
         self.assertEqual(init_call_count + 1, tx_batch.call_count)
 
@@ -124,7 +161,7 @@ class TestTransactionBatch(unittest.TestCase):
         tx_batch[b'key0'] = None
         tx_batch[b'key1'] = b'key1'
         tx_batch[b'key2'] = b'value2'
-        self.assertEqual(5, len(tx_batch))
+        self.assertEqual(3, len(tx_batch))
         self.assertEqual(init_call_count + 2, tx_batch.call_count)
 
         keys = [b'key0', b'key1', b'key2']
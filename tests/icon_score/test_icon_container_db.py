@@ -137,6 +137,27 @@ class TestIconContainerDB(unittest.TestCase):
 
         self.assertEqual(test_dict['a']['b']['c'], 1)
 
+    def test_dict_depth3_key(self):
+        name = 'test_dict'
+        addr = create_address(AddressPrefix.CONTRACT)
+        test_dict = DictDB(name, self.db, depth=3, value_type=int)
+        test_dict[addr]['b']['c'] = 1
+
+        # The key of a nested DictDB is the same as the one of sub dbs at each depth
+        sub_db = self.db.get_sub_db(b'\x01|' + name.encode())
+        sub_db = sub_db.get_sub_db(b'\x01|' + addr.to_bytes())
+        sub_db = sub_db.get_sub_db(b'\x01|b')
+        self.assertEqual(b'\x01', sub_db.get(b'c'))
+        self.assertEqual(
+            b'|'.join([self.db.address.to_bytes(), b'\x01', name.encode(),
+                       b'\x01', addr.to_bytes(), b'\x01', b'b', b'c']),
+            sub_db._hash_key(b'c'))
+
+        self.assertIn('c', test_dict[addr]['b'])
+        self.assertNotIn('d', test_dict[addr]['b'])
+        del test_dict[addr]['b']['c']
+        self.assertEqual(0, test_dict[addr]['b']['c'])
+
     def test_success_array1(self):
         test_array = ArrayDB('test_array', self.db, value_type=int)
 
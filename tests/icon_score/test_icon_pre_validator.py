@@ -24,6 +24,7 @@ from iconservice.deploy.icon_score_deploy_storage import IconScoreDeployStorage
 from iconservice.icon_constant import MAX_DATA_SIZE, FIXED_FEE
 from iconservice.iconscore.icon_pre_validator import IconPreValidator
 from iconservice.icx.icx_engine import IcxEngine
+from iconservice.utils import DataSize
 from tests import create_address
 
 
@@ -97,48 +98,20 @@ class TestTransactionValidator(unittest.TestCase):
         self.validator.execute_to_check_out_of_balance({"version": 3}, ANY)
         self.validator._check_from_can_charge_fee_v3.assert_called_once()
 
-    def test_check_data_size(self):
-        self.validator._get_character_length = Mock()
+    @patch('iconservice.iconscore.icon_pre_validator.get_data_size')
+    def test_check_data_size(self, get_data_size):
         self.validator._check_data_size({})
+        get_data_size.assert_not_called()
 
-        self.validator._get_character_length = Mock(return_value=MAX_DATA_SIZE - 1)
+        get_data_size.return_value = DataSize(length=MAX_DATA_SIZE - 1)
         self.validator._check_data_size({"data": ANY})
 
-        self.validator._get_character_length = Mock(return_value=MAX_DATA_SIZE + 1)
+        get_data_size.return_value = DataSize(length=MAX_DATA_SIZE + 1)
         with self.assertRaises(InvalidRequestException) as e:
             self.validator._check_data_size({"data": ANY})
         self.assertEqual(e.exception.code, ExceptionCode.INVALID_REQUEST)
         self.assertEqual(e.exception.message, "The data field is too big")
 
-    def test_get_character_length(self):
-        KEYS = [f"key{i}" for i in range(8)]
-        VALUES = [f"value{i}" for i in range(9)]
-
-        data = {
-            KEYS[0]: VALUES[0],
-            KEYS[1]: VALUES[1],
-            KEYS[2]: VALUES[2],
-            KEYS[3]: {
-                KEYS[4]: VALUES[3],
-                KEYS[5]: VALUES[4],
-                KEYS[6]: VALUES[5]
-            },
-            KEYS[7]: [
-                VALUES[6],
-                VALUES[7],
-                VALUES[8],
-            ]
-        }
-
-        data_len = 0
-        for key in KEYS:
-            data_len += len(key)
-        for value in VALUES:
-            data_len += len(value)
-
-        ret = self.validator._get_character_length(data)
-        self.assertEqual(data_len, ret)
-
     def test_check_from_can_charge_fee_v2(self):
         self.validator._check_balance = Mock()
 
@@ -162,7 +135,7 @@ class TestTransactionValidator(unittest.TestCase):
         _from = create_address()
         params = {"fee": fee, "from": _from}
         self.validator._check_from_can_charge_fee_v2(params)
-        self.validator._check_balance.assert_called_once_with(_from, 0, fee)
+        self.validator._check_balance.assert_called_once_with(_from, 0, fee, None)
 
         self.validator._check_balance.reset_mock()
         fee = FIXED_FEE
@@ -170,7 +143,7 @@ class TestTransactionValidator(unittest.TestCase):
         value = 12345
         params = {"fee": fee, "from": _from, "value": value}
         self.validator._check_from_can_charge_fee_v2(params)
-        self.validator._check_balance.assert_called_once_with(_from, value, fee)
+        self.validator._check_balance.assert_called_once_with(_from, value, fee, None)
 
     def test_validate_transaction_v2(self):
         self.validator._check_from_can_charge_fee_v2 = Mock()
@@ -270,7 +243,7 @@ class TestTransactionValidator(unittest.TestCase):
         _from = create_address()
         params = {'from': _from}
         self.validator._check_from_can_charge_fee_v3(params, step_price)
-        self.validator._check_balance.assert_called_once_with(_from, 0, 0)
+        self.validator._check_balance.assert_called_once_with(_from, 0, 0, None)
 
         self.validator._check_balance.reset_mock()
         _from = create_address()
@@ -279,7 +252,7 @@ class TestTransactionValidator(unittest.TestCase):
         fee = step_limit * step_price
         params = {'from': _from, 'value': value, 'stepLimit': step_limit}
         self.validator._check_from_can_charge_fee_v3(params, step_price)
-        self.validator._check_balance.assert_called_once_with(_from, value, fee)
+        self.validator._check_balance.assert_called_once_with(_from, value, fee, None)
 
     def test_validate_call_transaction(self):
         self.validator._is_inactive_score = Mock()
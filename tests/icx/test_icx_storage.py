@@ -62,6 +62,24 @@ class TestIcxStorage(unittest.TestCase):
         account2 = self.storage.get_account(context, account.address)
         self.assertEqual(account, account2)
 
+    def test_get_accounts(self):
+        context = self.context
+        account = Account()
+        account.address = create_address(AddressPrefix.EOA)
+        account.deposit(10 ** 19)
+        self.storage.put_account(context, account.address, account)
+
+        new_address = create_address(AddressPrefix.EOA)
+        accounts = self.storage.get_accounts(
+            context, [new_address, account.address])
+
+        self.assertEqual(2, len(accounts))
+        self.assertEqual(new_address, accounts[0].address)
+        self.assertEqual(0, accounts[0].icx)
+        self.assertEqual(account, accounts[1])
+
+        self.storage.delete_account(context, account.address)
+
     def test_delete_account(self):
         context = self.context
         account = Account()
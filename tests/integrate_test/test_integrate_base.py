@@ -66,7 +66,8 @@ class TestIntegrateBase(TestCase):
                                                 ConfigKey.SERVICE_DEPLOYER_WHITELIST: False,
                                                 ConfigKey.SERVICE_SCORE_PACKAGE_VALIDATOR: False}})
         config.update_conf({ConfigKey.SCORE_ROOT_PATH: self._score_root_path,
-                            ConfigKey.STATE_DB_ROOT_PATH: self._state_db_root_path})
+                            ConfigKey.STATE_DB_ROOT_PATH: self._state_db_root_path,
+                            ConfigKey.STATE_DB_BACKEND: 'memory'})
         config.update_conf(self._make_init_config())
 
         self.icon_service_engine = IconServiceEngine()
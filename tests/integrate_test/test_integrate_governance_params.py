@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Governance parameters kept across blocks
+"""
+
+import unittest
+from unittest.mock import patch
+
+from iconservice.base.address import GOVERNANCE_SCORE_ADDRESS, ZERO_SCORE_ADDRESS
+from iconservice.base.exception import ServerErrorException
+from iconservice.icon_constant import ConfigKey
+from iconservice.iconscore.governance_params import GovernanceParams
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateGovernanceParams(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.SERVICE: {ConfigKey.SERVICE_AUDIT: False,
+                                    ConfigKey.SERVICE_FEE: True,
+                                    ConfigKey.SERVICE_DEPLOYER_WHITELIST: False,
+                                    ConfigKey.SERVICE_SCORE_PACKAGE_VALIDATOR: False}}
+
+    def setUp(self):
+        super().setUp()
+
+        tx = self._make_deploy_tx("test_builtin",
+                                  "latest_version/governance",
+                                  self._admin,
+                                  GOVERNANCE_SCORE_ADDRESS)
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(int(True), tx_results[0].status)
+
+        self._step_limit = 1_000_000
+        tx = self._make_icx_send_tx(self._admin, self._addr_array[0], self._icx_factor)
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(int(True), tx_results[0].status)
+
+        self._step_price = self._query({"to": GOVERNANCE_SCORE_ADDRESS,
+                                        "dataType": "call",
+                                        "data": {"method": "getStepPrice", "params": {}}})
+
+    def _make_transfer_tx(self) -> dict:
+        return self._make_icx_send_tx(self._addr_array[0], self._addr_array[1], 1)
+
+    def test_not_reloaded_without_governance_tx(self):
+        with patch.object(GovernanceParams, 'load', side_effect=GovernanceParams.load) as load:
+            for _ in range(2):
+                prev_block, tx_results = self._make_and_req_block([self._make_transfer_tx()])
+                self._write_precommit_state(prev_block)
+                self.assertEqual(self._step_price, tx_results[0].step_price)
+
+        load.assert_not_called()
+
+    def test_reloaded_after_governance_tx(self):
+        step_price = self._step_price * 2
+        tx_list = [
+            self._make_score_call_tx(self._admin, GOVERNANCE_SCORE_ADDRESS, 'setStepPrice',
+                                     {"stepPrice": hex(step_price)}),
+            self._make_transfer_tx()
+        ]
+
+        with patch.object(GovernanceParams, 'load', side_effect=GovernanceParams.load) as load:
+            prev_block, tx_results = self._make_and_req_block(tx_list)
+            self._write_precommit_state(prev_block)
+            self.assertEqual(1, load.call_count)
+
+        self.assertEqual([int(True)] * 2, [tx_result.status for tx_result in tx_results])
+        # The step price is changed from the next block
+        self.assertEqual(self._step_price, tx_results[1].step_price)
+
+        prev_block, tx_results = self._make_and_req_block([self._make_transfer_tx()])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(step_price, tx_results[0].step_price)
+
+    def test_rollback(self):
+        tx = self._make_score_call_tx(self._admin, GOVERNANCE_SCORE_ADDRESS, 'setStepPrice',
+                                      {"stepPrice": hex(self._step_price * 2)})
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self.assertEqual(int(True), tx_results[0].status)
+        self._remove_precommit_state(prev_block)
+
+        prev_block, tx_results = self._make_and_req_block([self._make_transfer_tx()])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(self._step_price, tx_results[0].step_price)
+
+
+class TestIntegrateGovernanceListCache(TestIntegrateBase):
+    def setUp(self):
+        super().setUp()
+
+        tx = self._make_deploy_tx("test_scores",
+                                  "test_db_returns",
+                                  self._addr_array[0],
+                                  ZERO_SCORE_ADDRESS,
+                                  deploy_params={"value": str(self._addr_array[1]),
+                                                 "value1": str(self._addr_array[1])})
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(int(True), tx_results[0].status)
+        self._score_address = tx_results[0].score_address
+
+    def _call(self, from_, to, method: str, params: dict) -> 'TransactionResult':
+        tx = self._make_score_call_tx(from_, to, method, params)
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+        return tx_results[0]
+
+    def _call_score(self) -> 'TransactionResult':
+        return self._call(self._addr_array[0], self._score_address, 'set_value1', {"value": hex(1)})
+
+    def _call_governance(self, method: str, params: dict = None) -> int:
+        if params is None:
+            params = {"address": str(self._score_address)}
+        return self._call(self._admin, GOVERNANCE_SCORE_ADDRESS, method, params).status
+
+    def _get_black_list_cache(self) -> dict:
+        cache = self.icon_service_engine._governance_params.get_list_cache('isInScoreBlackList')
+        return {address: is_in_list for address, (is_in_list, _) in cache.items()}
+
+    def test_score_blacklist(self):
+        self.assertEqual(int(True), self._call_score().status)
+        self.assertEqual({self._score_address: False}, self._get_black_list_cache())
+
+        # The cache is thrown away with the parameters
+        self.assertEqual(int(True), self._call_governance('addToScoreBlackList'))
+        self.assertEqual({}, self._get_black_list_cache())
+        with self.assertRaises(ServerErrorException):
+            self._call_score()
+        self.assertEqual({self._score_address: True}, self._get_black_list_cache())
+
+        self.assertEqual(int(True), self._call_governance('removeFromScoreBlackList'))
+        self.assertEqual(int(True), self._call_score().status)
+
+    def test_steps_on_cache_hit(self):
+        # Changes the value once not to be charged differently from the next calls
+        self.assertEqual(int(True), self._call_score().status)
+        step_used = self._call_score().step_used
+
+        self.assertEqual(int(True), self._call_governance('setStepCost',
+                                                          {"stepType": "get", "cost": hex(100)}))
+        self.assertEqual({}, self._get_black_list_cache())
+
+        # Reads the blacklist
+        tx_result = self._call_score()
+        self.assertEqual(int(True), tx_result.status)
+        cache = self.icon_service_engine._governance_params.get_list_cache('isInScoreBlackList')
+        _, get_counts = cache[self._score_address]
+        self.assertEqual(step_used + 100 * sum(get_counts), tx_result.step_used)
+
+        # The GET steps of reading the blacklist are charged again from the cache
+        self.assertEqual(tx_result.step_used, self._call_score().step_used)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The fast path of EOA to EOA transfers
+"""
+
+import copy
+import unittest
+from unittest.mock import patch
+
+from iconservice.base.address import GOVERNANCE_SCORE_ADDRESS
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_service_engine import IconServiceEngine
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateIcxTransfer(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.SERVICE: {ConfigKey.SERVICE_AUDIT: False,
+                                    ConfigKey.SERVICE_FEE: True,
+                                    ConfigKey.SERVICE_DEPLOYER_WHITELIST: False,
+                                    ConfigKey.SERVICE_SCORE_PACKAGE_VALIDATOR: False}}
+
+    def setUp(self):
+        super().setUp()
+
+        tx = self._make_deploy_tx("test_builtin",
+                                  "latest_version/governance",
+                                  self._admin,
+                                  GOVERNANCE_SCORE_ADDRESS)
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(int(True), tx_results[0].status)
+
+        self._step_limit = 1_000_000
+        tx_list = [self._make_icx_send_tx(self._admin, self._addr_array[i], self._icx_factor)
+                   for i in range(1, 3)]
+        prev_block, tx_results = self._make_and_req_block(tx_list)
+        self._write_precommit_state(prev_block)
+
+        for tx_result in tx_results:
+            self.assertEqual(int(True), tx_result.status)
+
+    def _invoke(self, block, tx_list: list) -> tuple:
+        tx_results, state_root_hash = self.icon_service_engine.invoke(block, copy.deepcopy(tx_list))
+        return [tx_result.to_dict() for tx_result in tx_results], state_root_hash
+
+    def test_same_result_as_general_path(self):
+        value = self._icx_factor // 10
+        tx_list = [
+            self._make_icx_send_tx(self._addr_array[1], self._addr_array[3], value),
+            self._make_icx_send_tx(self._addr_array[1], self._addr_array[1], value),
+            self._make_icx_send_tx(self._addr_array[2], self._fee_treasury, value),
+            self._make_icx_send_tx(self._addr_array[2], self._addr_array[3], 0),
+            self._make_icx_send_tx(self._addr_array[2], self._addr_array[4], value, support_v2=True),
+            # Fails for lack of balance
+            self._make_icx_send_tx(self._addr_array[3], self._addr_array[4], self._icx_factor,
+                                   disable_pre_validate=True),
+            # Can't charge a fee
+            self._make_icx_send_tx(self._addr_array[5], self._addr_array[4], 0,
+                                   disable_pre_validate=True),
+        ]
+        block = self._create_invalid_block()
+
+        fast_result = self._invoke(block, tx_list)
+        self._remove_precommit_state(block)
+
+        with patch.object(IconServiceEngine, '_is_icx_transfer', return_value=False):
+            general_result = self._invoke(block, tx_list)
+        self.assertEqual(general_result, fast_result)
+
+        tx_results = fast_result[0]
+        self.assertEqual([int(True)] * 5 + [int(False)] * 2,
+                         [tx_result['status'] for tx_result in tx_results])
+        self.assertGreater(tx_results[0]['step_price'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
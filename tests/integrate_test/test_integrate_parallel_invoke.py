@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Running the transactions of a block speculatively in parallel
+"""
+
+import copy
+import unittest
+
+from iconservice.base.address import ZERO_SCORE_ADDRESS
+from iconservice.icon_constant import ConfigKey
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateParallelInvoke(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.PARALLEL_INVOKE_WORKERS: 4}
+
+    def setUp(self):
+        super().setUp()
+
+        tx_list = [self._make_deploy_tx("test_scores",
+                                        "test_db_returns",
+                                        self._addr_array[0],
+                                        ZERO_SCORE_ADDRESS,
+                                        deploy_params={"value": str(self._addr_array[1]),
+                                                       "value1": str(self._addr_array[1])})]
+        tx_list.extend(self._make_icx_send_tx(self._genesis, self._addr_array[i], self._icx_factor)
+                       for i in range(1, 4))
+        prev_block, tx_results = self._make_and_req_block(tx_list)
+        self._write_precommit_state(prev_block)
+
+        for tx_result in tx_results:
+            self.assertEqual(int(True), tx_result.status)
+        self._score_address = tx_results[0].score_address
+
+    def _invoke(self, block, tx_list: list) -> tuple:
+        tx_results, state_root_hash = self.icon_service_engine.invoke(block, copy.deepcopy(tx_list))
+        return [tx_result.to_dict() for tx_result in tx_results], state_root_hash
+
+    def _get_status(self) -> dict:
+        return self._query({'filter': ['parallelInvoke']}, 'ise_getStatus')['parallelInvoke']
+
+    def test_same_result_as_sequential_invoke(self):
+        value = self._icx_factor // 10
+        tx_list = [
+            self._make_icx_send_tx(self._genesis, self._addr_array[1], value),
+            # Reads the balance written by the previous one
+            self._make_icx_send_tx(self._addr_array[1], self._addr_array[4], value * 5),
+            self._make_icx_send_tx(self._addr_array[2], self._addr_array[5], value),
+            self._make_score_call_tx(self._addr_array[3], self._score_address, 'set_value1',
+                                     {"value": hex(1)}),
+            # Writes the value written by the previous one without reading it
+            self._make_score_call_tx(self._addr_array[2], self._score_address, 'set_value1',
+                                     {"value": hex(2)}),
+            self._make_score_call_tx(self._addr_array[3], self._score_address, 'set_value2',
+                                     {"value": "value2"}),
+            # Fails for lack of balance
+            self._make_icx_send_tx(self._addr_array[6], self._addr_array[7], value,
+                                   disable_pre_validate=True),
+        ]
+        block = self._create_invalid_block()
+
+        prev_status = self._get_status()
+        parallel_result = self._invoke(block, tx_list)
+        status = self._get_status()
+        self.assertEqual(len(tx_list), status['speculations'] - prev_status['speculations'])
+        self.assertGreaterEqual(status['reexecutions'] - prev_status['reexecutions'], 1)
+        self._remove_precommit_state(block)
+
+        # Runs the block sequentially and gives the executor back to be shut down on close
+        invoke_executor = self.icon_service_engine._invoke_executor
+        self.icon_service_engine._invoke_executor = None
+        try:
+            sequential_result = self._invoke(block, tx_list)
+        finally:
+            self.icon_service_engine._invoke_executor = invoke_executor
+        self.assertEqual(sequential_result, parallel_result)
+
+        tx_results = sequential_result[0]
+        self.assertEqual([int(True)] * 6 + [int(False)],
+                         [tx_result['status'] for tx_result in tx_results])
+
+        self._write_precommit_state(block)
+        self.assertEqual(2, self._query({"to": self._score_address,
+                                         "dataType": "call",
+                                         "data": {"method": "get_value1", "params": {}}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
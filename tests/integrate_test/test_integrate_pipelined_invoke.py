@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Invoking a block on top of an uncommitted parent block
+"""
+
+import copy
+import unittest
+
+from iconservice.base.address import ZERO_SCORE_ADDRESS
+from iconservice.base.block import Block
+from iconservice.base.exception import ServerErrorException
+from tests import create_block_hash
+from tests.integrate_test import create_timestamp
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegratePipelinedInvoke(TestIntegrateBase):
+    def setUp(self):
+        super().setUp()
+
+        tx_list = [self._make_deploy_tx("test_scores",
+                                        "test_db_returns",
+                                        self._addr_array[0],
+                                        ZERO_SCORE_ADDRESS,
+                                        deploy_params={"value": str(self._addr_array[1]),
+                                                       "value1": str(self._addr_array[1])})]
+        tx_list.extend(self._make_icx_send_tx(self._genesis, self._addr_array[i], self._icx_factor)
+                       for i in range(0, 2))
+        prev_block, tx_results = self._make_and_req_block(tx_list)
+        self._write_precommit_state(prev_block)
+
+        for tx_result in tx_results:
+            self.assertEqual(int(True), tx_result.status)
+        self._score_address = tx_results[0].score_address
+
+    def _create_child_block(self, parent: 'Block') -> 'Block':
+        return Block(parent.height + 1, create_block_hash(), create_timestamp(), parent.hash)
+
+    def _invoke(self, block: 'Block', tx_list: list) -> tuple:
+        tx_results, state_root_hash = self.icon_service_engine.invoke(block, copy.deepcopy(tx_list))
+        return [tx_result.to_dict() for tx_result in tx_results], state_root_hash
+
+    def _get_value1(self) -> int:
+        return self._query({"to": self._score_address,
+                            "dataType": "call",
+                            "data": {"method": "get_value1", "params": {}}})
+
+    def _invoke_parent(self) -> tuple:
+        parent_tx_list = [
+            self._make_score_call_tx(self._addr_array[0], self._score_address, 'set_value1',
+                                     {"value": hex(1)}),
+            self._make_icx_send_tx(self._genesis, self._addr_array[2], self._icx_factor)
+        ]
+        parent = self._create_invalid_block()
+        parent_result = self._invoke(parent, parent_tx_list)
+        self.assertEqual([int(True)] * 2, [tx_result['status'] for tx_result in parent_result[0]])
+
+        return parent, parent_tx_list, parent_result
+
+    def test_same_result_as_sequential_invoke(self):
+        parent, parent_tx_list, parent_result = self._invoke_parent()
+
+        value = self._icx_factor // 10
+        child_tx_list = [
+            # Spends the balance given in the parent block
+            self._make_icx_send_tx(self._addr_array[2], self._addr_array[3], value,
+                                   disable_pre_validate=True),
+            # Overwrites the value written in the parent block
+            self._make_score_call_tx(self._addr_array[1], self._score_address, 'set_value1',
+                                     {"value": hex(2)}),
+            # Fails for lack of balance
+            self._make_icx_send_tx(self._addr_array[4], self._addr_array[5], value,
+                                   disable_pre_validate=True),
+        ]
+        child = self._create_child_block(parent)
+        pipelined_result = self._invoke(child, child_tx_list)
+        self.assertEqual([int(True)] * 2 + [int(False)],
+                         [tx_result['status'] for tx_result in pipelined_result[0]])
+
+        # The child can't be committed before its parent
+        with self.assertRaises(ServerErrorException):
+            self.icon_service_engine.commit(child)
+
+        # Invokes the same blocks one by one
+        self._remove_precommit_state(parent)
+        self.assertEqual(parent_result, self._invoke(parent, parent_tx_list))
+        self._write_precommit_state(parent)
+        self.assertEqual(pipelined_result, self._invoke(child, child_tx_list))
+
+        self._write_precommit_state(child)
+        self.assertEqual(2, self._get_value1())
+        self.assertEqual(value, self._query({"address": self._addr_array[3]}, 'icx_getBalance'))
+
+    def test_rollback_parent(self):
+        parent, _, _ = self._invoke_parent()
+
+        child = self._create_child_block(parent)
+        child_tx_list = [self._make_icx_send_tx(self._addr_array[2], self._addr_array[3],
+                                                self._icx_factor // 10, disable_pre_validate=True)]
+        self._invoke(child, child_tx_list)
+
+        # The child is discarded with its parent
+        self._remove_precommit_state(parent)
+        for block in (parent, child):
+            with self.assertRaises(ServerErrorException):
+                self.icon_service_engine.commit(block)
+
+        self.assertEqual(0, self._query({"address": self._addr_array[2]}, 'icx_getBalance'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Queries at a past block height
+"""
+
+import unittest
+
+from iconservice.base.exception import InvalidParamsException
+from iconservice.icon_constant import ConfigKey
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateStateHistory(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.STATE_DB_HISTORY_RETENTION: 2}
+
+    def _send_icx(self, value: int) -> int:
+        prev_block, tx_results = self._make_and_req_block([
+            self._make_icx_send_tx(self._genesis, self._addr_array[0], value)
+        ])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(int(True), tx_results[0].status)
+        return prev_block.height
+
+    def test_query_at_block_height(self):
+        value = 1 * self._icx_factor
+        genesis_height = self._block_height - 1
+        heights = [self._send_icx(value) for _ in range(3)]
+
+        for i, height in enumerate(heights):
+            response = self._query(
+                {"address": self._addr_array[0], "blockHeight": height}, 'icx_getBalance')
+            self.assertEqual((i + 1) * value, response)
+
+        # The latest block
+        response = self._query({"address": self._addr_array[0]}, 'icx_getBalance')
+        self.assertEqual(3 * value, response)
+
+        # Retains the states of 2 blocks before the last one
+        with self.assertRaises(InvalidParamsException):
+            self._query({"address": self._addr_array[0], "blockHeight": genesis_height},
+                        'icx_getBalance')
+        with self.assertRaises(InvalidParamsException):
+            self._query({"blockHeight": heights[-1] + 1}, 'icx_getTotalSupply')
+
+        status = self._query({'filter': ['stateDbHistory']}, 'ise_getStatus')
+        self.assertEqual(heights[0], status['stateDbHistory']['oldestBlockHeight'])
+        self.assertEqual(heights[-1], status['stateDbHistory']['lastBlockHeight'])
+
+
+if __name__ == '__main__':
+    unittest.main()
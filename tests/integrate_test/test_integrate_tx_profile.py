@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measuring each phase of transactions
+"""
+
+import unittest
+
+from iconservice.base.address import ZERO_SCORE_ADDRESS
+from iconservice.icon_constant import ConfigKey
+from iconservice.iconscore.tx_profile import TxPhase
+from tests.integrate_test.test_integrate_base import TestIntegrateBase
+
+
+class TestIntegrateTxProfile(TestIntegrateBase):
+    def _make_init_config(self) -> dict:
+        return {ConfigKey.TX_PROFILE: True, ConfigKey.TX_PROFILE_SLOWEST: 2}
+
+    def setUp(self):
+        super().setUp()
+
+        tx = self._make_deploy_tx("test_scores",
+                                  "test_db_returns",
+                                  self._addr_array[0],
+                                  ZERO_SCORE_ADDRESS,
+                                  deploy_params={"value": str(self._addr_array[1]),
+                                                 "value1": str(self._addr_array[1])})
+        prev_block, tx_results = self._make_and_req_block([tx])
+        self._write_precommit_state(prev_block)
+        self.assertEqual(int(True), tx_results[0].status)
+        self._score_address = tx_results[0].score_address
+
+    def test_profile(self):
+        tx_list = [
+            self._make_icx_send_tx(self._genesis, self._addr_array[1], self._icx_factor),
+            self._make_score_call_tx(self._addr_array[0], self._score_address, 'set_value1',
+                                     {"value": hex(1)}),
+            # Fails for lack of balance
+            self._make_icx_send_tx(self._addr_array[2], self._addr_array[3], self._icx_factor,
+                                   disable_pre_validate=True)
+        ]
+        prev_block, tx_results = self._make_and_req_block(tx_list)
+        self._write_precommit_state(prev_block)
+        self.assertEqual([int(True)] * 2 + [int(False)],
+                         [tx_result.status for tx_result in tx_results])
+
+        profile = tx_results[0].profile
+        for phase in (TxPhase.PREPARE, TxPhase.BALANCE_CHECK, TxPhase.TRANSFER, TxPhase.FEE):
+            self.assertIn(phase, profile.phases)
+        self.assertNotIn(TxPhase.SCORE_CALL, profile.phases)
+        self.assertGreater(profile.db_reads, 0)
+        self.assertGreater(profile.db_writes, 0)
+
+        profile = tx_results[1].profile
+        self.assertIn(TxPhase.SCORE_CALL, profile.phases)
+        self.assertIn(TxPhase.BLOOM, profile.phases)
+        self.assertGreater(profile.db_reads, 0)
+        self.assertGreater(profile.db_writes, 0)
+        self.assertEqual(0, profile.internal_calls)
+
+        # The failed transfer is charged no fee and writes nothing
+        profile = tx_results[2].profile
+        self.assertEqual(0, profile.db_writes)
+
+        for tx_result in tx_results:
+            self.assertNotIn('profile', tx_result.to_dict())
+
+        status = self._query({'filter': ['txProfile']}, 'ise_getStatus')['txProfile']
+        self.assertEqual(prev_block.height, status['blockHeight'])
+        self.assertEqual(2, len(status['transactions']))
+        totals = [tx['total'] for tx in status['transactions']]
+        self.assertEqual(sorted(totals, reverse=True), totals)
+        for tx in status['transactions']:
+            tx_result = tx_results[tx['txIndex']]
+            self.assertEqual(f'0x{tx_result.tx_hash.hex()}', tx['txHash'])
+            self.assertEqual(tx_result.profile.total, tx['total'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -49,6 +49,9 @@ class MockPlyvelDB(object):
     def write_batch(self, *args, **kwargs) -> 'MockWriteBatch':
         return MockWriteBatch(self)
 
+    def snapshot(self) -> 'MockPlyvelDB':
+        return MockPlyvelDB(dict(self._db))
+
 
 class MockWriteBatch(object):
     """ WriteBatch(DB db, bytes prefix, bool transaction, sync) """
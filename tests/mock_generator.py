@@ -51,9 +51,13 @@ def generate_inner_task(
     def get(self, key):
         return memory_db.get(key)
 
+    def exists(self, key):
+        return bool(memory_db.get(key))
+
     context_db = Mock(spec=ContextDatabase)
     context_db.get = get
     context_db.put = put
+    context_db.exists = exists
 
     db_factory_create_by_name.return_value = context_db
     inner_task = IconScoreInnerTask(IconConfig("", default_icon_config))
@@ -76,6 +80,9 @@ def generate_inner_task(
     # Ignores icx transfer
     inner_task._icon_service_engine._icx_engine._transfer = Mock()
 
+    # No block has been committed to the mocked state db
+    inner_task._icon_service_engine._icx_storage.get_block_info = Mock(return_value=None)
+
     return inner_task
 
 
@@ -113,6 +120,9 @@ def generate_service_engine(
     # Mocks get_balance so, it returns always 100 icx
     service_engine._icx_engine.get_balance = Mock(return_value=100 * 10 ** 18)
 
+    # No block has been committed to the mocked state db
+    service_engine._icx_storage.get_block_info = Mock(return_value=None)
+
     return service_engine
 
 
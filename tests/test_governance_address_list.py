@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from iconservice.base.address import Address, AddressPrefix
+from iconservice.builtin_scores.governance.governance import AddressList
+from iconservice.database.db import ContextDatabase, IconScoreDatabase
+from iconservice.iconscore.icon_container_db import ArrayDB
+from iconservice.iconscore.icon_score_context import ContextContainer, IconScoreContextFactory
+from iconservice.iconscore.icon_score_context import IconScoreContextType
+from tests import create_address
+from tests.mock_db import MockKeyValueDatabase
+
+
+class TestAddressList(unittest.TestCase):
+
+    def setUp(self):
+        mock_db = MockKeyValueDatabase.create_db()
+        self.db = IconScoreDatabase(create_address(), ContextDatabase(mock_db))
+        self._factory = IconScoreContextFactory(max_size=1)
+        self._context = self._factory.create(IconScoreContextType.DIRECT)
+        ContextContainer._push_context(self._context)
+
+        self.addresses = [create_address(AddressPrefix.CONTRACT) for _ in range(4)]
+
+    def tearDown(self):
+        ContextContainer._clear_context()
+        self.db = None
+
+    def test_put_and_remove(self):
+        address_list = AddressList('list', self.db)
+        for address in self.addresses:
+            address_list.put(address)
+        address_list.put(self.addresses[0])
+        self.assertEqual(self.addresses, list(address_list))
+
+        address_list.remove(self.addresses[1])
+        self.assertEqual([self.addresses[0], self.addresses[3], self.addresses[2]], list(address_list))
+
+        # The topmost one
+        address_list.remove(self.addresses[2])
+        self.assertEqual([self.addresses[0], self.addresses[3]], list(address_list))
+
+        address_list.remove(self.addresses[0])
+        self.assertEqual([self.addresses[3]], list(address_list))
+
+        address_list = AddressList('list', self.db)
+        self.assertEqual(1, len(address_list))
+        for address in self.addresses[:3]:
+            self.assertNotIn(address, address_list)
+        self.assertIn(self.addresses[3], address_list)
+
+    def test_remove_absent_address(self):
+        address_list = AddressList('list', self.db)
+        for address in self.addresses[:3]:
+            address_list.put(address)
+
+        # The topmost one is removed as ArrayDB has been used without the index
+        address_list.remove(self.addresses[3])
+        self.assertEqual(self.addresses[:2], list(address_list))
+        self.assertNotIn(self.addresses[2], address_list)
+
+        address_list.put(self.addresses[2])
+        self.assertEqual(self.addresses[:3], list(address_list))
+
+        address_list.remove(self.addresses[0])
+        address_list.remove(self.addresses[1])
+        address_list.remove(self.addresses[2])
+        self.assertEqual(0, len(address_list))
+
+        # Nothing happens on an empty list
+        address_list.remove(self.addresses[0])
+        self.assertEqual(0, len(address_list))
+
+    def test_migrate(self):
+        # The list put without the index
+        array_db = ArrayDB('list', self.db, value_type=Address)
+        for address in self.addresses[:3]:
+            array_db.put(address)
+
+        address_list = AddressList('list', self.db)
+        self.assertNotIn(self.addresses[0], address_list)
+
+        address_list.migrate()
+        for address in self.addresses[:3]:
+            self.assertIn(address, address_list)
+        self.assertNotIn(self.addresses[3], address_list)
+
+        address_list.remove(self.addresses[0])
+        self.assertEqual([self.addresses[2], self.addresses[1]], list(address_list))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -136,6 +136,34 @@ class TestIconServiceEngine(unittest.TestCase):
         self.assertTrue(isinstance(balance, int))
         self.assertEqual(self._total_supply, balance)
 
+    def test_query_during_commit(self):
+        block = Block(
+            block_height=1,
+            block_hash=create_block_hash(),
+            timestamp=0,
+            prev_hash=self.genesis_block.hash)
+        self._engine.invoke(block, [])
+
+        _call = self._engine._call
+
+        def call_with_commit(context, method, params):
+            # A block is committed while the query is running
+            self._engine.commit(block)
+            return context.block.height, _call(context, method, params)
+
+        self._engine._call = Mock(side_effect=call_with_commit)
+
+        height, balance = self._engine.query('icx_getBalance', {'address': self.from_})
+        self.assertEqual(self.genesis_block.height, height)
+        self.assertEqual(self._total_supply, balance)
+        self.assertEqual(block.height, self._engine._icx_storage.last_block.height)
+
+        self._engine._call = _call
+        snapshot = self._engine._icx_context_db.get_snapshot()
+        self.assertEqual(block.height,
+                         self._engine._icx_storage.get_block_info(snapshot).height)
+        snapshot.release()
+
     def test_call_on_query(self):
         context = context_factory.create(IconScoreContextType.QUERY)
 
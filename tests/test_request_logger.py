@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest.mock import patch
+
+from iconservice.base.exception import ExceptionCode
+from iconservice.utils.request_logger import RequestLogger, format_bounded
+
+TAG = 'test'
+
+
+class _Value(object):
+    """Counts how many times it is formatted
+    """
+    formatted = 0
+
+    def __repr__(self):
+        _Value.formatted += 1
+        return 'value'
+
+
+class TestRequestLogger(unittest.TestCase):
+
+    def test_format_bounded(self):
+        value = {'a': [1, 'xy'], 'b': None}
+        self.assertEqual(str(value), format_bounded(value, 100))
+        self.assertEqual(str(value)[:10] + '...', format_bounded(value, 10))
+
+        # Only the head of a long value is formatted
+        _Value.formatted = 0
+        self.assertEqual("['aaaaa...", format_bounded(['a' * 100000, [_Value()] * 1000], 7))
+        self.assertEqual(0, _Value.formatted)
+
+    @patch('iconservice.utils.request_logger.Logger')
+    def test_lazy_and_truncated(self, logger):
+        request_logger = RequestLogger(TAG, max_field_length=5)
+        _Value.formatted = 0
+
+        request_logger.log_request('invoke', {'block': _Value(), 'transactions': 'x' * 100})
+        self.assertEqual(1, logger.info.call_count)
+        self.assertEqual(0, _Value.formatted)
+
+        message, tag = logger.info.call_args[0]
+        self.assertEqual(TAG, tag)
+        self.assertEqual("invoke request block=value, transactions='xxxx...", str(message))
+
+    @patch('iconservice.utils.request_logger.Logger')
+    def test_sampling(self, logger):
+        request_logger = RequestLogger(TAG, {'query': 0.25, 'validate_transaction': 0.0})
+
+        sampled = []
+        for i in range(8):
+            logger.info.reset_mock()
+            request_logger.log_request('query', {})
+            request_logger.log_response('query', {})
+            request_logger.log_request('validate_transaction', {})
+            sampled.append(logger.info.call_count)
+
+        # The request and the response of every 4th call
+        self.assertEqual([0, 0, 0, 2, 0, 0, 0, 2], sampled)
+
+        logger.info.reset_mock()
+        request_logger.log_request('invoke', {})
+        logger.info.assert_called_once()
+
+    @patch('iconservice.utils.request_logger.Logger')
+    def test_failures(self, logger):
+        request_logger = RequestLogger(TAG)
+        for _ in range(3):
+            request_logger.count_failure('validate_transaction', ExceptionCode.INVALID_REQUEST)
+        request_logger.count_failure('query', ExceptionCode.SERVER_ERROR)
+
+        self.assertEqual({'validate_transaction': {ExceptionCode.INVALID_REQUEST: 3},
+                          'query': {ExceptionCode.SERVER_ERROR: 1}},
+                         request_logger.get_failures())
+
+        request_logger.flush_failures()
+        logger.info.assert_called_once()
+        self.assertEqual({}, request_logger.get_failures())
+
+        logger.info.reset_mock()
+        request_logger.flush_failures()
+        logger.info.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest.mock import patch
+
+from iconservice.base.block import Block
+from iconservice.base.transaction import Transaction
+from iconservice.iconscore.icon_score_result import TransactionResult
+from iconservice.iconscore.tx_profile import TransactionProfile, TxPhase, get_slowest_transactions
+from tests import create_block_hash, create_tx_hash
+
+
+class TestTransactionProfile(unittest.TestCase):
+
+    def _create_profile(self, perf_counter, *phases) -> 'TransactionProfile':
+        with patch('iconservice.iconscore.tx_profile.perf_counter', side_effect=perf_counter):
+            profile = TransactionProfile()
+            for phase in phases:
+                if phase is None:
+                    profile.pause()
+                else:
+                    profile.enter(phase)
+
+        return profile
+
+    def test_phases(self):
+        profile = self._create_profile(
+            [0.0, 1.0, 3.0, 4.0, 10.0, 10.5],
+            TxPhase.BALANCE_CHECK, TxPhase.SCORE_CALL, None, TxPhase.FEE, None)
+
+        self.assertEqual({TxPhase.PREPARE: 1.0,
+                          TxPhase.BALANCE_CHECK: 2.0,
+                          TxPhase.SCORE_CALL: 1.0,
+                          TxPhase.FEE: 0.5}, profile.phases)
+        # The time while paused is not counted
+        self.assertEqual(4.5, profile.total)
+
+    def test_enter_phase_again(self):
+        profile = self._create_profile(
+            [0.0, 1.0, 2.0, 4.0], TxPhase.SCORE_CALL, TxPhase.PREPARE, None)
+
+        self.assertEqual({TxPhase.PREPARE: 3.0, TxPhase.SCORE_CALL: 1.0}, profile.phases)
+
+    def test_to_dict(self):
+        profile = self._create_profile([0.0, 1.0], None)
+        profile.on_db_read(3, 0.25)
+        profile.on_db_write(0.5)
+        profile.on_event_log(0.125)
+        profile.on_internal_call()
+
+        self.assertEqual({
+            'total': 1.0,
+            'phases': {TxPhase.PREPARE: 1.0},
+            'dbReads': {'count': 3, 'time': 0.25},
+            'dbWrites': {'count': 1, 'time': 0.5},
+            'eventLogs': {'count': 1, 'time': 0.125},
+            'internalCalls': 1
+        }, profile.to_dict())
+
+    def test_get_slowest_transactions(self):
+        block = Block(1, create_block_hash(), 0, create_block_hash())
+        tx_results = []
+        for i, total in enumerate([2.0, None, 3.0, 1.0]):
+            tx_result = TransactionResult(Transaction(create_tx_hash(), i), block)
+            if total is not None:
+                tx_result.profile = self._create_profile([0.0, total], None)
+            tx_results.append(tx_result)
+
+        slowest = get_slowest_transactions(tx_results, 2)
+        self.assertEqual([2, 0], [profile['txIndex'] for profile in slowest])
+        self.assertEqual([3.0, 2.0], [profile['total'] for profile in slowest])
+        self.assertEqual(f'0x{tx_results[2].tx_hash.hex()}', slowest[0]['txHash'])
+
+        self.assertEqual(3, len(get_slowest_transactions(tx_results, 5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
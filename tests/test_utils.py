@@ -17,7 +17,7 @@
 
 import unittest
 
-from iconservice.utils import is_lowercase_hex_string
+from iconservice.utils import is_lowercase_hex_string, measure_data, get_data_size, DATA_SIZE_KEY
 
 
 class TestUtils(unittest.TestCase):
@@ -36,6 +36,72 @@ class TestUtils(unittest.TestCase):
         a = '72917492AF'
         self.assertFalse(is_lowercase_hex_string(a))
 
+        self.assertFalse(is_lowercase_hex_string('abc\n'))
+        self.assertFalse(is_lowercase_hex_string(b'abc'))
+        self.assertFalse(is_lowercase_hex_string(None))
+
+    def test_measure_data_length(self):
+        KEYS = [f"key{i}" for i in range(8)]
+        VALUES = [f"value{i}" for i in range(9)]
+
+        data = {
+            KEYS[0]: VALUES[0],
+            KEYS[1]: VALUES[1],
+            KEYS[2]: VALUES[2],
+            KEYS[3]: {
+                KEYS[4]: VALUES[3],
+                KEYS[5]: VALUES[4],
+                KEYS[6]: VALUES[5]
+            },
+            KEYS[7]: [
+                VALUES[6],
+                VALUES[7],
+                VALUES[8],
+            ]
+        }
+
+        data_len = 0
+        for key in KEYS:
+            data_len += len(key)
+        for value in VALUES:
+            data_len += len(value)
+
+        data_size = measure_data(data)
+        self.assertEqual(data_len, data_size.length)
+        # Keys are not counted as bytes
+        self.assertEqual(data_len - sum(len(key) for key in KEYS), data_size.byte_length)
+        self.assertEqual(0, data_size.content_byte_length)
+
+    def test_measure_data_byte_length(self):
+        data = {
+            "contentType": "application/zip",
+            "content": "0x" + "ab" * 10 + "c",
+            "params": {"name": "\ud55c\uae00", "value": "0x10", "values": [1, 0, True, 256]}
+        }
+
+        data_size = measure_data(data)
+        self.assertEqual(11, data_size.content_byte_length)
+        # utf-8 strings, hex strings with a odd number of digits and ints
+        self.assertEqual(15 + 11 + 6 + 1 + 1 + 1 + 2, data_size.byte_length)
+        self.assertEqual(len("contentType") + 15 + len("content") + 23 + len("params")
+                         + len("name") + 2 + len("value") + 4 + len("values"),
+                         data_size.length)
+
+        data_size = measure_data("message")
+        self.assertEqual((7, 7, 0),
+                         (data_size.length, data_size.byte_length, data_size.content_byte_length))
+        self.assertEqual(0, measure_data(None).byte_length)
+
+    def test_get_data_size(self):
+        params = {"data": {"method": "transfer"}}
+        data_size = get_data_size(params)
+        self.assertIs(data_size, params[DATA_SIZE_KEY])
+
+        # Measured once even if data changes afterwards
+        params["data"]["method"] = "a" * 100
+        self.assertIs(data_size, get_data_size(params))
+        self.assertEqual(8, data_size.byte_length)
+
 
 if __name__ == '__main__':
     unittest.main()
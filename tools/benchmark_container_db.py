@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Micro-benchmark of the key building cost of container dbs
+
+It measures lookups like Governance._score_status[address][CURRENT][key]
+on an in-memory state db, so disk I/O is excluded.
+
+usage: python -m tools.benchmark_container_db [-n count]
+"""
+
+import argparse
+import os
+import timeit
+
+from iconservice.base.address import Address, AddressPrefix
+from iconservice.database.backend import MemoryDB
+from iconservice.database.db import KeyValueDatabase, ContextDatabase, IconScoreDatabase
+from iconservice.icon_constant import IconScoreContextType
+from iconservice.iconscore.icon_container_db import DictDB, VarDB
+from iconservice.iconscore.icon_score_context import ContextContainer, IconScoreContextFactory
+
+CURRENT = 'current'
+STATUS = 'status'
+
+
+def _create_db() -> 'IconScoreDatabase':
+    context_db = ContextDatabase(KeyValueDatabase(MemoryDB()))
+    address = Address.from_data(AddressPrefix.CONTRACT, b'governance')
+    return IconScoreDatabase(address, context_db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='container db micro-benchmark')
+    parser.add_argument('-n', dest='count', type=int, default=100000,
+                        help='the number of lookups for each case')
+    args = parser.parse_args()
+
+    context = IconScoreContextFactory(max_size=1).create(IconScoreContextType.DIRECT)
+    ContextContainer._push_context(context)
+
+    db = _create_db()
+    score_status = DictDB('score_status', db, value_type=bytes, depth=3)
+    var_db = VarDB('var', db, value_type=int)
+    score_addresses = [Address.from_data(AddressPrefix.CONTRACT, os.urandom(20))
+                       for _ in range(100)]
+    for address in score_addresses:
+        score_status[address][CURRENT][STATUS] = b'active'
+    var_db.set(1)
+
+    address = score_addresses[0]
+    cases = [
+        ('Address.to_bytes()', lambda: address.to_bytes()),
+        ('IconScoreDatabase.get()', lambda: db.get(b'key')),
+        ('VarDB.get()', lambda: var_db.get()),
+        ('DictDB[address][CURRENT][key]', lambda: score_status[address][CURRENT][STATUS]),
+    ]
+
+    for name, func in cases:
+        elapsed = min(timeit.repeat(func, number=args.count, repeat=3))
+        print(f'{name:32} {elapsed * 10 ** 9 / args.count:10.1f} ns/access')
+
+    ContextContainer._clear_context()
+
+
+if __name__ == '__main__':
+    main()
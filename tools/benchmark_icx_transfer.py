@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of blocks of EOA to EOA icx transfers
+
+Blocks of transfers between random accounts are invoked and committed
+on an in-memory state db, once through the general transaction path
+and once through the transfer fast path. Both must end with the same state root hash.
+
+usage: python -m tools.benchmark_icx_transfer [-b blocks] [-t txs] [-a accounts]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from iconcommons.icon_config import IconConfig
+
+from iconservice.base.address import Address, AddressPrefix
+from iconservice.base.block import Block
+from iconservice.icon_config import default_icon_config
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_service_engine import IconServiceEngine
+
+_ICX_FACTOR = 10 ** 18
+_SIGNATURE = 'VAia7YZ2Ji6igKWzjR2YsGa2m53nKPrfK7uXYW78QLE+ATehAVZPC40szvAiA6NEU5gCYB4c4qaQzqDh2ugcHgA='
+
+
+def _create_address(rand: 'random.Random') -> 'Address':
+    return Address.from_bytes(rand.getrandbits(160).to_bytes(20, 'big'))
+
+
+def _create_hash(rand: 'random.Random') -> bytes:
+    return rand.getrandbits(256).to_bytes(32, 'big')
+
+
+def _open_engine(root_dir: str) -> 'IconServiceEngine':
+    conf = IconConfig('', default_icon_config)
+    conf.load()
+    conf.update_conf({ConfigKey.BUILTIN_SCORE_OWNER: str(Address.from_data(AddressPrefix.EOA, b'owner')),
+                      ConfigKey.SCORE_ROOT_PATH: os.path.join(root_dir, '.score'),
+                      ConfigKey.STATE_DB_ROOT_PATH: os.path.join(root_dir, '.statedb'),
+                      ConfigKey.STATE_DB_BACKEND: 'memory'})
+    # Charges fees as the main network does
+    conf.update_conf({ConfigKey.SERVICE: {ConfigKey.SERVICE_AUDIT: False,
+                                          ConfigKey.SERVICE_FEE: True,
+                                          ConfigKey.SERVICE_DEPLOYER_WHITELIST: False,
+                                          ConfigKey.SERVICE_SCORE_PACKAGE_VALIDATOR: False}})
+
+    engine = IconServiceEngine()
+    engine.open(conf)
+    return engine
+
+
+def _make_genesis_request(rand: 'random.Random', accounts: list) -> dict:
+    genesis_accounts = [{'name': 'fee_treasury', 'address': _create_address(rand), 'balance': 0}]
+    genesis_accounts.extend(
+        {'name': f'account{i}', 'address': address, 'balance': 1000 * _ICX_FACTOR}
+        for i, address in enumerate(accounts))
+
+    return {
+        'method': 'icx_sendTransaction',
+        'params': {'txHash': _create_hash(rand), 'version': 3, 'timestamp': 0},
+        'genesisData': {'accounts': genesis_accounts}
+    }
+
+
+def _make_transfer_request(rand: 'random.Random', accounts: list, timestamp: int) -> dict:
+    from_, to = rand.sample(accounts, 2)
+    return {
+        'method': 'icx_sendTransaction',
+        'params': {
+            'version': 3,
+            'from': from_,
+            'to': to,
+            'value': rand.randint(1, _ICX_FACTOR),
+            'stepLimit': 1_000_000,
+            'timestamp': timestamp,
+            'nonce': 0,
+            'signature': _SIGNATURE,
+            'txHash': _create_hash(rand)
+        }
+    }
+
+
+def _run(fast_path: bool, args) -> tuple:
+    """Returns (transfers per second, the last state root hash)
+    """
+    rand = random.Random(0)
+    accounts = [_create_address(rand) for _ in range(args.accounts)]
+
+    root_dir = tempfile.mkdtemp()
+    engine = _open_engine(root_dir)
+    if not fast_path:
+        engine._is_icx_transfer = lambda params: False
+
+    try:
+        prev_hash = None
+        blocks = [[_make_genesis_request(rand, accounts)]]
+        for height in range(1, args.blocks + 1):
+            blocks.append([_make_transfer_request(rand, accounts, height * 1000 + i)
+                           for i in range(args.txs)])
+
+        elapsed = 0.0
+        state_root_hash = None
+        for height, tx_requests in enumerate(blocks):
+            block = Block(height, _create_hash(rand), height * 1000, prev_hash)
+
+            start_time = time.perf_counter()
+            _, state_root_hash = engine.invoke(block, tx_requests)
+            if height > 0:
+                elapsed += time.perf_counter() - start_time
+
+            engine.commit(block)
+            prev_hash = block.hash
+    finally:
+        engine.close()
+        shutil.rmtree(root_dir)
+
+    return args.blocks * args.txs / elapsed, state_root_hash
+
+
+def main():
+    parser = argparse.ArgumentParser(description='icx transfer benchmark')
+    parser.add_argument('-b', dest='blocks', type=int, default=20,
+                        help='the number of blocks to invoke')
+    parser.add_argument('-t', dest='txs', type=int, default=1000,
+                        help='the number of transfers in a block')
+    parser.add_argument('-a', dest='accounts', type=int, default=10000,
+                        help='the number of accounts which transfer icx')
+    args = parser.parse_args()
+
+    general_tps, general_hash = _run(False, args)
+    fast_tps, fast_hash = _run(True, args)
+
+    print(f'{"general path":14} {general_tps:10.1f} transfers/s')
+    print(f'{"fast path":14} {fast_tps:10.1f} transfers/s ({fast_tps / general_tps:.2f}x)')
+    if general_hash != fast_hash:
+        print(f'State root hash mismatch: {general_hash.hex()} != {fast_hash.hex()}')
+
+
+if __name__ == '__main__':
+    main()
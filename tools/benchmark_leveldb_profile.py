@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Replays a synthetic state db workload under LevelDB profiles
+
+Blocks of ICX account and SCORE states are written with write_batch,
+then the db is reopened and existing keys and absent keys are read at random.
+Use the result to choose stateDbProfiles in the configuration.
+
+usage: python -m tools.benchmark_leveldb_profile [-b blocks] [-s states] [-r reads]
+                                                 [-p profile.json] [-d dir]
+
+profile.json is a dict of name: profile to measure instead of the presets.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from iconservice.database.db import KeyValueDatabase
+from iconservice.database.profile import PRESET_PROFILES, get_leveldb_options
+
+_SCORE_COUNT = 100
+
+
+def _create_key(rand: 'random.Random', score_addresses: list) -> bytes:
+    if rand.random() < 0.5:
+        # ICX account
+        return rand.getrandbits(160).to_bytes(20, 'big')
+
+    address = rand.choice(score_addresses)
+    return b'|'.join([address, rand.getrandbits(256).to_bytes(32, 'big')])
+
+
+def _get_dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def _run(path: str, options: dict, args) -> dict:
+    rand = random.Random(0)
+    score_addresses = [b'\x01' + rand.getrandbits(160).to_bytes(20, 'big')
+                       for _ in range(_SCORE_COUNT)]
+    keys = []
+
+    db = KeyValueDatabase.from_path(path, options=options)
+    start_time = time.perf_counter()
+    for _ in range(args.blocks):
+        states = {}
+        for _ in range(args.states):
+            key = _create_key(rand, score_addresses)
+            states[key] = os.urandom(rand.randint(32, 128))
+        db.write_batch(states)
+        keys.extend(states)
+    write_time = time.perf_counter() - start_time
+    db.close()
+
+    # Reads from table files rather than the memtable
+    db = KeyValueDatabase.from_path(path, options=options)
+
+    start_time = time.perf_counter()
+    for _ in range(args.reads):
+        db.get(rand.choice(keys))
+    hit_time = time.perf_counter() - start_time
+
+    absent_keys = [_create_key(rand, score_addresses) for _ in range(args.reads)]
+    start_time = time.perf_counter()
+    for key in absent_keys:
+        db.get(key)
+    miss_time = time.perf_counter() - start_time
+    db.close()
+
+    return {
+        'writeMsPerBlock': write_time * 1000 / args.blocks,
+        'hitReadUs': hit_time * 1000000 / args.reads,
+        'missReadUs': miss_time * 1000000 / args.reads,
+        'diskMB': _get_dir_size(path) / 1024 / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='LevelDB profile benchmark')
+    parser.add_argument('-b', dest='blocks', type=int, default=1000,
+                        help='the number of blocks to write')
+    parser.add_argument('-s', dest='states', type=int, default=200,
+                        help='the number of states in a block')
+    parser.add_argument('-r', dest='reads', type=int, default=100000,
+                        help='the number of reads for each of existing and absent keys')
+    parser.add_argument('-p', dest='profile_path', default=None,
+                        help='json file of name: profile to measure instead of the presets')
+    parser.add_argument('-d', dest='root_dir', default=None,
+                        help='the directory where dbs are created')
+    args = parser.parse_args()
+
+    if args.profile_path:
+        with open(args.profile_path) as f:
+            profiles = json.load(f)
+    else:
+        profiles = PRESET_PROFILES
+
+    root_dir = tempfile.mkdtemp(dir=args.root_dir)
+    try:
+        print(f'{"profile":16} {"write ms/block":>15} {"hit read us":>12} '
+              f'{"miss read us":>13} {"disk MB":>8}')
+        for name, profile in profiles.items():
+            path = os.path.join(root_dir, name)
+            result = _run(path, get_leveldb_options(profile), args)
+            print(f'{name:16} {result["writeMsPerBlock"]:15.2f} {result["hitReadUs"]:12.2f} '
+                  f'{result["missReadUs"]:13.2f} {result["diskMB"]:8.1f}')
+    finally:
+        shutil.rmtree(root_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 ICON Foundation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Replays recorded blocks through IconServiceEngine offline
+
+A recording is a file of json lines, one per request of chain engine:
+
+    {"method": "invoke", "request": {...}, "response": {...}}
+    {"method": "write_precommit_state", "request": {...}}
+    {"method": "remove_precommit_state", "request": {...}}
+
+request is the one IconScoreInnerTask receives and response is the one it returned.
+Requests are converted and run as IconScoreInnerTask does, and the state root hash
+and the tx results of each block are compared with the recorded response if any.
+Blocks at or below the last block in the state db are skipped, so a replay can start
+from a snapshot imported with -s. The SCORE root path should have the SCOREs deployed
+until the snapshot.
+
+It reports blocks and transactions per second of the time taken by the requests
+and the latency percentiles of each phase.
+
+usage: python -m tools.replay_blocks recording [-c config.json] [-sc score_root]
+                                               [-st state_db_root] [-s snapshot] [-x]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from iconcommons.icon_config import IconConfig
+
+from iconservice.base.block import Block
+from iconservice.base.exception import ExceptionCode, IconServiceBaseException
+from iconservice.base.type_converter import TypeConverter, ParamType
+from iconservice.database.factory import ContextDatabaseFactory
+from iconservice.database.key_filter import KEY_FILTER_NAME
+from iconservice.database.snapshot_file import import_snapshot, IMPORT_PROGRESS_NAME
+from iconservice.icon_config import default_icon_config
+from iconservice.icon_constant import ConfigKey
+from iconservice.icon_inner_service import MakeResponse
+from iconservice.icon_service_cli import _open_state_db
+from iconservice.icon_service_engine import IconServiceEngine
+from iconservice.utils import to_camel_case
+
+# Phases of replaying requests
+CONVERT = 'convert'
+INVOKE = 'invoke'
+RESULT = 'result'
+COMMIT = 'commit'
+ROLLBACK = 'rollback'
+
+PERCENTILES = (50, 90, 99)
+
+
+class ReplayReport(object):
+    """Latencies by phase and the mismatches with a recording
+    """
+
+    def __init__(self) -> None:
+        # phase: [seconds]
+        self.latencies = {}
+        self.blocks = 0
+        self.txs = 0
+        self.skipped = 0
+        # (block height, what differs)
+        self.mismatches = []
+
+    def add(self, phase: str, elapsed: float) -> None:
+        self.latencies.setdefault(phase, []).append(elapsed)
+
+    @property
+    def elapsed(self) -> float:
+        return sum(sum(latencies) for latencies in self.latencies.values())
+
+    def print(self) -> None:
+        elapsed = self.elapsed
+        print(f'{self.blocks} blocks, {self.txs} txs, {self.skipped} requests skipped '
+              f'in {elapsed:.3f} s')
+        if elapsed > 0:
+            print(f'{self.blocks / elapsed:.1f} blocks/s, {self.txs / elapsed:.1f} txs/s')
+
+        header = ''.join(f'{f"p{p}":>10}' for p in PERCENTILES)
+        print(f'{"phase (ms)":10}{header}{"max":>10}{"count":>10}')
+        for phase in (CONVERT, INVOKE, RESULT, COMMIT, ROLLBACK):
+            latencies = self.latencies.get(phase)
+            if not latencies:
+                continue
+            latencies = sorted(latencies)
+            values = ''.join(f'{get_percentile(latencies, p) * 1000:10.3f}' for p in PERCENTILES)
+            print(f'{phase:10}{values}{latencies[-1] * 1000:10.3f}{len(latencies):10}')
+
+        print(f'{len(self.mismatches)} mismatches')
+        for block_height, message in self.mismatches:
+            print(f'  block {block_height}: {message}')
+
+
+def get_percentile(sorted_values: list, percentile: int) -> float:
+    """Returns the value at a percentile with the nearest rank method
+
+    :param sorted_values: values in ascending order
+    :param percentile: 0 to 100
+    """
+    rank = max(1, -(-len(sorted_values) * percentile // 100))
+    return sorted_values[rank - 1]
+
+
+def compare_response(expected: dict, actual: dict) -> list:
+    """Compares the response of invoke with the recorded one
+
+    :return: the descriptions of the differences
+    """
+    if 'error' in expected or 'error' in actual:
+        if expected.get('error') != actual.get('error'):
+            return [f'error {actual.get("error")} != {expected.get("error")}']
+        return []
+
+    differences = []
+    if expected['stateRootHash'] != actual['stateRootHash']:
+        differences.append(
+            f'stateRootHash {actual["stateRootHash"]} != {expected["stateRootHash"]}')
+
+    expected_results: dict = expected['txResults']
+    actual_results: dict = actual['txResults']
+    for tx_hash in expected_results.keys() | actual_results.keys():
+        if expected_results.get(tx_hash) != actual_results.get(tx_hash):
+            differences.append(
+                f'txResult {tx_hash} {actual_results.get(tx_hash)} != {expected_results.get(tx_hash)}')
+
+    return differences
+
+
+class BlockReplayer(object):
+    """Runs the requests of chain engine through IconServiceEngine
+    as IconScoreInnerTask does, measuring each phase
+    """
+
+    def __init__(self, engine: 'IconServiceEngine', report: 'ReplayReport') -> None:
+        self._engine = engine
+        self._report = report
+
+        last_block = engine._precommit_data_manager.last_block
+        self._last_block_height = -1 if last_block is None else last_block.height
+
+    def replay(self, method: str, request: dict, response: dict = None) -> None:
+        if method == 'invoke':
+            self._invoke(request, response)
+        elif method in ('write_precommit_state', 'remove_precommit_state'):
+            self._write_precommit_state(method, request)
+        else:
+            self._report.skipped += 1
+
+    def _invoke(self, request: dict, expected: dict = None) -> None:
+        report = self._report
+
+        start_time = time.perf_counter()
+        params = TypeConverter.convert(request, ParamType.INVOKE)
+        block = Block.from_dict(params['block'])
+        tx_requests = params['transactions']
+        convert_time = time.perf_counter()
+
+        if block.height <= self._last_block_height:
+            report.skipped += 1
+            return
+
+        try:
+            tx_results, state_root_hash = self._engine.invoke(block=block, tx_requests=tx_requests)
+            invoke_time = time.perf_counter()
+
+            tx_results = {bytes.hex(tx_result.tx_hash): tx_result.to_dict(to_camel_case)
+                          for tx_result in tx_results}
+            response = MakeResponse.make_response({
+                'txResults': tx_results,
+                'stateRootHash': bytes.hex(state_root_hash)
+            })
+        except IconServiceBaseException as e:
+            invoke_time = time.perf_counter()
+            response = MakeResponse.make_error_response(e.code, e.message)
+        except Exception as e:
+            invoke_time = time.perf_counter()
+            response = MakeResponse.make_error_response(ExceptionCode.SERVER_ERROR, str(e))
+        result_time = time.perf_counter()
+
+        report.add(CONVERT, convert_time - start_time)
+        report.add(INVOKE, invoke_time - convert_time)
+        report.add(RESULT, result_time - invoke_time)
+        report.blocks += 1
+        report.txs += len(tx_requests)
+
+        if expected is not None:
+            for difference in compare_response(expected, response):
+                report.mismatches.append((block.height, difference))
+
+    def _write_precommit_state(self, method: str, request: dict) -> None:
+        start_time = time.perf_counter()
+        block = Block.from_dict(TypeConverter.convert(request, ParamType.WRITE_PRECOMMIT))
+
+        if block.height <= self._last_block_height:
+            self._report.skipped += 1
+            return
+
+        if method == 'write_precommit_state':
+            self._engine.commit(block)
+            self._report.add(COMMIT, time.perf_counter() - start_time)
+        else:
+            self._engine.rollback(block)
+            self._report.add(ROLLBACK, time.perf_counter() - start_time)
+
+
+def _load_config(args) -> 'IconConfig':
+    conf = IconConfig(args.config or '', default_icon_config)
+    conf.load()
+    if args.score_root_path:
+        conf.update_conf({ConfigKey.SCORE_ROOT_PATH: args.score_root_path})
+    if args.state_db_root_path:
+        conf.update_conf({ConfigKey.STATE_DB_ROOT_PATH: args.state_db_root_path})
+    return conf
+
+
+def _import_snapshot(conf: 'IconConfig', snapshot_path: str) -> None:
+    state_db_root_path: str = conf[ConfigKey.STATE_DB_ROOT_PATH].rstrip('/')
+    os.makedirs(state_db_root_path, exist_ok=True)
+    progress_path = os.path.join(state_db_root_path, IMPORT_PROGRESS_NAME)
+    key_filter_path = os.path.join(state_db_root_path, KEY_FILTER_NAME)
+
+    try:
+        manifest = import_snapshot(_open_state_db(conf), snapshot_path, progress_path,
+                                   key_filter_path=key_filter_path)
+    finally:
+        ContextDatabaseFactory.close()
+
+    print(f'imported block {manifest["blockHeight"]} : {manifest["keys"]} keys')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='offline block replay')
+    parser.add_argument('recording', type=str,
+                        help='json lines of the requests of chain engine')
+    parser.add_argument('-c', dest='config', type=str, default=None,
+                        help='json configure file path')
+    parser.add_argument('-sc', dest='score_root_path', type=str, default=None,
+                        help='icon score root path')
+    parser.add_argument('-st', dest='state_db_root_path', type=str, default=None,
+                        help='icon score state db root path')
+    parser.add_argument('-s', dest='snapshot_path', type=str, default=None,
+                        help='snapshot directory imported into the empty state db first')
+    parser.add_argument('-x', dest='stop_on_mismatch', action='store_true',
+                        help='stop at the first block which differs from the recording')
+    args = parser.parse_args()
+
+    conf = _load_config(args)
+    if args.snapshot_path:
+        _import_snapshot(conf, args.snapshot_path)
+
+    engine = IconServiceEngine()
+    engine.open(conf)
+    report = ReplayReport()
+    replayer = BlockReplayer(engine, report)
+
+    try:
+        with open(args.recording) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                replayer.replay(record['method'], record['request'], record.get('response'))
+                if args.stop_on_mismatch and report.mismatches:
+                    break
+    finally:
+        engine.close()
+
+    report.print()
+
+
+if __name__ == '__main__':
+    main()